@@ -1,10 +1,14 @@
 import pygame
 import math
 import os
-import csv
-import pickle
-import copy
-import shutil
+import engine
+from collections import OrderedDict
+
+try:
+    import numpy
+    import pygame.surfarray
+except ImportError:
+    numpy = None
 
 newPath = 'DATABASES'
 if not os.path.exists(newPath):
@@ -33,20 +37,38 @@ def respValY(value, flooring=True):
 
 zoomFactor = 1.0
 
-class Database:
+class Database(engine.Database):
+    layout = None
+
     def __init__(self, name, x, y, scale=True):
-        self.name = name.upper()
         if scale:
-            self.x = respValX(x)
-            self.y = respValY(y)
+            super().__init__(name, respValX(x), respValY(y))
         else:
-            self.x = x
-            self.y = y
-        self.tables = []
+            super().__init__(name, x, y)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("layout", None)
+        return state
+
+    def getLayout(self):
+        key = (self.name, zoomFactor, screen.get_size())
+
+        if self.layout is None or self.layout["key"] != key:
+            font = getFont(mainFont, int(respValY(50, False) * zoomFactor), bold=True)
+            textWidth, textHeight = font.size(self.name)
+
+            self.layout = {
+                "key": key,
+                "width": textWidth + respValX(20, False) * zoomFactor * 2,
+                "height": textHeight + respValY(10, False) * zoomFactor * 2
+            }
+
+        return self.layout
 
     def draw(self):
-        font = pygame.font.SysFont(mainFont, int(respValY(50, False) * zoomFactor), bold=True)
-        text = font.render(self.name, True, (49,49,50))
+        font = getFont(mainFont, int(respValY(50, False) * zoomFactor), bold=True)
+        text = renderText(font, self.name, (49,49,50))
 
         if selectedDatabase == self:
             pygame.draw.rect(screen, (0, 0, 0), (self.getRect()[0] + respValX(5, False) * zoomFactor, self.getRect()[1] + respValY(5, False) * zoomFactor, self.getRect()[2] + respValX(10, False) * zoomFactor, self.getRect()[3] + respValY(10, False) * zoomFactor), border_radius=int(respValX(10, False) * zoomFactor))
@@ -60,32 +82,57 @@ class Database:
         screen.blit(text, (textX, textY))
     
     def getRect(self):
-        font = pygame.font.SysFont(mainFont, int(respValY(50, False) * zoomFactor), bold=True)
-        text = font.render(self.name, True, "BLACK")
+        layout = self.getLayout()
 
         drawX = (self.x - cameraX) * zoomFactor
         drawY = (self.y - cameraY) * zoomFactor
-        rectWidth  = text.get_width() + respValX(20, False) * zoomFactor * 2
-        rectHeight = text.get_height() + respValY(10, False) * zoomFactor * 2
 
-        return pygame.Rect(drawX, drawY, rectWidth, rectHeight)
+        return pygame.Rect(drawX, drawY, layout["width"], layout["height"])
 
-class Table:
+class Table(engine.Table):
     global zoomFactor
 
     minTableWidth = respValX(200, False)
+    selectedColumnIndex = None
+    lastClickTime = 0
+    layout = None
 
     def __init__(self, name, columns, x, y, scale=True):
-        self.name = name.upper()
-        self.columns = [col.upper() for col in columns]
-        self.types = ["I" for _ in columns]
-        self.x = respValX(x) if scale else x
-        self.y = respValY(y) if scale else y
+        super().__init__(name, columns, respValX(x) if scale else x, respValY(y) if scale else y)
         self.selectedColumnIndex = None
-        self.primaryKeyIndex = None
-        self.foreignKeys = []
         self.lastClickTime = 0
 
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("layout", None)
+        return state
+
+    def getLayout(self):
+        key = (self.name, tuple(self.columns), zoomFactor, screen.get_size())
+
+        if self.layout is None or self.layout["key"] != key:
+            font = getFont(mainFont, int(respValY(40, False) * zoomFactor), bold=True)
+            colFont = getFont(mainFont, int(respValY(28, False) * zoomFactor))
+
+            textNameWidth, textNameHeight = font.size(self.name)
+            colTextHeightWorld = colFont.get_height() / zoomFactor + respValY(10, False)
+            headerHeightWorld = textNameHeight / zoomFactor + respValY(15, False) * 2
+            totalColumnsHeightWorld = len(self.columns) * colTextHeightWorld + (len(self.columns)-1) * respValY(3, False)
+
+            self.layout = {
+                "key": key,
+                "nameWidth": textNameWidth,
+                "nameHeight": textNameHeight,
+                "colTextHeightWorld": colTextHeightWorld,
+                "headerHeightWorld": headerHeightWorld,
+                "totalTableHeightWorld": headerHeightWorld + totalColumnsHeightWorld + respValY(10, False) + respValY(50, False),
+                "tableWidth": max(self.minTableWidth, (textNameWidth + respValX(20, False)*2)/zoomFactor),
+                "columnTableWidth": max(self.minTableWidth, textNameWidth + respValX(20, False)*2),
+                "columnTexts": None
+            }
+
+        return self.layout
+
     def fitTextToWidth(self, font, text, maxWidth):
         ellipsis = "..."
         fullWidth = font.size(text)[0]
@@ -102,20 +149,21 @@ class Table:
         return ellipsis
 
     def draw(self):
-        font = pygame.font.SysFont(mainFont, int(respValY(40, False) * zoomFactor), bold=True)
-        colFont = pygame.font.SysFont(mainFont, int(respValY(28, False) * zoomFactor))
-
-        textNameWidth, textNameHeight = font.size(self.name)
-        colTextHeightScreen = colFont.get_height()
-        colTextHeightWorld = colTextHeightScreen / zoomFactor + respValY(10, False)
-        headerHeightWorld = textNameHeight / zoomFactor + respValY(15, False) * 2
-        totalColumnsHeightWorld = len(self.columns) * colTextHeightWorld + (len(self.columns)-1) * respValY(3, False)
-        totalTableHeightWorld = headerHeightWorld + totalColumnsHeightWorld + respValY(10, False) + respValY(50, False)
-
-        paddingX = respValX(20, False)
-        tableWidth = max(self.minTableWidth, (textNameWidth + paddingX*2)/zoomFactor)
+        font = getFont(mainFont, int(respValY(40, False) * zoomFactor), bold=True)
+        colFont = getFont(mainFont, int(respValY(28, False) * zoomFactor))
+
+        layout = self.getLayout()
+        colTextHeightWorld = layout["colTextHeightWorld"]
+        headerHeightWorld = layout["headerHeightWorld"]
+        totalTableHeightWorld = layout["totalTableHeightWorld"]
+
+        tableWidth = layout["tableWidth"]
         colInnerPadding = respValX(10, False)
 
+        if layout["columnTexts"] is None:
+            colWidthScreen = tableWidth*zoomFactor - ((colInnerPadding + respValX(12.5, False))*2*zoomFactor)
+            layout["columnTexts"] = [self.fitTextToWidth(colFont, col, colWidthScreen - respValX(20, False)*zoomFactor) for col in self.columns]
+
         tableRect = pygame.Rect((self.x - cameraX)*zoomFactor, (self.y - cameraY)*zoomFactor, tableWidth*zoomFactor, totalTableHeightWorld*zoomFactor)
 
         if selectedTable == self:
@@ -125,7 +173,7 @@ class Table:
         else:
             pygame.draw.rect(screen, (203, 206, 210), tableRect, border_radius=int(respValX(10,False)*zoomFactor))
 
-        nameSurface = font.render(self.name, True, (49,49,50))
+        nameSurface = renderText(font, self.name, (49,49,50))
         nameX = tableRect.x + (tableRect.width - nameSurface.get_width())/2
         nameY = tableRect.y + respValY(15,False)/2*zoomFactor
         screen.blit(nameSurface, (nameX, nameY))
@@ -152,12 +200,12 @@ class Table:
             
             pygame.draw.rect(screen, bgColor, (colXScreen, colYScreen, colWidthScreen, colTextHeightWorld*zoomFactor), border_radius=int(respValX(5, False)*zoomFactor))
 
-            safeColText = self.fitTextToWidth(colFont, col, colWidthScreen - respValX(20, False)*zoomFactor)
-            colTextSurface = colFont.render(safeColText, True, (255,255,255))
+            safeColText = layout["columnTexts"][i]
+            colTextSurface = renderText(colFont, safeColText, (255,255,255))
             screen.blit(colTextSurface, (colXScreen + respValX(5, False)*zoomFactor, colYScreen + (colTextHeightWorld*zoomFactor - colTextSurface.get_height()) / 2))
 
             typeText = self.types[i]
-            typeTextSurface = colFont.render(typeText, True, (200,200,200))
+            typeTextSurface = renderText(colFont, typeText, (200,200,200))
             screen.blit(typeTextSurface, (tableRect.x + (colInnerPadding)*zoomFactor + respValX(2.75, False)*zoomFactor, colYScreen + (colTextHeightWorld*zoomFactor - typeTextSurface.get_height()) / 2))
             
             if self.primaryKeyIndex == i:
@@ -179,26 +227,16 @@ class Table:
                          (minusButtonRect.centerx + 5*zoomFactor, minusButtonRect.centery), max(1,int(2*zoomFactor)))
 
     def getRect(self):
-        font = pygame.font.SysFont(mainFont, int(respValY(40, False) * zoomFactor), bold=True)
-        colFont = pygame.font.SysFont(mainFont, int(respValY(28, False) * zoomFactor))
-        textNameWidth, textNameHeight = font.size(self.name)
-        colTextHeightWorld = colFont.get_height()/zoomFactor + respValY(10, False)
-        headerHeightWorld = textNameHeight / zoomFactor + respValY(15, False) * 2
-        totalColumnsHeightWorld = len(self.columns) * colTextHeightWorld + (len(self.columns)-1) * respValY(3, False)
-        totalTableHeightWorld = headerHeightWorld + totalColumnsHeightWorld + respValY(10, False) + respValY(50, False)
-        tableWidth = max(self.minTableWidth, (textNameWidth + respValX(20,False)*2)/zoomFactor)
-        return pygame.Rect((self.x-cameraX)*zoomFactor, (self.y-cameraY)*zoomFactor, tableWidth*zoomFactor, totalTableHeightWorld*zoomFactor)
+        layout = self.getLayout()
+        return pygame.Rect((self.x-cameraX)*zoomFactor, (self.y-cameraY)*zoomFactor, layout["tableWidth"]*zoomFactor, layout["totalTableHeightWorld"]*zoomFactor)
     
     def getColumnRect(self, index):
-        fontName = pygame.font.SysFont(mainFont, int(respValY(40, False) * zoomFactor), bold=True)
-        textNameWidth, textNameHeight = fontName.size(self.name)
-        colFont = pygame.font.SysFont(mainFont, int(respValY(28, False) * zoomFactor))
-        colTextHeightWorld = colFont.get_height()/zoomFactor + respValY(10, False)
-        headerHeightWorld = textNameHeight / zoomFactor + respValY(15, False)*2
-        colYWorld = self.y + headerHeightWorld + index*colTextHeightWorld + index*respValY(3, False)
+        layout = self.getLayout()
+        colTextHeightWorld = layout["colTextHeightWorld"]
+        colYWorld = self.y + layout["headerHeightWorld"] + index*colTextHeightWorld + index*respValY(3, False)
         colYScreen = (colYWorld - cameraY) * zoomFactor
 
-        tableWidth = max(self.minTableWidth, textNameWidth + respValX(20,False)*2)
+        tableWidth = layout["columnTableWidth"]
         colInnerPadding = respValX(10, False)
         colXScreen = (self.x - cameraX + colInnerPadding + respValX(25, False)) * zoomFactor
         colWidthScreen = (tableWidth - (colInnerPadding + respValX(12.5, False))*2) * zoomFactor
@@ -213,10 +251,8 @@ class Table:
         return pygame.Rect(typeButtonX, typeButtonY, typeButtonSize, typeButtonSize)
 
     def getHeaderRect(self):
-        font = pygame.font.SysFont(mainFont, int(respValY(40, False) * zoomFactor), bold=True)
-        text = font.render(self.name, True, (49,49,50))
-        headerHeight = text.get_height()/zoomFactor + respValY(15,False)*2
-        return pygame.Rect((self.x-cameraX)*zoomFactor, (self.y-cameraY)*zoomFactor, text.get_width()+respValX(20,False)*zoomFactor*2, headerHeight*zoomFactor)
+        layout = self.getLayout()
+        return pygame.Rect((self.x-cameraX)*zoomFactor, (self.y-cameraY)*zoomFactor, layout["nameWidth"]+respValX(20,False)*zoomFactor*2, layout["headerHeightWorld"]*zoomFactor)
 
     def getButtonsRects(self):
         fullTableRect = self.getRect()
@@ -229,159 +265,12 @@ class Table:
         plusY = int(minusY)
         plusButtonRect = pygame.Rect(plusX, plusY, buttonSize, buttonSize)
         return plusButtonRect, minusButtonRect
-    
-    def addForeignKey(self, columnIndex, referencedTable, referencedColumnIndex):
-        self.foreignKeys.append({
-            "column": columnIndex,
-            "ref_table": referencedTable,
-            "ref_column": referencedColumnIndex
-        })
 
 selectedDatabase = None
 openedDatabase = None
 selectedTable = None
 openedTable = None
 
-undoStack = []
-redoStack = []
-
-def addToUndoStack():
-    global redoStack, openedDatabase, openedTable, state, Databases
-    redoStack = []
-    
-    fileSystemState = {}
-    for root, dirs, files in os.walk('DATABASES'):
-        for name in dirs:
-            path = os.path.join(root, name)
-            fileSystemState[path] = None
-        for name in files:
-            path = os.path.join(root, name)
-            try:
-                with open(path, 'r', newline='', encoding='utf-8') as f:
-                    fileSystemState[path] = f.read()
-            except IOError: continue
-
-    currentState = {
-        'Databases': copy.deepcopy(Databases),
-        'openedDatabase_name': openedDatabase.name if openedDatabase else None,
-        'openedTable_name': openedTable.name if openedTable else None,
-        'state': state,
-        'file_system': fileSystemState
-    }
-
-    undoStack.append(currentState)
-
-def undo():
-    global Databases, openedDatabase, openedTable, state, redoStack
-    if len(undoStack) > 1:
-        currentFileSystemState = {}
-        for root, dirs, files in os.walk('DATABASES'):
-            for name in dirs:
-                path = os.path.join(root, name)
-                currentFileSystemState[path] = None
-            for name in files:
-                path = os.path.join(root, name)
-                try:
-                    with open(path, 'r', newline='', encoding='utf-8') as f:
-                        currentFileSystemState[path] = f.read()
-                except IOError:
-                    continue
-
-        currentState = {
-            'Databases': copy.deepcopy(Databases),
-            'openedDatabase_name': openedDatabase.name if openedDatabase else None,
-            'openedTable_name': openedTable.name if openedTable else None,
-            'state': state,
-            'file_system': currentFileSystemState
-        }
-        redoStack.append(currentState)
-
-        lastState = undoStack.pop()
-
-        Databases = lastState['Databases']
-        state = lastState['state']
-
-        if lastState['openedDatabase_name']:
-            openedDatabase = next((db for db in Databases if db.name == lastState['openedDatabase_name']), None)
-
-            if lastState['openedTable_name'] and openedDatabase:
-                openedTable = next((t for t in openedDatabase.tables if t.name == lastState['openedTable_name']), None)
-
-            else:
-                openedTable = None
-
-        else:
-            openedDatabase = None
-
-        restoreFileSystem(lastState['file_system'])
-
-def redo():
-    global Databases, openedDatabase, state, undoStack, openedTable
-    if redoStack:
-        currentFileSystemState = {}
-        for root, dirs, files in os.walk('DATABASES'):
-            for name in dirs:
-                path = os.path.join(root, name)
-                currentFileSystemState[path] = None
-            for name in files:
-                path = os.path.join(root, name)
-                try:
-                    with open(path, 'r', newline='', encoding='utf-8') as f:
-                        currentFileSystemState[path] = f.read()
-                except IOError: continue
-
-        currentState = {
-            'Databases': copy.deepcopy(Databases),
-            'openedDatabase_name': openedDatabase.name if openedDatabase else None,
-            'openedTable_name': openedTable.name if openedTable else None,
-            'state': state,
-            'file_system': currentFileSystemState
-        }
-        undoStack.append(currentState)
-
-        nextState = redoStack.pop()
-        
-        Databases = nextState['Databases']
-        state = nextState['state']
-        if nextState['openedDatabase_name']:
-            openedDatabase = next((db for db in Databases if db.name == nextState['openedDatabase_name']), None)
-
-            if nextState['openedTable_name'] and openedDatabase:
-                openedTable = next((t for t in openedDatabase.tables if t.name == nextState['openedTable_name']), None)
-            else:
-                openedTable = None
-        else:
-            openedDatabase = None
-
-        fileSystemToRestore = nextState['file_system']
-        restoreFileSystem(fileSystemToRestore)
-
-def restoreFileSystem(targetFileState):
-    current_paths = set()
-    for root, dirs, files in os.walk('DATABASES', topdown=False):
-        for name in files:
-            current_paths.add(os.path.join(root, name))
-        for name in dirs:
-            current_paths.add(os.path.join(root, name))
-
-    for path in current_paths:
-        if path not in targetFileState:
-            try:
-                if os.path.isfile(path):
-                    os.remove(path)
-                elif os.path.isdir(path) and not os.listdir(path):
-                    os.rmdir(path)
-            except OSError:
-                pass
-    
-    for path, content in targetFileState.items():
-        if content is None:
-            os.makedirs(path, exist_ok=True)
-        else:
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, 'w', newline='', encoding='utf-8') as f:
-                f.write(content)
-
 def zoomIn():
     global gridSpacing
     global zoomFactor
@@ -390,6 +279,7 @@ def zoomIn():
         gridSpacing += 1
 
         zoomFactor = gridSpacing / 15
+        canvasChanged()
 
 def zoomOut():
     global gridSpacing
@@ -399,48 +289,213 @@ def zoomOut():
         gridSpacing -= 1
 
         zoomFactor = gridSpacing / 15
+        canvasChanged()
+
+def canvasBounds(item):
+    rect = item.getRect()
+    margin = respValX(10, False)
+    return item.x - margin, item.y - margin, item.x + rect.width / zoomFactor + margin, item.y + rect.height / zoomFactor + margin
+
+def linkBounds(link):
+    left, top, right, bottom = canvasBounds(link[0])
+    refLeft, refTop, refRight, refBottom = canvasBounds(link[1])
+    margin = respValX(40, False)
+    return min(left, refLeft) - margin, min(top, refTop) - margin, max(right, refRight) + margin, max(bottom, refBottom) + margin
+
+def tableLinks(tables):
+    names = {table.name: table for table in reversed(tables)}
+    return [(table, names[fk["ref_table"]], position) for table in tables for position, fk in enumerate(table.foreignKeys) if fk["ref_table"] in names]
+
+class SpatialIndex:
+    def __init__(self, bounds, itemsOf=None, cellSize=256):
+        self.bounds = bounds
+        self.itemsOf = itemsOf
+        self.cellSize = cellSize
+        self.objects = None
+        self.cells = {}
+        self.entries = {}
+        self.order = {}
+        self.stale = True
+
+    def cellRange(self, left, top, right, bottom):
+        size = self.cellSize
+        return [(cellX, cellY) for cellX in range(math.floor(left / size), math.floor(right / size) + 1) for cellY in range(math.floor(top / size), math.floor(bottom / size) + 1)]
+
+    def update(self, item):
+        self.remove(item)
+
+        keys = self.cellRange(*self.bounds(item))
+
+        for key in keys:
+            self.cells.setdefault(key, set()).add(item)
+        self.entries[item] = keys
+        self.order.setdefault(item, len(self.order))
+
+    def remove(self, item):
+        for key in self.entries.pop(item, ()):
+            cell = self.cells[key]
+            cell.discard(item)
+            if not cell:
+                del self.cells[key]
+
+    def rebuild(self, objects):
+        self.objects = objects
+        self.cells = {}
+        self.entries = {}
+        self.order = {}
+        self.stale = False
+
+        for item in (objects if self.itemsOf is None else self.itemsOf(objects)):
+            self.update(item)
+
+    def query(self, objects, left, top, right, bottom):
+        if self.stale or self.objects is not objects:
+            self.rebuild(objects)
+
+        found = set()
+        for key in self.cellRange(left, top, right, bottom):
+            found.update(self.cells.get(key, ()))
+        return sorted(found, key=self.order.get)
+
+    def pick(self, objects, pos):
+        x = pos[0] / zoomFactor + cameraX
+        y = pos[1] / zoomFactor + cameraY
+        return self.query(objects, x, y, x, y)[::-1]
+
+    def visible(self, objects):
+        return self.query(objects, cameraX, cameraY, cameraX + screen.get_width() / zoomFactor, cameraY + screen.get_height() / zoomFactor)
+
+canvasIndex = SpatialIndex(canvasBounds)
+linkIndex = SpatialIndex(linkBounds, tableLinks)
+
+def canvasChanged(item=None):
+    if item is None:
+        canvasIndex.stale = True
+    else:
+        canvasIndex.update(item)
+    linkIndex.stale = True
+
+fontCache = {}
+
+def getFont(face, size, bold=False):
+    key = (face, size, bold)
+    font = fontCache.get(key)
+    if font is None:
+        font = pygame.font.SysFont(face, size, bold=bold)
+        fontCache[key] = font
+    return font
+
+textCache = OrderedDict()
+textCacheSize = 2048
+
+def renderText(font, text, color):
+    key = (text, font, color)
+    surface = textCache.get(key)
+    if surface is None:
+        surface = font.render(text, True, color)
+        textCache[key] = surface
+        while len(textCache) > textCacheSize:
+            textCache.popitem(last=False)
+    else:
+        textCache.move_to_end(key)
+    return surface
 
 gradient = None
 
-def createVignette(intensity=180, radiusFactor=1.5):
-    width, height = screen.get_size()
+overlayCache = OrderedDict()
+overlayCacheSize = 4
 
+def vignetteTexture(width, height, intensity, radiusFactor, textureWidth, textureHeight):
     center = (width / 2, height / 2)
+    maxDistance = math.hypot(center[0], center[1]) * radiusFactor
 
-    vignette = pygame.Surface((width, height), pygame.SRCALPHA)
+    texture = pygame.Surface((textureWidth, textureHeight), pygame.SRCALPHA)
 
-    maxDistance = math.hypot(center[0], center[1]) * radiusFactor
+    if numpy is not None:
+        xs = (numpy.arange(textureWidth) + 0.5) * (width / textureWidth) - 0.5 - center[0]
+        ys = (numpy.arange(textureHeight) + 0.5) * (height / textureHeight) - 0.5 - center[1]
+        t = numpy.minimum(numpy.hypot(xs[:, None], ys[None, :]) / maxDistance, 1)
 
-    for y in range(height):
-        for x in range(width):
-            dist = math.hypot(x - center[0], y - center[1])
-            t = dist / maxDistance
+        alpha = pygame.surfarray.pixels_alpha(texture)
+        alpha[:] = (t * intensity).astype(numpy.uint8)
+        del alpha
 
-            if t > 1:
-                t = 1
+        return texture
 
-            alpha = int(t * intensity)
+    for y in range(textureHeight):
+        for x in range(textureWidth):
+            dist = math.hypot((x + 0.5) * (width / textureWidth) - 0.5 - center[0], (y + 0.5) * (height / textureHeight) - 0.5 - center[1])
+            t = min(dist / maxDistance, 1)
 
-            vignette.set_at((x, y), (*(0, 0, 0), alpha))
+            texture.set_at((x, y), (0, 0, 0, int(t * intensity)))
 
+    return texture
+
+def createVignette(intensity=180, radiusFactor=1.5):
     global gradient
 
-    gradient = pygame.Surface((width, height), pygame.SRCALPHA)
+    width, height = screen.get_size()
+    key = (width, height, intensity, radiusFactor)
 
-    for y in range(height):
-        for x in range(width):
-            dist = math.hypot(0, y)
-            t = dist / math.hypot(0, center[1]) * 0.35
+    if key in overlayCache:
+        overlayCache.move_to_end(key)
+        vignette, gradient = overlayCache[key]
+        return vignette
 
-            if t > 1:
-                t = 1
+    if numpy is not None:
+        vignette = vignetteTexture(width, height, intensity, radiusFactor, width, height)
+    else:
+        shrink = max(1, math.ceil(max(width, height) / 256))
+        texture = vignetteTexture(width, height, intensity, radiusFactor, math.ceil(width / shrink), math.ceil(height / shrink))
+        vignette = pygame.transform.smoothscale(texture, (width, height))
 
-            alpha = int(t * 255)
+    column = pygame.Surface((1, height), pygame.SRCALPHA)
+    for y in range(height):
+        t = min(y / (height / 2) * 0.35, 1)
+        column.set_at((0, y), (0, 0, 0, int(t * 255)))
+    gradient = pygame.transform.scale(column, (width, height))
 
-            gradient.set_at((x, y), (*(0, 0, 0), alpha))
+    overlayCache[key] = (vignette, gradient)
+    while len(overlayCache) > overlayCacheSize:
+        overlayCache.popitem(last=False)
 
     return vignette
 
+gridCache = OrderedDict()
+gridCacheSize = 4
+
+def gridLayer(stepX, stepY, color, background):
+    width, height = screen.get_size()
+    key = (width, height, stepX, stepY, color, background)
+
+    if key in gridCache:
+        gridCache.move_to_end(key)
+        return gridCache[key]
+
+    cell = pygame.Surface((stepX, stepY))
+    cell.fill(background)
+    for corner in ((0, 0), (stepX, 0), (0, stepY), (stepX, stepY)):
+        pygame.draw.circle(cell, color, corner, 1)
+
+    layer = pygame.Surface((width + stepX, height + stepY))
+    layer.blit(cell, (0, 0))
+
+    filledWidth = stepX
+    while filledWidth < layer.get_width():
+        layer.blit(layer, (filledWidth, 0), (0, 0, filledWidth, stepY))
+        filledWidth *= 2
+
+    filledHeight = stepY
+    while filledHeight < layer.get_height():
+        layer.blit(layer, (0, filledHeight), (0, 0, layer.get_width(), filledHeight))
+        filledHeight *= 2
+
+    gridCache[key] = layer
+    while len(gridCache) > gridCacheSize:
+        gridCache.popitem(last=False)
+
+    return layer
+
 def drawBezier(c1, c2, cp):
     points = [c1]
 
@@ -460,37 +515,137 @@ gridSpacing = 15
 
 cameraX, cameraY = -screen.get_width() / 2, -screen.get_height() / 2
 
-Databases = []
+class Session(engine.Engine):
+    databaseClass = Database
+    tableClass = Table
+
+    def newDatabase(self, name, x, y):
+        return Database(name, x, y, scale=False)
+
+    def newTable(self, name, columns, x, y):
+        return Table(name, columns, x, y, scale=False)
+
+    def placement(self):
+        return cameraX + (screen.get_width() / 2) / zoomFactor, cameraY + (screen.get_height() / 2) / zoomFactor
+
+session = Session()
+session.load()
+
+tableCache = session.cache
+
+Databases = session.databases
+showingResult = session.showingResult
 
-dbNames = sorted([d for d in os.listdir('DATABASES') if os.path.isdir(os.path.join('DATABASES', d))])
+def pushSession():
+    session.databases = Databases
+    session.state = state
+    session.openedDatabase = openedDatabase
+    session.openedTable = openedTable
 
-if os.path.exists("save.txt"):
-    try :
-        f = open('save.txt', 'rb')
+def pullSession():
+    global Databases, state, openedDatabase, openedTable, showingResult
 
-        Databases = pickle.load(f)
+    Databases = session.databases
+    state = session.state
+    openedDatabase = session.openedDatabase
+    openedTable = session.openedTable
+    showingResult = session.showingResult
 
-        f.close()
+def addToUndoStack():
+    pushSession()
+    session.addToUndoStack()
+
+def undo():
+    pushSession()
+    session.undo()
+    pullSession()
+    canvasChanged()
 
-    except :
+def redo():
+    pushSession()
+    session.redo()
+    pullSession()
+    canvasChanged()
+
+def clearResult():
+    pushSession()
+    session.clearResult()
+    pullSession()
+
+gridEvent = pygame.event.custom_type()
+
+def postGridEvent():
+    try:
+        pygame.event.post(pygame.event.Event(gridEvent))
+    except pygame.error:
         pass
 
-else:
-    for i, name in enumerate(dbNames):
-        Databases.append(Database(name.upper(), -200 - i*150, -200 - i*100))
-
-    for db in Databases:
-        for i in os.listdir(os.path.join('DATABASES', db.name)):
-            if i.endswith('.csv'):
-                tableName = i[:-4]
-                columns = []
-                with open(os.path.join('DATABASES', db.name, i), 'r', newline='') as csvfile:
-                    reader = csv.reader(csvfile)
-                    try:
-                        columns = next(reader)
-                    except StopIteration:
-                        columns = []
-                db.tables.append(Table(tableName, columns, db.x + 50, db.y + 100 + len(db.tables) * 100, scale=False))
+class GridDataset:
+    def __init__(self):
+        self.source = None
+        self.stale = True
+        self.header = []
+        self.rows = []
+        self.pager = None
+        tableCache.listeners.append(self.changed)
+
+    def changed(self, key):
+        if key is None or key == self.source:
+            self.stale = True
+
+    def show(self, dbName, tableName):
+        if self.source != (dbName, tableName):
+            self.source = (dbName, tableName)
+            self.stale = True
+            self.closePager()
+
+    def closePager(self):
+        if self.pager is not None:
+            self.pager.close()
+            self.pager = None
+
+    def sync(self):
+        if self.stale:
+            entry = tableCache.peek(*self.source)
+
+            if entry is not None:
+                self.closePager()
+                self.header, self.rows = entry.header, entry.rows
+            elif self.source == (None, "RESULT") and session.resultCursor is not None:
+                if self.pager is not session.resultCursor:
+                    self.closePager()
+                    self.pager = session.resultCursor
+                self.rows = []
+            else:
+                filePath = engine.locateTable(*self.source)
+                if self.pager is None or self.pager.path != filePath or self.pager.signature != tableCache.signature(filePath):
+                    self.closePager()
+                    if self.source[0] is not None:
+                        session.prepareScanPool(filePath)
+                    self.pager = engine.PagedTable(filePath, onChange=postGridEvent, saveIndex=self.source[0] is not None)
+                self.rows = []
+
+            self.stale = False
+
+        if self.pager is not None:
+            self.header = self.pager.header
+
+    def rowCount(self):
+        if self.pager is not None:
+            return self.pager.rowCount
+        return len(self.rows)
+
+    def counting(self):
+        return self.pager is not None and not self.pager.complete
+
+    def window(self, rowStart, rowCount, colStart, colCount):
+        if self.pager is not None:
+            rows = self.pager.window(rowStart, rowCount)
+        else:
+            rows = self.rows[rowStart:rowStart + rowCount]
+        return self.header[colStart:colStart + colCount], [row[colStart:colStart + colCount] for row in rows]
+
+gridDataset = GridDataset()
 
 center = (screen.get_width()/2, screen.get_height()/2)
 
@@ -532,709 +687,10 @@ mainFont = 'Consolas'
 state = 0
 
 def queryExecutor(Query):
-    global state
-    global selectedDatabase, openedDatabase
     global query
 
-
     print(f"Executing query: {Query}")
-    if Query.startswith("CREATE"):
-        addToUndoStack()
-
-        parts = Query.partition(" ")
-
-        if state == 0:
-            dbNames = [db.strip() for db in parts[2].split(',') if db.strip()]
-
-            for dbName in dbNames:
-                newDBName = dbName
-                count = 1
-
-                while os.path.exists(os.path.join('DATABASES', newDBName)):
-                    newDBName = f"{dbName}_{count}"
-                    count += 1
-
-                newDB = Database(
-                    newDBName,
-                    cameraX + (screen.get_width() / 2) / zoomFactor,
-                    cameraY + (screen.get_height() / 2) / zoomFactor,
-                    scale=False
-                )
-
-                Databases.append(newDB)
-                os.makedirs(os.path.join('DATABASES', newDBName))
-
-        elif state == 1:
-            tableName = parts[2].strip()
-            newTableName = tableName
-            count = 1
-
-            existingTableNames = [table.name for table in openedDatabase.tables]
-
-            while newTableName in existingTableNames:
-                newTableName = f"{tableName}_{count}"
-                count += 1
-
-            newTable = Table(
-                newTableName,
-                [],
-                cameraX + (screen.get_width() / 2) / zoomFactor,
-                cameraY + (screen.get_height() / 2) / zoomFactor,
-                scale=False
-            )
-
-            openedDatabase.tables.append(newTable)
-            open(os.path.join('DATABASES', openedDatabase.name, f"{newTableName}.csv"), 'w').close()
-
-    elif Query.startswith("DELETE FIELDS"):
-        addToUndoStack()
-        if state == 1 and openedDatabase is not None:
-            try:
-                rest = Query[len("DELETE FIELDS"):].strip()
-                
-                parts = rest.upper().split(" FROM ")
-                
-                fieldsPart, tableName = parts
-                tableName = tableName.strip()
-                fieldsToDelete = [f.strip() for f in fieldsPart.split(",") if f.strip()]
-                
-                targetTable = next((t for t in openedDatabase.tables if t.name.upper() == tableName), None)
-
-                indicesToDelete = []
-
-                for field in fieldsToDelete:
-                    indicesToDelete.append(targetTable.columns.index(field))
-                
-                filePath = os.path.join('DATABASES', openedDatabase.name, f"{targetTable.name}.csv")
-
-                with open(filePath, 'r', newline='') as csvfile:
-                    reader = csv.reader(csvfile)
-                    all_data = [row for row in reader]
-
-                new_data = [[item for i, item in enumerate(row) if i not in indicesToDelete] for row in all_data]
-
-                with open(filePath, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerows(new_data)
-
-                targetTable.columns = new_data[0] if new_data else []
-                targetTable.types = [t for i, t in enumerate(targetTable.types) if i not in indicesToDelete]
-                
-            except :
-                query = [*"ERROR DELETING FIELDS", cursor]
-                return
-            
-    elif Query.startswith("RENAME FIELD"):
-        addToUndoStack()
-        if state == 1 and openedDatabase is not None:
-            try:
-                rest = Query[len("RENAME FIELD "):].strip()
-
-                parts = rest.split(" TO ")
-
-                oldName = parts[0].strip()
-                newName = parts[1].split(" IN ")[0].strip()
-
-                tableName = parts[1].split(" IN ")[1].strip()
-
-                print(tableName, oldName, newName)
-
-                targetTable = next((t for t in openedDatabase.tables if t.name.upper() == tableName), None)
-
-                filePath = os.path.join('DATABASES', openedDatabase.name, f"{targetTable.name}.csv")
-
-                with open(filePath, 'r', newline='') as csvfile:
-                    reader = csv.reader(csvfile)
-                    all_data = [row for row in reader]
-
-                header = all_data[0]
-                header = [newName if col == oldName else col for col in header]
-                new_data = [header] + all_data[1:]
-
-                with open(filePath, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerows(new_data)
-
-                targetTable.columns = new_data[0] if new_data else []
-
-            except :
-                query = [*"ERROR RENAMING FIELD", cursor]
-                return
-
-    elif Query.startswith("MOVE FIELD"):
-        addToUndoStack()
-
-        if state == 1 and openedDatabase is not None:
-            try:
-                rest = Query[len("MOVE FIELD "):].strip()
-
-                tablePart, destCol = rest.split(") TO")
-                tableName, srcCol = tablePart.split("(")
-                
-                tableName = tableName.strip().upper()
-                srcCol = srcCol.strip().upper()
-                destCol = destCol.strip().upper()
-
-                table = next((t for t in openedDatabase.tables if t.name == tableName), None)
-                if not table:
-                    query = [*"TABLE NOT FOUND", cursor]
-                    return
-                if srcCol not in table.columns or destCol not in table.columns:
-                    query = [*"COLUMN NOT FOUND", cursor]
-                    return
-
-                srcIndex = table.columns.index(srcCol)
-                destIndex = table.columns.index(destCol)
-
-                filePath = os.path.join('DATABASES', openedDatabase.name, f"{table.name}.csv")
-
-                with open(filePath, 'r', newline='') as csvfile:
-                    reader = csv.reader(csvfile)
-                    all_data = [row for row in reader]
-
-                if not all_data:
-                    return
-                def move_index(row):
-                    value = row.pop(srcIndex)
-                    row.insert(destIndex, value)
-                    return row
-
-                new_data = [move_index(row.copy()) for row in all_data]
-
-                with open(filePath, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerows(new_data)
-
-                table.columns = new_data[0]
-
-                if table.primaryKeyIndex is not None:
-                    pk = table.primaryKeyIndex
-
-                    if pk == srcIndex:
-                        table.primaryKeyIndex = destIndex
-                    else:
-                        if srcIndex < pk <= destIndex:
-                            table.primaryKeyIndex -= 1
-                        elif destIndex <= pk < srcIndex:
-                            table.primaryKeyIndex += 1
-
-
-                for fk in table.foreignKeys:
-                    columnIndex = fk["column"]
-
-                    if columnIndex == srcIndex:
-                        fk["column"] = destIndex
-                    else:
-                        if srcIndex < columnIndex <= destIndex:
-                            fk["column"] -= 1
-                        elif destIndex <= columnIndex < srcIndex:
-                            fk["column"] += 1
-
-                for other in openedDatabase.tables:
-                    for fk in other.foreignKeys: 
-                        if fk["ref_table"] == table:
-                            refColumnIndex = fk["ref_column"]
-
-                            if refColumnIndex == srcIndex:
-                                fk["ref_column"] = destIndex
-                            else:
-                                if srcIndex < refColumnIndex <= destIndex:
-                                    fk["ref_column"] -= 1
-                                elif destIndex <= refColumnIndex < srcIndex:
-                                    fk["ref_column"] += 1
-
-            except Exception as e:
-                print("MOVE FIELD ERROR:", e)
-                query = [*"ERROR MOVING FIELD", cursor]
-                return
-            
-    elif Query.startswith("ADD DATA"):
-        addToUndoStack()
-
-        if state == 2 and openedTable is not None:
-            try:
-                rest = Query[len("ADD DATA"):].strip()
-
-                if not (rest.startswith("(") and rest.endswith(")")):
-                    query = [*"ERROR: Invalid syntax. Use ADD DATA(v1, v2, ...)", cursor]
-                    return
-
-                inner = rest[1:-1].strip()
-
-                rawValues = [v.strip() for v in inner.split(",")]
-
-                if len(rawValues) != len(openedTable.columns):
-                    query = [*f"ERROR: Expected {len(openedTable.columns)} values, got {len(rawValues)}", cursor]
-                    return
-
-                filePath = os.path.join("DATABASES", openedDatabase.name, f"{openedTable.name}.csv")
-                with open(filePath, "r", newline="") as csvfile:
-                    reader = csv.reader(csvfile)
-                    all_data = [row for row in reader]
-
-                header = all_data[0]
-                rows = all_data[1:]
-
-                for i in range(len(rows)):
-                    if len(rows[i]) < len(header):
-                        rows[i] += [""] * (len(header) - len(rows[i]))
-
-                finalValues = []
-
-                for i, value in enumerate(rawValues):
-                    colType = openedTable.types[i]
-                    colName = openedTable.columns[i]
-
-                    if value.upper() == "NONE":
-                        if openedTable.primaryKeyIndex == i:
-                            query = [*f"ERROR: Primary key '{colName}' cannot be None", cursor]
-                            return
-                        finalValues.append("")
-                        continue
-
-                    if colType == "I":
-                        if not value.lstrip("-").isdigit():
-                            query = [*f"ERROR: Column '{colName}' expects INTEGER", cursor]
-                            return
-                        finalValues.append(value)
-
-                    elif colType == "F":
-                        try:
-                            float(value)
-                        except:
-                            query = [*f"ERROR: Column '{colName}' expects FLOAT", cursor]
-                            return
-                        finalValues.append(value)
-
-                    elif colType == "S":
-                        finalValues.append(value)
-
-                    elif colType == "B":
-                        if value.lower() not in ("true", "false", "0", "1"):
-                            query = [*f"ERROR: Column '{colName}' expects BOOLEAN (true/false)", cursor]
-                            return
-                        finalValues.append(value.lower())
-
-                    else:
-                        finalValues.append(value)
-
-                if openedTable.primaryKeyIndex is not None:
-                    pkIndex = openedTable.primaryKeyIndex
-                    pkValue = finalValues[pkIndex]
-
-                    for row in rows:
-                        if row[pkIndex] == pkValue:
-                            query = [*f"ERROR: Duplicate primary key '{pkValue}' in column '{header[pkIndex]}'", cursor]
-                            return
-
-                for fk in openedTable.foreignKeys:
-                    colIndex = fk["column"]
-                    refTable = fk["ref_table"]
-                    refColIndex = fk["ref_column"]
-
-                    val = finalValues[colIndex]
-
-                    if val == "":
-                        continue
-
-                    refPath = os.path.join("DATABASES", openedDatabase.name, f"{refTable.name}.csv")
-                    with open(refPath, "r", newline="") as csvfile:
-                        reader = csv.reader(csvfile)
-                        refData = [row for row in reader]
-
-                    refHeader = refData[0]
-                    refRows = refData[1:]
-
-                    for i in range(len(refRows)):
-                        if len(refRows[i]) < len(refHeader):
-                            refRows[i] += [""] * (len(refHeader) - len(refRows[i]))
-
-                    exists = False
-                    for r in refRows:
-                        if r[refColIndex] == val:
-                            exists = True
-                            break
-
-                    if not exists:
-                        query = [*f"ERROR: Foreign key '{val}' does not exist in table '{refTable.name}' column '{refHeader[refColIndex]}'", cursor]
-                        return
-
-                rows.append(finalValues)
-
-                with open(filePath, "w", newline="") as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(header)
-                    writer.writerows(rows)
-
-                query = [*f"1 ROW ADDED", cursor]
-                return
-
-            except Exception as e:
-                query = [*f"ERROR IN ADD DATA: {e}", cursor]
-                return
-            
-    elif Query.startswith("SET"):
-        addToUndoStack()
-
-        if state == 2 and openedTable is not None:
-            try:
-                rest = Query[len("SET"):].strip()
-
-                if " WHERE " in rest:
-                    setPart, wherePart = rest.split(" WHERE ", 1)
-                else:
-                    setPart = rest
-                    wherePart = None
-
-                if "=" not in setPart:
-                    query = [*"ERROR: SET syntax must be SET column = value", cursor]
-                    return
-
-                setCol, setVal = setPart.split("=", 1)
-                setCol = setCol.strip().upper()
-                setVal = setVal.strip()
-
-                filePath = os.path.join("DATABASES", openedDatabase.name, f"{openedTable.name}.csv")
-
-                with open(filePath, "r", newline="") as csvfile:
-                    reader = csv.reader(csvfile)
-                    all_data = [row for row in reader]
-
-                header = all_data[0]
-                rows = all_data[1:]
-
-                for i in range(len(rows)):
-                    if len(rows[i]) < len(header):
-                        rows[i] += [""] * (len(header) - len(rows[i]))
-
-                if setCol not in header:
-                    query = [*f"ERROR: Column {setCol} does not exist", cursor]
-                    return
-
-                setIndex = header.index(setCol)
-
-                def row_matches(row, wherePart):
-                    if wherePart is None:
-                        return True
-
-                    or_segments = [seg.strip() for seg in wherePart.split(" OR ")]
-
-                    for or_part in or_segments:
-                        and_parts = [a.strip() for a in or_part.split(" AND ")]
-                        all_and_ok = True
-
-                        for cond in and_parts:
-                            if ">=" in cond:
-                                col, val = cond.split(">="); op = ">="
-                            elif "<=" in cond:
-                                col, val = cond.split("<="); op = "<="
-                            elif "!=" in cond:
-                                col, val = cond.split("!="); op = "!="
-                            elif ">" in cond:
-                                col, val = cond.split(">"); op = ">"
-                            elif "<" in cond:
-                                col, val = cond.split("<"); op = "<"
-                            elif " LIKE " in cond:
-                                col, val = cond.split(" LIKE "); op = "LIKE"; val = val.strip("'").strip('"')
-                            else:
-                                col, val = cond.split("="); op = "="
-
-                            col = col.strip().upper()
-                            val = val.strip()
-
-                            if col not in header:
-                                all_and_ok = False
-                                break
-
-                            idx = header.index(col)
-                            cell = row[idx]
-
-                            if op == "LIKE":
-                                if val.lower() not in cell.lower():
-                                    all_and_ok = False
-                                continue
-
-                            try:
-                                left = float(cell)
-                                right = float(val)
-                            except:
-                                left = cell
-                                right = val
-
-                            if op == "="  and not (left == right): all_and_ok = False
-                            if op == "!=" and not (left != right): all_and_ok = False
-                            if op == ">"  and not (left >  right): all_and_ok = False
-                            if op == "<"  and not (left <  right): all_and_ok = False
-                            if op == ">=" and not (left >= right): all_and_ok = False
-                            if op == "<=" and not (left <= right): all_and_ok = False
-
-                        if all_and_ok:
-                            return True
-
-                    return False
-
-                changed = 0
-                for row in rows:
-                    if row_matches(row, wherePart):
-                        row[setIndex] = setVal
-                        changed += 1
-
-                with open(filePath, "w", newline="") as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(header)
-                    writer.writerows(rows)
-
-                query = [*f"{changed} ROWS UPDATED", cursor]
-                return
-
-            except Exception as e:
-                query = [*f"ERROR IN SET: {e}", cursor]
-                return
-            
-    elif Query.startswith("DELETE ROWS"):
-        addToUndoStack()
-
-        if state == 2 and openedTable is not None:
-            try:
-                if " WHERE " not in Query:
-                    query = [*"ERROR: DELETE ROWS requires WHERE", cursor]
-                    return
-
-                wherePart = Query.split(" WHERE ", 1)[1].strip()
-
-                filePath = os.path.join("DATABASES", openedDatabase.name, f"{openedTable.name}.csv")
-                with open(filePath, "r", newline="") as csvfile:
-                    reader = csv.reader(csvfile)
-                    all_data = [row for row in reader]
-
-                header = all_data[0]
-                rows = all_data[1:]
-
-                for i in range(len(rows)):
-                    if len(rows[i]) < len(header):
-                        rows[i] += [""] * (len(header) - len(rows[i]))
-
-                def row_matches(row, wherePart):
-                    if wherePart is None:
-                        return True
-
-                    or_segments = [seg.strip() for seg in wherePart.split(" OR ")]
-
-                    for or_part in or_segments:
-                        and_parts = [a.strip() for a in or_part.split(" AND ")]
-                        all_and_ok = True
-
-                        for cond in and_parts:
-                            if ">=" in cond:
-                                col, val = cond.split(">="); op = ">="
-                            elif "<=" in cond:
-                                col, val = cond.split("<="); op = "<="
-                            elif "!=" in cond:
-                                col, val = cond.split("!="); op = "!="
-                            elif ">" in cond:
-                                col, val = cond.split(">"); op = ">"
-                            elif "<" in cond:
-                                col, val = cond.split("<"); op = "<"
-                            elif " LIKE " in cond:
-                                col, val = cond.split(" LIKE "); op = "LIKE"; val = val.strip("'").strip('"')
-                            else:
-                                col, val = cond.split("="); op = "="
-
-                            col = col.strip().upper()
-                            val = val.strip()
-
-                            if col not in header:
-                                all_and_ok = False
-                                break
-
-                            idx = header.index(col)
-                            cell = row[idx]
-
-                            if op == "LIKE":
-                                if val.lower() not in cell.lower():
-                                    all_and_ok = False
-                                continue
-
-                            try:
-                                left = float(cell); right = float(val)
-                            except:
-                                left = cell; right = val
-
-                            if op == "="  and not (left == right): all_and_ok = False
-                            if op == "!=" and not (left != right): all_and_ok = False
-                            if op == ">"  and not (left >  right): all_and_ok = False
-                            if op == "<"  and not (left <  right): all_and_ok = False
-                            if op == ">=" and not (left >= right): all_and_ok = False
-                            if op == "<=" and not (left <= right): all_and_ok = False
-
-                        if all_and_ok:
-                            return True
-
-                    return False
-
-                newRows = []
-                deleted = 0
-                for row in rows:
-                    if row_matches(row, wherePart):
-                        deleted += 1
-                    else:
-                        newRows.append(row)
-
-                with open(filePath, "w", newline="") as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(header)
-                    writer.writerows(newRows)
-
-                query = [*f"{deleted} ROWS DELETED", cursor]
-                return
-
-            except Exception as e:
-                query = [*f"ERROR IN DELETE ROWS: {e}", cursor]
-                return
-            
-    elif Query.startswith("SELECT") :
-        addToUndoStack()
-
-        if state == 2 and openedTable is not None:
-            try:
-                rest = Query[len("SELECT "):].strip()
-
-                if " WHERE " in rest:
-                    selectPart, wherePart = rest.split(" WHERE ", 1)
-                else:
-                    selectPart = rest
-                    wherePart = None
-
-                if selectPart.strip() == "*":
-                    selectedColumns = None
-                    if wherePart is None :
-                        if os.path.exists(os.path.join("DATABASES", "RESULT.csv")) :
-                            os.remove(os.path.join("DATABASES", "RESULT.csv"))
-                        query = [cursor]
-                        return
-                else:
-                    selectedColumns = [col.strip().upper() for col in selectPart.split(",")]
-
-                filePath = os.path.join('DATABASES', openedDatabase.name, f"{openedTable.name}.csv")
-
-                with open(filePath, 'r', newline='') as csvfile:
-                    reader = csv.reader(csvfile)
-                    all_data = [row for row in reader]
-
-                header = all_data[0]
-                rows = all_data[1:]
-
-                for i in range(len(rows)):
-                    if len(rows[i]) < len(header):
-                        rows[i] += [""] * (len(header) - len(rows[i]))
-
-                if selectedColumns is None:
-                    selectedIndexes = list(range(len(header)))
-                    selectedHeader = header
-                else:
-                    selectedIndexes = [header.index(col) for col in selectedColumns]
-                    selectedHeader = selectedColumns
-
-                if wherePart is not None:
-                    or_segments = [seg.strip() for seg in wherePart.split(" OR ")]
-
-                    filteredRows = []
-
-                    for row in rows:
-                        rowMatchesOR = False
-
-                        for or_part in or_segments:
-                            and_parts = [a.strip() for a in or_part.split(" AND ")]
-
-                            all_AND_match = True
-
-                            for cond in and_parts:
-                                if ">=" in cond:
-                                    col, val = cond.split(">=")
-                                    op = ">="
-                                elif "<=" in cond:
-                                    col, val = cond.split("<=")
-                                    op = "<="
-                                elif "!=" in cond:
-                                    col, val = cond.split("!=")
-                                    op = "!="
-                                elif ">" in cond:
-                                    col, val = cond.split(">")
-                                    op = ">"
-                                elif "<" in cond:
-                                    col, val = cond.split("<")
-                                    op = "<"
-                                elif " LIKE " in cond:
-                                    col, val = cond.split(" LIKE ")
-                                    op = "LIKE"
-                                    val = val.strip("'").strip('"')
-                                else:
-                                    col, val = cond.split("=")
-                                    op = "="
-
-                                col = col.strip().upper()
-                                val = val.strip()
-
-                                if col not in header:
-                                    all_AND_match = False
-                                    break
-
-                                whereIndex = header.index(col)
-                                cell = row[whereIndex]
-
-                                if op == "LIKE":
-                                    if val.lower() not in cell.lower():
-                                        all_AND_match = False
-                                    continue
-
-                                try:
-                                    left = float(cell)
-                                    right = float(val)
-                                except:
-                                    left = cell
-                                    right = val
-
-                                if op == "=" and not (left == right):
-                                    all_AND_match = False
-                                elif op == "!=" and not (left != right):
-                                    all_AND_match = False
-                                elif op == ">" and not (left > right):
-                                    all_AND_match = False
-                                elif op == "<" and not (left < right):
-                                    all_AND_match = False
-                                elif op == ">=" and not (left >= right):
-                                    all_AND_match = False
-                                elif op == "<=" and not (left <= right):
-                                    all_AND_match = False
-
-                            if all_AND_match:
-                                rowMatchesOR = True
-                                break
-
-                        if rowMatchesOR:
-                            filteredRows.append(row)
-
-                else:
-                    filteredRows = rows
-
-                result = [selectedHeader]
-                for row in filteredRows:
-                    result.append([row[i] for i in selectedIndexes])
-
-                resultPath = os.path.join('DATABASES', "RESULT.csv")
-
-                with open(resultPath, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerows(result)
-
-                query = [f"{len(result)-1} ROWS FOUND", cursor]
-                return
-
-            except Exception as e:
-                query = [*f"ERROR IN SELECT: {e}", cursor]
-                return
-
-    elif Query.startswith("FOCUS <ALL>") :
+    if Query.startswith("FOCUS <ALL>") :
         addToUndoStack()
 
         COLS = 4
@@ -1273,46 +729,10 @@ def queryExecutor(Query):
 
                 item.x = startX + c * H_SPACING - rect.width / (2 * zoomFactor)
                 item.y = startY + r * V_SPACING
+                canvasChanged(item)
 
                 index += 1
-    
-    elif Query.startswith("DELETE"):
-        addToUndoStack()
 
-        parts = Query.partition(" ")
-
-        if state == 0 :
-            dbName = parts[2]
-            dbToDelete = None
-            for db in Databases:
-                if db.name == dbName:
-                    dbToDelete = db
-                    break
-            if dbToDelete:
-                Databases.remove(dbToDelete)
-                shutil.rmtree(os.path.join('DATABASES', dbToDelete.name))
-        if state == 1 :
-            tableName = parts[2]
-            tableToDelete = None
-            for table in openedDatabase.tables:
-                if table.name == tableName:
-                    tableToDelete = table
-                    break
-            if tableToDelete:
-                openedDatabase.tables.remove(tableToDelete)
-                os.remove(os.path.join('DATABASES', openedDatabase.name, f"{tableToDelete.name}.csv"))
-
-    elif Query.startswith("OPEN"):
-        parts = Query.partition(" ")
-
-        if state == 0 :
-            dbName = parts[2]
-            for db in Databases:
-                if db.name == dbName:
-                    state = 1
-                    openedDatabase = db
-                    break
-    
     elif Query.startswith("FOCUS"):
         addToUndoStack()
 
@@ -1324,6 +744,7 @@ def queryExecutor(Query):
                 if db.name == dbName:
                     db.x = cameraX + (screen.get_width() / 2) / zoomFactor - db.getRect().width / (2 * zoomFactor)
                     db.y = cameraY + (screen.get_height() / 2) / zoomFactor
+                    canvasChanged(db)
                     break
         if state == 1 :
             tableName = parts[2]
@@ -1331,153 +752,43 @@ def queryExecutor(Query):
                 if table.name == tableName:
                     table.x = cameraX + (screen.get_width() / 2) / zoomFactor - table.getRect().width / (2 * zoomFactor)
                     table.y = cameraY + (screen.get_height() / 2) / zoomFactor
+                    canvasChanged(table)
                     break
 
-    elif Query.startswith("RENAME"):
-        addToUndoStack()
-
-        parts = Query.partition(" ")
-
-        if state == 0 :
-            oldName = parts[2].split(" TO ")[0]
-            newName = parts[2].split(" TO ")[1]
-
-            for db in Databases:
-                if db.name == oldName:
-                    oldPath = os.path.join('DATABASES', db.name)
-                    newPath = os.path.join('DATABASES', newName)
-
-                    if not os.path.exists(newPath):
-                        os.rename(oldPath, newPath)
-                        db.name = newName
-                    else :
-                        query = [*'DATABASE ALREADY EXISTS', cursor]
-                        return
-                    break
-
-                elif Databases.index(db) == len(Databases) - 1 :
-                    query = [*'DATABASE NOT FOUND', cursor]
-                    return
-
-        elif state == 1 :
-            oldName = parts[2].split(" TO ")[0]
-            newName = parts[2].split(" TO ")[1]
-
-            for table in openedDatabase.tables:
-                if table.name == oldName:
-                    oldPath = os.path.join('DATABASES', openedDatabase.name, f"{table.name}.csv")
-                    newPath = os.path.join('DATABASES', openedDatabase.name, f"{newName}.csv")
-
-                    if not os.path.exists(newPath):
-                        os.rename(oldPath, newPath)
-                        table.name = newName
-                    else :
-                        query = [*'TABLE ALREADY EXISTS', cursor]
-                        return
-                    break
-
-                elif openedDatabase.tables.index(table) == len(openedDatabase.tables) - 1 :
-                    query = [*'TABLE NOT FOUND', cursor]
-                    return
-                
-    elif Query.startswith("OPEN"):
-        parts = Query.partition(" ")
-
-        if state == 0 :
-            dbName = parts[2]
-            for db in Databases:
-                if db.name == dbName:
-                    state = 1
-                    openedDatabase = db
-                    break
-
-                elif Databases.index(db) == len(Databases) - 1:
-                    query = [*'DATABASE NOT FOUND', cursor]
-                    return
-                
-    elif Query.startswith("ADD FIELDS"):
-        addToUndoStack()
-        if state == 1 and openedDatabase is not None:
-            try:
-                parts = Query.split("ADD FIELDS TO", 1)
-
-                rest = parts[1].strip()
-
-                tableName = rest[:rest.find("(")].strip()
-                fieldsStr = rest[rest.find("(")+1:-1].strip()
-
-                newFields = [field.strip() for field in fieldsStr.split(',') if field.strip()]
-
-                if len(newFields) != len(set(newFields)):
-                    query = [*'DUPLICATE FIELDS IN QUERY', cursor]
-                    return
-
-                targetTable = None
-                for table in openedDatabase.tables:
-                    if table.name == tableName:
-                        targetTable = table
-                        break
-
-                if targetTable:
-                    for field in newFields:
-                        if field in targetTable.columns:
-                            query = [*f"FIELD '{field}' ALREADY EXISTS", cursor]
-                            return
-
-                    targetTable.columns.extend(newFields)
-                    targetTable.types.extend(['I'] * len(newFields))
-
-                    filePath = os.path.join('DATABASES', openedDatabase.name, f"{targetTable.name}.csv")
-                    with open(filePath, 'r+', newline='') as csvfile:
-                        reader = csv.reader(csvfile)
-                        writer = csv.writer(csvfile)
-                        try:
-                            header = next(reader)
-                        except StopIteration:
-                            header = []
-
-                        csvfile.seek(0)
-                        writer.writerow(header + newFields)
-                else:
-                    query = [*'TABLE NOT FOUND', cursor]
-                    return
-
-            except IndexError:
-                query = [*'INVALID SYNTAX', cursor]
-                return
-
     else :
-        query = [*'INVALID QUERY', cursor]
+        pushSession()
+        message = session.execute(Query)
+        pullSession()
+        canvasChanged()
+
+        if message is not None:
+            query = [*message, cursor]
         return
-    
-    query = [cursor]
 
-initialState = {
-    'Databases': copy.deepcopy(Databases),
-    'openedDatabase_name': openedDatabase.name if openedDatabase else None,
-    'openedTable_name': openedTable.name if openedTable else None,
-    'state': state,
-    'file_system': {}
-}
-
-for root, dirs, files in os.walk('DATABASES'):
-    for name in dirs:
-        path = os.path.join(root, name)
-        initialState['file_system'][path] = None
-    for name in files:
-        path = os.path.join(root, name)
-        try:
-            with open(path, 'r', newline='', encoding='utf-8') as f:
-                initialState['file_system'][path] = f.read()
-        except IOError: continue
-
-undoStack.append(initialState)
+    query = [cursor]
 
 scrollValueVertical = 0
 scrollValueHorizontal = 0
 
+sceneDirty = True
+sceneLayer = None
+toolbarDirty = False
+idle = False
+idleFrameRate = 10
+
 while running:
-    for event in pygame.event.get():
+    events = pygame.event.get()
+    if idle and not events:
+        event = pygame.event.wait(1000 // idleFrameRate)
+        if event.type != pygame.NOEVENT:
+            events = [event] + pygame.event.get()
+
+    for event in events:
+        if event.type == pygame.MOUSEMOTION and not mousedown:
+            toolbarDirty = True
+        else:
+            sceneDirty = True
+
         if event.type == pygame.MOUSEBUTTONDOWN :
             if pygame.mouse.get_pressed()[0] :
                 if selectedDatabase != None :
@@ -1486,9 +797,14 @@ while running:
 
                     if (os.path.exists(newPath) and oldPath != newPath) or selectedDatabase.name == '':
                         selectedDatabase.name = oldName
-                    else:
+                    elif oldPath != newPath:
+                        newName = selectedDatabase.name
+                        selectedDatabase.name = oldName
                         addToUndoStack()
-                        os.rename(oldPath, newPath)
+                        session.renameDatabaseFolder(oldName, newName)
+                        selectedDatabase.name = newName
+
+                    canvasChanged(selectedDatabase)
 
                 if selectedTable != None :
                     oldPath = os.path.join('DATABASES', openedDatabase.name, f"{oldName}.csv")
@@ -1496,44 +812,39 @@ while running:
 
                     if (os.path.exists(newPath) and oldPath != newPath) or selectedTable.name == '':
                         selectedTable.name = oldName
-                    else:
+                    elif oldPath != newPath:
+                        newName = selectedTable.name
+                        selectedTable.name = oldName
                         addToUndoStack()
-                        os.rename(oldPath, newPath)
+                        session.renameTableFile(openedDatabase.name, oldName, newName)
+                        selectedTable.name = newName
 
                     if selectedTable.selectedColumnIndex != None :
                         colIndex = selectedTable.selectedColumnIndex
                         newName = selectedTable.columns[colIndex].strip()
 
-                        filePath = os.path.join('DATABASES', openedDatabase.name, f"{selectedTable.name}.csv")
-                        with open(filePath, 'r', newline='') as csvfile:
-                            reader = csv.reader(csvfile)
-                            try:
-                                header = next(reader)
-                            except StopIteration:
-                                header = []
+                        entry = tableCache.get(openedDatabase.name, selectedTable.name)
+                        header = list(entry.header)
 
                         oldName = header[colIndex] if colIndex < len(header) else ''
 
                         if newName == '' or newName in [col for i, col in enumerate(selectedTable.columns) if i != colIndex]:
                             selectedTable.columns[colIndex] = oldName
 
-                        else:
+                        elif newName != oldName:
                             if header:
                                 header[colIndex] = newName
                             else:
                                 header = [newName]
 
-                            with open(filePath, 'r', newline='') as csvfile:
-                                reader = csv.reader(csvfile)
-                                all_data = [row for row in reader]
-                            if all_data:
-                                all_data[0] = header
-                            else:
-                                all_data = [header]
+                            selectedTable.columns[colIndex] = oldName
+                            addToUndoStack()
+                            selectedTable.columns[colIndex] = newName
 
-                            with open(filePath, 'w', newline='') as csvfile:
-                                writer = csv.writer(csvfile)
-                                writer.writerows(all_data)
+                            session.setTableHeader(entry, header)
+                            tableCache.commit()
+
+                    canvasChanged(selectedTable)
 
                 if enterQueryIconRect.collidepoint(event.pos):
                     queryMode = True
@@ -1561,7 +872,8 @@ while running:
                             selectedDatabase = newDB
                             oldName = newDBName
 
-                            os.makedirs(os.path.join('DATABASES', newDBName))
+                            session.createDatabaseFolder(newDBName)
+                            canvasChanged()
 
                         else :
                             addToUndoStack()
@@ -1579,14 +891,16 @@ while running:
 
                             openedDatabase.tables.append(newTable)
 
-                            open(os.path.join('DATABASES', openedDatabase.name, f"{newTableName}.csv"), 'w').close()
+                            session.createTableFile(openedDatabase.name, newTableName)
+                            canvasChanged()
 
                     elif deleteIconRect.collidepoint(event.pos):
                         if selectedDatabase != None:
                             addToUndoStack()
 
                             Databases.remove(selectedDatabase)
-                            shutil.rmtree(os.path.join('DATABASES', selectedDatabase.name))
+                            session.removeDatabaseFolder(selectedDatabase.name)
+                            canvasChanged()
 
                             selectedDatabase = None
 
@@ -1594,7 +908,8 @@ while running:
                             addToUndoStack()
 
                             openedDatabase.tables.remove(selectedTable)
-                            os.remove(os.path.join('DATABASES', openedDatabase.name, selectedTable.name + '.csv'))
+                            session.removeTableFile(openedDatabase.name, selectedTable.name)
+                            canvasChanged()
                             
                             selectedTable = None
 
@@ -1638,7 +953,8 @@ while running:
                 prevCY = cameraY
 
                 if state == 0 :
-                    for i in Databases[::-1] :
+                    selectedDatabase = None
+                    for i in canvasIndex.pick(Databases, event.pos) :
                         if i.getRect().collidepoint(event.pos) and queryMode == False:
                             selectedDatabase = i
 
@@ -1660,11 +976,9 @@ while running:
 
                             break
 
-                        selectedDatabase = None
-
                 elif state == 1 :
                     clickedOnTableComp = False
-                    for i in openedDatabase.tables[::-1] :
+                    for i in canvasIndex.pick(openedDatabase.tables, event.pos) :
                         if i.getRect().collidepoint(event.pos) and queryMode == False:
                             clickedOnTableComp = True
 
@@ -1684,37 +998,25 @@ while running:
                                 i.columns.append(newFieldName)
                                 i.types.append("I")
                                 
-                                filePath = os.path.join('DATABASES', openedDatabase.name, f"{i.name}.csv")
-                                with open(filePath, 'r+', newline='') as csvfile:
-                                    reader = csv.reader(csvfile)
-                                    try:
-                                        header = next(reader)
-                                    except StopIteration:
-                                        header = []
-                                    csvfile.seek(0)
-                                    writer = csv.writer(csvfile)
-                                    writer.writerow(header + [newFieldName])
+                                entry = tableCache.get(openedDatabase.name, i.name)
+                                session.setTableHeader(entry, entry.header + [newFieldName])
+                                tableCache.commit()
                                 selectedTable = None
+                                canvasChanged(i)
 
                             elif minusButton.collidepoint(event.pos) and i.selectedColumnIndex is not None and len(i.columns) > 0:
                                 addToUndoStack()
                                 indexToDelete = i.selectedColumnIndex
                                 
-                                filePath = os.path.join('DATABASES', openedDatabase.name, f"{i.name}.csv")
-                                with open(filePath, 'r', newline='') as csvfile:
-                                    reader = csv.reader(csvfile)
-                                    all_data = [row for row in reader]
-                                
-                                new_data = [[item for idx, item in enumerate(row) if idx != indexToDelete] for row in all_data]
-
-                                with open(filePath, 'w', newline='') as csvfile:
-                                    writer = csv.writer(csvfile)
-                                    writer.writerows(new_data)
+                                entry = tableCache.get(openedDatabase.name, i.name)
+                                session.dropTableColumns(entry, [indexToDelete])
+                                tableCache.commit()
 
                                 i.columns.pop(indexToDelete)
                                 i.types.pop(indexToDelete)
                                 i.selectedColumnIndex = None
                                 selectedTable = None
+                                canvasChanged(i)
 
                             clickedColumn = False
 
@@ -1746,6 +1048,7 @@ while running:
                                             for fk in i.foreignKeys :
                                                 if fk["column"] == columnIndex :
                                                     i.foreignKeys.remove(fk)
+                                                    linkIndex.stale = True
                                                     break
                                     else:
                                         i.selectedColumnIndex = columnIndex
@@ -1776,6 +1079,8 @@ while running:
                                             if fk["ref_table"] == i.name and fk["ref_column"] == columnIndex:
                                                 table.foreignKeys.remove(fk)
 
+                                    canvasChanged(i)
+
                                     i.lastClickTime = 0
 
                             if not clickedColumn :
@@ -1807,11 +1112,12 @@ while running:
                             table.selectedColumnIndex = None
         if event.type == pygame.MOUSEBUTTONUP :
             if draggingColumn != None :
-                for i in openedDatabase.tables :
+                for i in canvasIndex.pick(openedDatabase.tables, pygame.mouse.get_pos())[::-1] :
                     if i.getRect().collidepoint(pygame.mouse.get_pos()):
                         for c in i.columns :
                             if i.getColumnRect(i.columns.index(c)).collidepoint(event.pos) and selectedTable.types[draggingColumn] == i.types[i.columns.index(c)] :
                                 selectedTable.addForeignKey(draggingColumn, i.name, i.columns.index(c))
+                                linkIndex.stale = True
 
             mousedown = False
             dragging = 1
@@ -1830,6 +1136,7 @@ while running:
 
         if event.type == pygame.VIDEORESIZE:
             vignette = createVignette(intensity=255, radiusFactor=2)
+            canvasChanged()
 
         if event.type == pygame.KEYDOWN :
             if event.key == pygame.K_f and queryMode == False and selectedDatabase == None and selectedTable == None :
@@ -1837,6 +1144,9 @@ while running:
                     screen = pygame.display.set_mode((screenWidth - 10, screenHeight - 50), pygame.RESIZABLE)
                 else :
                     screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+                canvasChanged()
+
+            editedItem = selectedDatabase if state == 0 else selectedTable
 
             if selectedDatabase != None and state == 0 and queryMode == False:
                 if event.key == pygame.K_DELETE :
@@ -1851,9 +1161,12 @@ while running:
 
                     if (os.path.exists(newPath) and oldPath != newPath) or selectedDatabase.name == '':
                         selectedDatabase.name = oldName
-                    else:
+                    elif oldPath != newPath:
+                        newName = selectedDatabase.name
+                        selectedDatabase.name = oldName
                         addToUndoStack()
-                        os.rename(oldPath, newPath)
+                        session.renameDatabaseFolder(oldName, newName)
+                        selectedDatabase.name = newName
 
                     selectedDatabase = None
 
@@ -1873,9 +1186,12 @@ while running:
 
                     if (os.path.exists(newPath) and oldPath != newPath) or selectedTable.name == '':
                         selectedTable.name = oldName
-                    else:
+                    elif oldPath != newPath:
+                        newName = selectedTable.name
+                        selectedTable.name = oldName
                         addToUndoStack()
-                        os.rename(oldPath, newPath)
+                        session.renameTableFile(openedDatabase.name, oldName, newName)
+                        selectedTable.name = newName
 
                     selectedTable = None
 
@@ -1895,43 +1211,35 @@ while running:
                     colIndex = selectedTable.selectedColumnIndex
                     newName = selectedTable.columns[colIndex].strip()
 
-                    filePath = os.path.join('DATABASES', openedDatabase.name, f"{selectedTable.name}.csv")
-                    with open(filePath, 'r', newline='') as csvfile:
-                        reader = csv.reader(csvfile)
-                        try:
-                            header = next(reader)
-                        except StopIteration:
-                            header = []
+                    entry = tableCache.get(openedDatabase.name, selectedTable.name)
+                    header = list(entry.header)
 
                     old_name = header[colIndex] if colIndex < len(header) else ''
 
                     if newName == '' or newName in [col for i, col in enumerate(selectedTable.columns) if i != colIndex]:
                         selectedTable.columns[colIndex] = oldName
 
-                    else:
+                    elif newName != old_name:
                         if header:
                             header[colIndex] = newName
                         else:
                             header = [newName]
 
-                        with open(filePath, 'r', newline='') as csvfile:
-                            reader = csv.reader(csvfile)
-                            all_data = [row for row in reader]
-
-                        if all_data:
-                            all_data[0] = header
-                        else:
-                            all_data = [header]
+                        selectedTable.columns[colIndex] = old_name
+                        addToUndoStack()
+                        selectedTable.columns[colIndex] = newName
 
-                        with open(filePath, 'w', newline='') as csvfile:
-                            writer = csv.writer(csvfile)
-                            writer.writerows(all_data)
+                        session.setTableHeader(entry, header)
+                        tableCache.commit()
 
                     selectedTable.selectedColumnIndex = None
 
                 elif len(event.unicode) == 1 and event.unicode.isprintable():
                     selectedTable.columns[colIndex] += event.unicode.upper()
 
+            if editedItem != None and queryMode == False:
+                canvasChanged(editedItem)
+
             if queryMode :
                 if event.key == pygame.K_DELETE :
                     query = [cursor]
@@ -1978,20 +1286,33 @@ while running:
                         query.insert(cursorPos, event.unicode.upper())
 
         if event.type == pygame.QUIT:
-            if os.path.exists(os.path.join("DATABASES", "RESULT.csv")) :
-                os.remove(os.path.join("DATABASES", "RESULT.csv"))
+            gridDataset.closePager()
+            pushSession()
+            session.close()
+            session.save()
+            pullSession()
 
-            f = open("save.txt", "wb")
+            running = False
 
-            pickle.dump(Databases, f)
+    tableCache.tick()
 
-            f.close()
+    center = (screen.get_width()/2, screen.get_height()/2)
 
-            running = False
+    if pygame.mouse.get_pos()[1] > center[1] + respValY(420) and mousedown == False:
+        fy = center[1] + respValY(440)
+        start = pygame.time.get_ticks()
+    elif pygame.time.get_ticks() - start > 3000 and queryMode == False :
+        fy = center[1] + respValY(750)
 
-    screen.fill((28, 38, 36))
+    previousTy = ty
 
-    center = (screen.get_width()/2, screen.get_height()/2)
+    if ty != fy :
+        if ty < fy :
+            ty += abs(ty-fy) * 0.025
+        if ty > fy :
+            ty -= abs(ty-fy) * 0.5
+        if abs(ty-fy) < 0.5 :
+            ty = fy
 
     keys = pygame.key.get_pressed()
     if not queryMode:
@@ -2000,109 +1321,194 @@ while running:
         if keys[pygame.K_UP]:    cameraY -= respValY(25)
         if keys[pygame.K_DOWN]:  cameraY += respValY(25)
 
-    viewWidth = screen.get_width() / zoomFactor
-    viewHeight = screen.get_height() / zoomFactor
+        if keys[pygame.K_LEFT] or keys[pygame.K_RIGHT] or keys[pygame.K_UP] or keys[pygame.K_DOWN]:
+            sceneDirty = True
 
-    cameraX = max(-2000, min(cameraX, 2000 - viewWidth))
-    cameraY = max(-1000, min(cameraY, 1000 - viewHeight))
+    if mousedown:
+        sceneDirty = True
 
-    for i in range(0, screen.get_width() + 2 * respValX(gridSpacing), respValX(gridSpacing)) :
-        for j in range(0, screen.get_height() + 2 * respValY(gridSpacing), respValY(gridSpacing)) :
-            pygame.draw.circle(screen, (dragging*60,dragging*60,dragging*60), (i, j), 1)
+    idle = not (sceneDirty or toolbarDirty or ty != previousTy)
+    if idle:
+        continue
 
-    if mousedown and (selectedDatabase != None or selectedTable != None):
-        if state == 0 :
-            selectedDatabase.x = (pygame.mouse.get_pos()[0] - dragOffsetX) / zoomFactor + cameraX
-            selectedDatabase.y = (pygame.mouse.get_pos()[1] - dragOffsetY) / zoomFactor + cameraY
+    if sceneLayer is None or sceneLayer.get_size() != screen.get_size():
+        sceneDirty = True
 
-        elif state == 1 and selectedTable.selectedColumnIndex == None :
-            selectedTable.x = (pygame.mouse.get_pos()[0] - dragOffsetX) / zoomFactor + cameraX
-            selectedTable.y = (pygame.mouse.get_pos()[1] - dragOffsetY) / zoomFactor + cameraY
+    toolbarTop = max(0, min(previousTy, ty) - respValY(40))
 
-    fkColor = (27, 117, 158)
+    if sceneDirty:
+        screen.fill((28, 38, 36))
 
-    if state != 2 :
-        if os.path.exists(os.path.join("DATABASES", "RESULT.csv")) :
-            os.remove(os.path.join("DATABASES", "RESULT.csv"))
+        viewWidth = screen.get_width() / zoomFactor
+        viewHeight = screen.get_height() / zoomFactor
 
-    if state == 0:
-        for i in Databases :
-            i.draw()
+        cameraX = max(-2000, min(cameraX, 2000 - viewWidth))
+        cameraY = max(-1000, min(cameraY, 1000 - viewHeight))
 
-    elif state == 1:
-        for db in Databases:
-            if db == openedDatabase:
-                for table in db.tables:
-                    table.draw()
-                break
-        
-        for db in Databases:
-            if db == openedDatabase:
-                for table in db.tables:
-                    for fk in table.foreignKeys:
-                        startRect = table.getColumnRect(fk["column"])
-                        target_table = next((t for t in db.tables if t.name == fk["ref_table"]), None)
+        gridStepX, gridStepY = respValX(gridSpacing), respValY(gridSpacing)
+        grid = gridLayer(gridStepX, gridStepY, (dragging*60,dragging*60,dragging*60), (28, 38, 36))
+        screen.blit(grid, (-(math.floor(cameraX * zoomFactor) % gridStepX), -(math.floor(cameraY * zoomFactor) % gridStepY)))
+
+        if mousedown and (selectedDatabase != None or selectedTable != None):
+            if state == 0 :
+                selectedDatabase.x = (pygame.mouse.get_pos()[0] - dragOffsetX) / zoomFactor + cameraX
+                selectedDatabase.y = (pygame.mouse.get_pos()[1] - dragOffsetY) / zoomFactor + cameraY
+                canvasChanged(selectedDatabase)
+
+            elif state == 1 and selectedTable.selectedColumnIndex == None :
+                selectedTable.x = (pygame.mouse.get_pos()[0] - dragOffsetX) / zoomFactor + cameraX
+                selectedTable.y = (pygame.mouse.get_pos()[1] - dragOffsetY) / zoomFactor + cameraY
+                canvasChanged(selectedTable)
+
+        fkColor = (27, 117, 158)
+
+        if state != 2 and showingResult :
+            clearResult()
+
+        if state == 0:
+            for i in canvasIndex.visible(Databases) :
+                i.draw()
 
-                        if not target_table or target_table == table:
-                            continue
+        elif state == 1:
+            screenRect = screen.get_rect()
 
-                        if target_table.types[fk["ref_column"]] != table.types[fk["column"]] :
-                            continue
+            for table in canvasIndex.visible(openedDatabase.tables):
+                table.draw()
 
-                        endRect = target_table.getColumnRect(fk["ref_column"])
+            for table, target_table, position in linkIndex.visible(openedDatabase.tables):
+                fk = table.foreignKeys[position]
+                startRect = table.getColumnRect(fk["column"])
 
-                        startPos = (startRect.x + startRect.width, startRect.y + startRect.height/2)
-                        endPos = (endRect.x - respValX(22.5, False)*zoomFactor, endRect.y + endRect.height/2)
+                if target_table == table:
+                    continue
 
-                        angle = math.atan2((endPos[1] - startPos[1]), (endPos[0] - startPos[0]))
+                if target_table.types[fk["ref_column"]] != table.types[fk["column"]] :
+                    continue
 
-                        pygame.draw.circle(screen, fkColor, startPos, 5)
-                        
-                        pygame.draw.polygon(screen, fkColor, [endPos, (15*math.cos(math.pi + angle + 0.75) + endPos[0], 15*math.sin(math.pi + angle + 0.75) + endPos[1]), (15*math.cos(math.pi + angle - 0.75) + endPos[0], 15*math.sin(math.pi + angle - 0.75) + endPos[1])])
+                endRect = target_table.getColumnRect(fk["ref_column"])
 
-                        pygame.draw.line(screen, fkColor, startPos, endPos, 3)
+                startPos = (startRect.x + startRect.width, startRect.y + startRect.height/2)
+                endPos = (endRect.x - respValX(22.5, False)*zoomFactor, endRect.y + endRect.height/2)
 
-    if mousedown and selectedDatabase == None and queryMode == False :
-        colSelected = False
+                arrowRect = pygame.Rect(min(startPos[0], endPos[0]), min(startPos[1], endPos[1]), abs(endPos[0] - startPos[0]) + 1, abs(endPos[1] - startPos[1]) + 1).inflate(40, 40)
+                if not screenRect.colliderect(arrowRect):
+                    continue
 
-        if openedDatabase != None and selectedTable != None  :
-            if selectedTable.selectedColumnIndex != None :
-                colSelected = True
+                angle = math.atan2((endPos[1] - startPos[1]), (endPos[0] - startPos[0]))
 
-        if selectedTable == None and not colSelected :
-            cameraX = -(pygame.mouse.get_pos()[0] - (prevMX)) / zoomFactor + prevCX
-            cameraY = -(pygame.mouse.get_pos()[1] - (prevMY)) / zoomFactor + prevCY
-            dragging = 1.5
+                pygame.draw.circle(screen, fkColor, startPos, 5)
+                
+                pygame.draw.polygon(screen, fkColor, [endPos, (15*math.cos(math.pi + angle + 0.75) + endPos[0], 15*math.sin(math.pi + angle + 0.75) + endPos[1]), (15*math.cos(math.pi + angle - 0.75) + endPos[0], 15*math.sin(math.pi + angle - 0.75) + endPos[1])])
 
-        colInd = None
+                pygame.draw.line(screen, fkColor, startPos, endPos, 3)
 
-        if openedDatabase != None and selectedTable != None :
-            if selectedTable.selectedColumnIndex != None :
-                colInd = selectedTable.selectedColumnIndex
+        if mousedown and selectedDatabase == None and queryMode == False :
+            colSelected = False
 
-        if colInd != None and not selectedTable.getRect().collidepoint(pygame.mouse.get_pos()) :
-            tRect = selectedTable.getColumnRect(selectedTable.selectedColumnIndex)
-            pygame.draw.circle (screen, fkColor, (tRect.x + tRect.width, tRect.y + tRect.height/2), 5)
-            pygame.draw.line(screen, fkColor, (tRect.x + tRect.width, tRect.y + tRect.height/2), pygame.mouse.get_pos(), math.floor(3 * zoomFactor) + 1)
+            if openedDatabase != None and selectedTable != None  :
+                if selectedTable.selectedColumnIndex != None :
+                    colSelected = True
 
-            angle = math.atan2((pygame.mouse.get_pos()[1] - (tRect.y + tRect.height/2)), (pygame.mouse.get_pos()[0] - (tRect.x + tRect.width)))
+            if selectedTable == None and not colSelected :
+                cameraX = -(pygame.mouse.get_pos()[0] - (prevMX)) / zoomFactor + prevCX
+                cameraY = -(pygame.mouse.get_pos()[1] - (prevMY)) / zoomFactor + prevCY
+                dragging = 1.5
 
-            pygame.draw.polygon(screen, fkColor, [pygame.mouse.get_pos(), (15*math.cos(math.pi + angle + 0.75) + pygame.mouse.get_pos()[0], 15*math.sin(math.pi + angle + 0.75) + pygame.mouse.get_pos()[1]), (15*math.cos(math.pi + angle - 0.75) + pygame.mouse.get_pos()[0], 15*math.sin(math.pi + angle - 0.75) + pygame.mouse.get_pos()[1])])
-            draggingColumn = colInd
+            colInd = None
 
-    toolabarSurface = pygame.Surface((screen.get_width(), screen.get_height()), pygame.SRCALPHA)
+            if openedDatabase != None and selectedTable != None :
+                if selectedTable.selectedColumnIndex != None :
+                    colInd = selectedTable.selectedColumnIndex
 
-    if pygame.mouse.get_pos()[1] > center[1] + respValY(420) and mousedown == False:
-        fy = center[1] + respValY(440)
-        start = pygame.time.get_ticks()
-    elif pygame.time.get_ticks() - start > 3000 and queryMode == False :
-        fy = center[1] + respValY(750)
+            if colInd != None and not selectedTable.getRect().collidepoint(pygame.mouse.get_pos()) :
+                tRect = selectedTable.getColumnRect(selectedTable.selectedColumnIndex)
+                pygame.draw.circle (screen, fkColor, (tRect.x + tRect.width, tRect.y + tRect.height/2), 5)
+                pygame.draw.line(screen, fkColor, (tRect.x + tRect.width, tRect.y + tRect.height/2), pygame.mouse.get_pos(), math.floor(3 * zoomFactor) + 1)
 
-    if ty != fy :
-        if ty < fy :
-            ty += abs(ty-fy) * 0.025
-        if ty > fy :
-            ty -= abs(ty-fy) * 0.5
+                angle = math.atan2((pygame.mouse.get_pos()[1] - (tRect.y + tRect.height/2)), (pygame.mouse.get_pos()[0] - (tRect.x + tRect.width)))
+
+                pygame.draw.polygon(screen, fkColor, [pygame.mouse.get_pos(), (15*math.cos(math.pi + angle + 0.75) + pygame.mouse.get_pos()[0], 15*math.sin(math.pi + angle + 0.75) + pygame.mouse.get_pos()[1]), (15*math.cos(math.pi + angle - 0.75) + pygame.mouse.get_pos()[0], 15*math.sin(math.pi + angle - 0.75) + pygame.mouse.get_pos()[1])])
+                draggingColumn = colInd
+
+        if state == 0 :
+            font = getFont(mainFont,int(respValY(50,False)),bold=False)
+            surface = renderText(font, "DATABASE VIEW", (203, 206, 210))
+            surface.set_alpha(200)
+            screen.blit(surface, (respValX(30), respValY(25), respValX(2000), respValY(1000)))
+
+        elif state == 1 :
+            font = getFont(mainFont,int(respValY(50,False)),bold=False)
+            surface = renderText(font, f"{openedDatabase.name}", (203, 206, 210))
+            surface.set_alpha(200)
+            screen.blit(surface, (respValX(30), respValY(25), respValX(2000), respValY(1000)))
+
+        screen.blit(vignette, (0, 0))
+
+        if state == 2 :
+            scrollValueVertical = max(0, scrollValueVertical)
+            scrollValueHorizontal = max(0, scrollValueHorizontal)
+
+            screen.fill((30,30,30))
+
+            if showingResult :
+                gridDataset.show(None, "RESULT")
+            else :
+                gridDataset.show(openedDatabase.name, openedTable.name)
+            gridDataset.sync()
+
+            visibleRows = 21
+            visibleCols = 12
+
+            scrollValueVertical = min(scrollValueVertical, max(0, gridDataset.rowCount() - visibleRows))
+
+            rowStart = scrollValueVertical
+            colStart = scrollValueHorizontal
+
+            header, dataRows = gridDataset.window(rowStart, visibleRows, colStart, visibleCols)
+
+            for screenRowIndex,j in enumerate(range(rowStart,rowStart+visibleRows)):
+                pygame.draw.rect(screen,"BLACK",(respValX(10,False),respValY(55,False)+screenRowIndex*respValY(50,False),screen.get_width()-respValX(1880,False),respValY(40,False)), border_radius=respValX(5))
+                font = getFont(mainFont,int(respValY(40,False)),bold=False)
+                text = str(j)
+                surface = renderText(font, text, "WHITE")
+                max_w = screen.get_width()-respValX(1880,False)
+                if surface.get_width()>max_w: surface = pygame.transform.smoothscale(surface,(max_w,surface.get_height()))
+                screen.blit(surface,(respValX(10,False)+respValX(10,False)*int(len(text)<2),respValY(57.5,False)+screenRowIndex*respValY(50,False)))
+
+            for screenColIndex,i in enumerate(range(colStart,colStart+visibleCols)):
+                pygame.draw.rect(screen,"BLACK",(respValX(55,False)+screenColIndex*respValX(170,False),respValY(10,False),respValX(160,False),respValY(40,False)), border_radius=respValX(5))
+                font = getFont(mainFont,int(respValY(40,False)),bold=False)
+                text = header[screenColIndex] if screenColIndex<len(header) else ""
+                surface = renderText(font, text, "WHITE")
+                max_w = respValX(160,False)-respValX(20,False)
+                if surface.get_width()>max_w: surface = pygame.transform.smoothscale(surface,(max_w,surface.get_height()))
+                screen.blit(surface,(respValX(55,False)+screenColIndex*respValX(170,False)+respValX(10,False),respValY(12.5,False)))
+
+            for screenColIndex,i in enumerate(range(colStart,colStart+visibleCols)):
+                for screenRowIndex,j in enumerate(range(rowStart,rowStart+visibleRows)):
+                    pygame.draw.rect(screen,(200,200,200),(respValX(55,False)+screenColIndex*respValX(170,False),respValY(55,False)+screenRowIndex*respValY(50,False),respValX(160,False),respValY(40,False)), border_radius=respValX(5))
+                    if screenRowIndex<len(dataRows) and screenColIndex<len(dataRows[screenRowIndex]):
+                        text = dataRows[screenRowIndex][screenColIndex]
+                        font = getFont(mainFont,int(respValY(30,False)),bold=True)
+                        surface = renderText(font, text, "BLACK")
+                        max_w = respValX(160,False)-respValX(20,False)
+                        if surface.get_width()>max_w: surface = pygame.transform.smoothscale(surface,(max_w,surface.get_height()))
+                        screen.blit(surface,(respValX(55,False)+screenColIndex*respValX(170,False)+respValX(10,False),respValY(60,False)+screenRowIndex*respValY(50,False)))
+
+        if state == 2 :
+            screen.blit(gradient, (0,0))
+
+            font = getFont(mainFont, int(respValY(30, False)), bold=True)
+            surface = renderText(font, f"{gridDataset.rowCount():,} ROWS" + ("..." if gridDataset.counting() else ""), "WHITE")
+            countRect = pygame.Rect(respValX(10, False), screen.get_height() - respValY(55, False), surface.get_width() + respValX(30, False), respValY(45, False))
+            pygame.draw.rect(screen, "BLACK", countRect, border_radius=respValX(5))
+            screen.blit(surface, (countRect.x + respValX(15, False), countRect.y + (countRect.height - surface.get_height()) / 2))
+
+        sceneLayer = screen.copy()
+    else:
+        screen.blit(sceneLayer, (0, toolbarTop), pygame.Rect(0, toolbarTop, screen.get_width(), screen.get_height() - toolbarTop))
+
+    toolabarSurface = pygame.Surface((screen.get_width(), screen.get_height()), pygame.SRCALPHA)
 
     Toolbar = pygame.draw.rect(toolabarSurface, (201,212,199, (int(not queryMode) * 50) + (int(queryMode) * 255)), (center[0]-respValX(480), ty, respValX(960), respValY(75)), border_radius=respValX(50))
 
@@ -2112,8 +1518,8 @@ while running:
                 cursorPos = i
                 break
         q = "".join(query[-1*46:cursorPos]) + "".join(query[cursorPos:cursorPos+46])
-        font = pygame.font.SysFont(mainFont, int(respValY(40, False)), bold=True)
-        queryText = font.render(q, True, "BLACK")
+        font = getFont(mainFont, int(respValY(40, False)), bold=True)
+        queryText = renderText(font, q, "BLACK")
 
         queryTextRect = pygame.Rect(center[0]-respValX(455), center[1] + respValY(462), respValX(960), respValY(75))
 
@@ -2148,47 +1554,47 @@ while running:
 
             if icons[i].collidepoint(pygame.mouse.get_pos()) :
                 if icons[i] == enterQueryIconRect :
-                    font = pygame.font.SysFont(mainFont, int(respValY(25, False)), bold=False)
-                    surface = font.render("ENTER QUERY", True, (255, 255, 255))
+                    font = getFont(mainFont, int(respValY(25, False)), bold=False)
+                    surface = renderText(font, "ENTER QUERY", (255, 255, 255))
                     screen.blit(surface, (icons[i].x + icons[i].width / 2 - surface.get_width() / 2, icons[i].y - respValY(35), respValX(2000), respValY(1000)))
                 
                 elif icons[i] == createIconRect :
-                    font = pygame.font.SysFont(mainFont, int(respValY(25, False)), bold=False)
+                    font = getFont(mainFont, int(respValY(25, False)), bold=False)
                     if state == 0 :
-                        surface = font.render("CREATE DATABASE", True, (255, 255, 255))
+                        surface = renderText(font, "CREATE DATABASE", (255, 255, 255))
                     if state == 1 :
-                        surface = font.render("CREATE TABLE", True, (255, 255, 255))
+                        surface = renderText(font, "CREATE TABLE", (255, 255, 255))
                     screen.blit(surface, (icons[i].x + icons[i].width / 2 - surface.get_width() / 2, icons[i].y - respValY(35), respValX(2000), respValY(1000)))
 
                 elif icons[i] == deleteIconRect :
-                    font = pygame.font.SysFont(mainFont, int(respValY(25, False)), bold=False)
+                    font = getFont(mainFont, int(respValY(25, False)), bold=False)
                     if state == 0 :
-                        surface = font.render("DELETE DATABASE", True, (255, 255, 255))
+                        surface = renderText(font, "DELETE DATABASE", (255, 255, 255))
                     if state == 1 :
-                        surface = font.render("DELETE TABLE", True, (255, 255, 255))
+                        surface = renderText(font, "DELETE TABLE", (255, 255, 255))
                     screen.blit(surface, (icons[i].x + icons[i].width / 2 - surface.get_width() / 2, icons[i].y - respValY(35), respValX(2000), respValY(1000)))
                 
                 elif icons[i] == openIconRect :
-                    font = pygame.font.SysFont(mainFont, int(respValY(25, False)), bold=False)
+                    font = getFont(mainFont, int(respValY(25, False)), bold=False)
                     if state == 0 :
-                        surface = font.render("OPEN DATABASE", True, (255, 255, 255))
+                        surface = renderText(font, "OPEN DATABASE", (255, 255, 255))
                     if state == 1 :
-                        surface = font.render("OPEN TABLE", True, (255, 255, 255))
+                        surface = renderText(font, "OPEN TABLE", (255, 255, 255))
                     screen.blit(surface, (icons[i].x + icons[i].width / 2 - surface.get_width() / 2, icons[i].y - respValY(35), respValX(2000), respValY(1000)))
 
                 elif icons[i] == backIconRect :
-                    font = pygame.font.SysFont(mainFont, int(respValY(25, False)), bold=False)
-                    surface = font.render("BACK", True, (255, 255, 255))
+                    font = getFont(mainFont, int(respValY(25, False)), bold=False)
+                    surface = renderText(font, "BACK", (255, 255, 255))
                     screen.blit(surface, (icons[i].x + icons[i].width / 2 - surface.get_width() / 2, icons[i].y - respValY(35), respValX(2000), respValY(1000)))
 
                 elif icons[i] == undoIconRect :
-                    font = pygame.font.SysFont(mainFont, int(respValY(25, False)), bold=False)
-                    surface = font.render("UNDO", True, (255, 255, 255))
+                    font = getFont(mainFont, int(respValY(25, False)), bold=False)
+                    surface = renderText(font, "UNDO", (255, 255, 255))
                     screen.blit(surface, (icons[i].x + icons[i].width / 2 - surface.get_width() / 2, icons[i].y - respValY(35), respValX(2000), respValY(1000)))
 
                 elif icons[i] == redoIconRect :
-                    font = pygame.font.SysFont(mainFont, int(respValY(25, False)), bold=False)
-                    surface = font.render("REDO", True, (255, 255, 255))
+                    font = getFont(mainFont, int(respValY(25, False)), bold=False)
+                    surface = renderText(font, "REDO", (255, 255, 255))
                     screen.blit(surface, (icons[i].x + icons[i].width / 2 - surface.get_width() / 2, icons[i].y - respValY(35), respValX(2000), respValY(1000)))
 
         if backIconRect in icons :
@@ -2228,75 +1634,15 @@ while running:
             pygame.draw.line(toolabarSurface, (51, 51, 51), (enterQueryIconRect.x + respValX(18), ty + respValY(45)), (enterQueryIconRect.x + respValX(30), ty + respValY(36)), 5)
             pygame.draw.line(toolabarSurface, (51, 51, 51), (enterQueryIconRect.x + respValX(30), ty + respValY(50)), (enterQueryIconRect.x + respValX(42), ty + respValY(50)), 5)
 
-    if state == 0 :
-        font = pygame.font.SysFont(mainFont,int(respValY(50,False)),bold=False)
-        surface = font.render("DATABASE VIEW",True,(203, 206, 210))
-        surface.set_alpha(200)
-        screen.blit(surface, (respValX(30), respValY(25), respValX(2000), respValY(1000)))
-
-    elif state == 1 :
-        font = pygame.font.SysFont(mainFont,int(respValY(50,False)),bold=False)
-        surface = font.render(f"{openedDatabase.name}",True,(203, 206, 210))
-        surface.set_alpha(200)
-        screen.blit(surface, (respValX(30), respValY(25), respValX(2000), respValY(1000)))
-
-    screen.blit(vignette, (0, 0))
-
-    if state == 2 :
-        scrollValueVertical = max(0, scrollValueVertical)
-        scrollValueHorizontal = max(0, scrollValueHorizontal)
-
-        screen.fill((30,30,30))
-
-        if not os.path.exists(os.path.join('DATABASES', "RESULT.csv")) :
-            f = open(os.path.join('DATABASES', openedDatabase.name, f"{openedTable.name}.csv"), 'r', newline='')
-        else :
-            f = open(os.path.join('DATABASES', "RESULT.csv"), 'r', newline='')
-        reader = csv.reader(f)
-        all_data = [row for row in reader]
-        f.close()
-        header = all_data[0] if len(all_data)>0 else []
-
-        visibleRows = 21
-        visibleCols = 12
-        rowStart = scrollValueVertical
-        colStart = scrollValueHorizontal
-
-        for screenRowIndex,j in enumerate(range(rowStart,rowStart+visibleRows)):
-            pygame.draw.rect(screen,"BLACK",(respValX(10,False),respValY(55,False)+screenRowIndex*respValY(50,False),screen.get_width()-respValX(1880,False),respValY(40,False)), border_radius=respValX(5))
-            font = pygame.font.SysFont(mainFont,int(respValY(40,False)),bold=False)
-            text = str(j)
-            surface = font.render(text,True,"WHITE")
-            max_w = screen.get_width()-respValX(1880,False)
-            if surface.get_width()>max_w: surface = pygame.transform.smoothscale(surface,(max_w,surface.get_height()))
-            screen.blit(surface,(respValX(10,False)+respValX(10,False)*int(len(text)<2),respValY(57.5,False)+screenRowIndex*respValY(50,False)))
-
-        for screenColIndex,i in enumerate(range(colStart,colStart+visibleCols)):
-            pygame.draw.rect(screen,"BLACK",(respValX(55,False)+screenColIndex*respValX(170,False),respValY(10,False),respValX(160,False),respValY(40,False)), border_radius=respValX(5))
-            font = pygame.font.SysFont(mainFont,int(respValY(40,False)),bold=False)
-            text = header[i] if i<len(header) else ""
-            surface = font.render(text,True,"WHITE")
-            max_w = respValX(160,False)-respValX(20,False)
-            if surface.get_width()>max_w: surface = pygame.transform.smoothscale(surface,(max_w,surface.get_height()))
-            screen.blit(surface,(respValX(55,False)+screenColIndex*respValX(170,False)+respValX(10,False),respValY(12.5,False)))
-
-        for screenColIndex,i in enumerate(range(colStart,colStart+visibleCols)):
-            for screenRowIndex,j in enumerate(range(rowStart,rowStart+visibleRows)):
-                pygame.draw.rect(screen,(200,200,200),(respValX(55,False)+screenColIndex*respValX(170,False),respValY(55,False)+screenRowIndex*respValY(50,False),respValX(160,False),respValY(40,False)), border_radius=respValX(5))
-                if j+1<len(all_data) and i<len(all_data[j+1]):
-                    text = all_data[j+1][i]
-                    font = pygame.font.SysFont(mainFont,int(respValY(30,False)),bold=True)
-                    surface = font.render(text,True,"BLACK")
-                    max_w = respValX(160,False)-respValX(20,False)
-                    if surface.get_width()>max_w: surface = pygame.transform.smoothscale(surface,(max_w,surface.get_height()))
-                    screen.blit(surface,(respValX(55,False)+screenColIndex*respValX(170,False)+respValX(10,False),respValY(60,False)+screenRowIndex*respValY(50,False)))
-
-    if state == 2 :
-        screen.blit(gradient, (0,0))
-
     screen.blit(toolabarSurface, (0,0))
 
-    pygame.display.flip()
+    if sceneDirty:
+        pygame.display.flip()
+    else:
+        pygame.display.update(pygame.Rect(0, toolbarTop, screen.get_width(), screen.get_height() - toolbarTop))
+
+    sceneDirty = False
+    toolbarDirty = False
 
     clock.tick(60)
 
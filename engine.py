@@ -0,0 +1,3721 @@
+import os
+import csv
+import io
+import pickle
+import time
+import re
+import operator
+import json
+import mmap
+import struct
+import threading
+import heapq
+import tempfile
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress, repeat, islice, accumulate, groupby
+from collections import OrderedDict, Counter
+
+class Database:
+    def __init__(self, name, x=0, y=0):
+        self.name = name.upper()
+        self.x = x
+        self.y = y
+        self.tables = []
+
+class Table:
+    indexes = ()
+
+    def __init__(self, name, columns, x=0, y=0):
+        self.name = name.upper()
+        self.columns = [col.upper() for col in columns]
+        self.types = ["I" for _ in columns]
+        self.x = x
+        self.y = y
+        self.primaryKeyIndex = None
+        self.foreignKeys = []
+        self.indexes = []
+
+    def addForeignKey(self, columnIndex, referencedTable, referencedColumnIndex):
+        self.foreignKeys.append({
+            "column": columnIndex,
+            "ref_table": referencedTable,
+            "ref_column": referencedColumnIndex
+        })
+
+durableWrites = False
+
+def appendRows(filePath, rows, durable=None):
+    if durable is None:
+        durable = durableWrites
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(rows)
+    data = buffer.getvalue().encode()
+
+    with open(filePath, 'ab+') as f:
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+
+        if offset > 0:
+            f.seek(offset - 1)
+            if f.read(1) != b'\n':
+                data = b'\r\n' + data
+                offset += 2
+
+        f.write(data)
+        f.flush()
+
+        if durable:
+            os.fsync(f.fileno())
+
+    return offset
+
+def tablePath(dbName, tableName):
+    if dbName is None:
+        return os.path.join('DATABASES', f"{tableName}.csv")
+    return os.path.join('DATABASES', dbName, f"{tableName}.csv")
+
+def readTable(filePath):
+    with open(filePath, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        rows = [row for row in reader]
+
+    for row in rows:
+        if len(row) < len(header):
+            row += [""] * (len(header) - len(row))
+
+    return header, rows
+
+def writeTable(filePath, header, rows, durable=None):
+    if durable is None:
+        durable = durableWrites
+
+    with open(filePath, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        if header or rows:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+        if durable:
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
+
+def columnarPath(dbName, tableName):
+    return os.path.join('DATABASES', dbName, f"{tableName}.vcol")
+
+def locateTable(dbName, tableName):
+    filePath = tablePath(dbName, tableName)
+    if dbName is not None and not os.path.exists(filePath):
+        columnarFile = columnarPath(dbName, tableName)
+        if os.path.exists(columnarFile):
+            return columnarFile
+    return filePath
+
+def resolvePath(filePath):
+    if os.path.exists(filePath):
+        return filePath
+
+    drive, rest = os.path.splitdrive(filePath)
+    current = drive + os.sep if os.path.isabs(filePath) else drive or '.'
+
+    for part in [p for p in re.split(r"[\\/]", rest) if p]:
+        candidate = os.path.join(current, part)
+        if not os.path.exists(candidate):
+            try:
+                names = os.listdir(current)
+            except OSError:
+                return None
+            match = next((name for name in names if name.lower() == part.lower()), None)
+            if match is None:
+                return None
+            candidate = os.path.join(current, match)
+        current = candidate
+
+    return current
+
+def keyIndexPath(dbName, tableName):
+    return os.path.join('DATABASES', dbName, f"{tableName}.pkidx")
+
+def rowIndexPath(filePath):
+    return os.path.splitext(filePath)[0] + ".rowidx"
+
+def orderedIndexPath(dbName, tableName):
+    return os.path.join('DATABASES', dbName, f"{tableName}.idx")
+
+def indexTailPath(filePath):
+    return os.path.splitext(filePath)[0] + ".idxtail"
+
+def statsPath(filePath):
+    return os.path.splitext(filePath)[0] + ".stats"
+
+def tableFiles(dbName, tableName):
+    paths = (tablePath(dbName, tableName), columnarPath(dbName, tableName), keyIndexPath(dbName, tableName),
+             rowIndexPath(tablePath(dbName, tableName)), orderedIndexPath(dbName, tableName), indexTailPath(tablePath(dbName, tableName)),
+             statsPath(tablePath(dbName, tableName)))
+    return [path for path in paths if os.path.exists(path)]
+
+columnarMagic = b"VCOL1\n"
+
+def renderValue(kind, value):
+    if kind == "F":
+        text = repr(value)
+        return text[:-2] if text.endswith(".0") else text
+    return str(value)
+
+def nullBitmap(cells):
+    bits = bytearray((len(cells) + 7) // 8)
+    for i, cell in enumerate(cells):
+        if cell == "":
+            bits[i >> 3] |= 1 << (i & 7)
+    return bits
+
+def encodeColumn(colType, cells):
+    try:
+        if colType == "I":
+            values = [int(cell) if cell != "" else 0 for cell in cells]
+            if all(cell == "" or str(value) == cell for cell, value in zip(cells, values)):
+                return "I", [array("q", values).tobytes()]
+        if colType == "F":
+            values = [float(cell) if cell != "" else 0.0 for cell in cells]
+            if all(cell == "" or renderValue("F", value) == cell for cell, value in zip(cells, values)):
+                return "F", [array("d", values).tobytes()]
+        if colType == "B" and all(cell in ("", "true", "false") for cell in cells):
+            bits = bytearray((len(cells) + 7) // 8)
+            for i, cell in enumerate(cells):
+                if cell == "true":
+                    bits[i >> 3] |= 1 << (i & 7)
+            return "B", [bytes(bits)]
+    except (ValueError, OverflowError):
+        pass
+
+    blobs = [cell.encode() for cell in cells]
+    offsets = array("q", [0])
+    total = 0
+    for blob in blobs:
+        total += len(blob)
+        offsets.append(total)
+    return "S", [offsets.tobytes(), b"".join(blobs)]
+
+class SegmentWriter:
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+
+    def place(self, data):
+        span = [self.offset, len(data)]
+        padding = (-len(data)) % 8
+        self.chunks.append(data)
+        self.chunks.append(b"\0" * padding)
+        self.offset += len(data) + padding
+        return span
+
+    def pack(self, magic, meta):
+        meta = json.dumps(meta).encode()
+        prefix = magic + struct.pack("<Q", len(meta)) + meta
+        prefix += b"\0" * ((-len(prefix)) % 8)
+
+        return prefix + b"".join(self.chunks)
+
+def encodeColumnar(header, rows, types):
+    writer = SegmentWriter()
+    place = writer.place
+    segments = []
+
+    for index, col in enumerate(header):
+        cells = [row[index] if index < len(row) else "" for row in rows]
+        colType = types[index] if index < len(types) else "S"
+        kind, parts = encodeColumn(colType, cells)
+
+        segment = {"name": col, "kind": kind, "nulls": place(bytes(nullBitmap(cells)))}
+        if kind == "S":
+            segment["offsets"] = place(parts[0])
+        segment["data"] = place(parts[1] if kind == "S" else parts[0])
+        segments.append(segment)
+
+    return writer.pack(columnarMagic, {"rows": len(rows), "columns": segments})
+
+def writeColumnar(filePath, header, rows, types, durable=None):
+    if durable is None:
+        durable = durableWrites
+
+    with open(filePath, 'wb') as f:
+        f.write(encodeColumnar(header, rows, types))
+
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+def readColumnar(filePath):
+    with ColumnarFile(filePath) as table:
+        columns = [table.strings(i) for i in range(len(table.header))]
+        if columns:
+            rows = [list(row) for row in zip(*columns)]
+        else:
+            rows = [[] for _ in range(table.rowCount)]
+        return list(table.header), rows
+
+class MappedFile:
+    magic = b""
+    description = "mapped file"
+
+    def __init__(self, filePath):
+        self.file = open(filePath, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.map)
+        self.views = []
+
+        if self.buffer[:len(self.magic)] != self.magic:
+            self.close()
+            raise ValueError(f"{filePath} is not a {self.description}")
+
+        start = len(self.magic) + 8
+        metaLength = struct.unpack_from("<Q", self.map, len(self.magic))[0]
+        self.meta = json.loads(bytes(self.buffer[start:start + metaLength]))
+        self.base = start + metaLength + (-(start + metaLength)) % 8
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.buffer.release()
+        self.map.close()
+        self.file.close()
+
+    def view(self, span, fmt=None):
+        view = self.buffer[self.base + span[0]:self.base + span[0] + span[1]]
+        self.views.append(view)
+        if fmt is not None:
+            view = view.cast(fmt)
+            self.views.append(view)
+        return view
+
+class ColumnarFile(MappedFile):
+    magic = columnarMagic
+    description = "columnar table"
+
+    def __init__(self, filePath):
+        super().__init__(filePath)
+
+        self.rowCount = self.meta["rows"]
+        self.segments = self.meta["columns"]
+        self.header = [segment["name"] for segment in self.segments]
+
+    def nullRows(self, index):
+        bits = self.view(self.segments[index]["nulls"])
+        return {byteIndex * 8 + bit for byteIndex, byte in enumerate(bits) if byte for bit in range(8) if byte >> bit & 1}
+
+    def values(self, index):
+        segment = self.segments[index]
+        return self.view(segment["data"], "q" if segment["kind"] == "I" else "d")
+
+    def strings(self, index, rowIndices=None):
+        segment = self.segments[index]
+        kind = segment["kind"]
+
+        if rowIndices is None:
+            rowIndices = range(self.rowCount)
+
+        if kind == "S":
+            offsets = self.view(segment["offsets"], "q")
+            blob = self.view(segment["data"])
+            return [bytes(blob[offsets[i]:offsets[i + 1]]).decode() for i in rowIndices]
+
+        nulls = self.nullRows(index)
+
+        if kind == "B":
+            bits = self.view(segment["data"])
+            return ["" if i in nulls else "true" if bits[i >> 3] >> (i & 7) & 1 else "false" for i in rowIndices]
+
+        values = self.values(index)
+        return ["" if i in nulls else renderValue(kind, values[i]) for i in rowIndices]
+
+    def filterColumn(self, index, colType, op, val, candidates):
+        kind = self.segments[index]["kind"]
+        check = compileValueCheck(colType, op, val)
+
+        literal = None
+        if kind in ("I", "F") and colType in ("I", "F") and op != "LIKE":
+            try:
+                literal = numberValue(kind, val)
+            except ValueError:
+                pass
+
+        if literal is None:
+            return [i for i, cell in zip(candidates, self.strings(index, candidates)) if check(cell)]
+
+        values = self.values(index)
+        picked = list(compress(candidates, map(comparisons[op], map(values.__getitem__, candidates), repeat(literal))))
+
+        nulls = self.nullRows(index)
+        if nulls:
+            inCandidates = candidates if isinstance(candidates, range) else set(candidates)
+            picked = [i for i in picked if i not in nulls]
+            if check(""):
+                picked = sorted(picked + [i for i in nulls if i in inCandidates])
+
+        return picked
+
+    def scan(self, predicate, rowIndices=None):
+        matched = set()
+
+        for group in predicate.groups:
+            candidates = range(self.rowCount) if rowIndices is None else rowIndices
+            for col, index, op, val in group:
+                candidates = self.filterColumn(index, predicate.columnType(index), op, val, candidates)
+                if not candidates:
+                    break
+            matched.update(candidates)
+
+        return sorted(matched)
+
+    def select(self, predicate, selectedIndexes, rowIndices=None):
+        return list(self.stream(predicate, selectedIndexes, rowIndices))
+
+    def stream(self, predicate, selectedIndexes, rowIndices=None, batchRows=65536):
+        if predicate is not None:
+            rowIndices = self.scan(predicate, rowIndices)
+        elif rowIndices is None:
+            rowIndices = range(self.rowCount)
+
+        for start in range(0, len(rowIndices), batchRows):
+            batch = rowIndices[start:start + batchRows]
+            columns = [self.strings(i, batch) for i in selectedIndexes]
+            if not columns:
+                yield from ([] for _ in batch)
+            else:
+                yield from map(list, zip(*columns))
+
+rowIndexEvery = 256
+
+class RowOffsetIndex:
+    def __init__(self, every=None):
+        self.every = every or rowIndexEvery
+        self.header = []
+        self.offsets = array('q')
+        self.rowCount = 0
+        self.end = 0
+
+    def build(self, filePath, cancelled=None, progress=None):
+        with open(filePath, 'rb') as f:
+            headerLine = f.readline()
+            while headerLine.count(b'"') % 2:
+                line = f.readline()
+                if not line:
+                    break
+                headerLine += line
+            self.header = next(csv.reader(io.StringIO(headerLine.decode(), newline='')), [])
+
+            self.offsets = array('q')
+            self.rowCount = 0
+            self.end = f.tell()
+            self.scan(f, self.end, cancelled, progress)
+
+    def extend(self, filePath, offset):
+        with open(filePath, 'rb') as f:
+            self.scan(f, offset)
+
+    def scan(self, f, offset, cancelled=None, progress=None):
+        every = self.every
+        rows = self.rowCount
+        inQuotes = False
+        carry = b""
+        lastReport = time.monotonic()
+
+        f.seek(offset)
+
+        while not (cancelled and cancelled()):
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+
+            data = carry + chunk
+            lines = data.split(b'\n')
+            carry = lines.pop()
+
+            if not inQuotes and b'"' not in data:
+                starts = list(accumulate(map(len, lines), initial=0))
+                for i in range((-rows) % every, len(lines), every):
+                    self.offsets.append(offset + starts[i] + i)
+                offset += starts[-1] + len(lines)
+                rows += len(lines)
+            else:
+                for line in lines:
+                    if not inQuotes:
+                        if rows % every == 0:
+                            self.offsets.append(offset)
+                        rows += 1
+                    if line.count(b'"') % 2:
+                        inQuotes = not inQuotes
+                    offset += len(line) + 1
+
+            self.rowCount = rows
+            self.end = offset
+
+            if progress and time.monotonic() - lastReport >= 0.1:
+                lastReport = time.monotonic()
+                progress()
+
+        if carry and not inQuotes:
+            if rows % every == 0:
+                self.offsets.append(offset)
+            rows += 1
+            offset += len(carry)
+
+        self.rowCount = rows
+        self.end = offset
+
+    def seek(self, row):
+        block = row // self.every
+        if row < 0 or block >= len(self.offsets):
+            return None
+        return self.offsets[block], row - block * self.every
+
+    def read(self, filePath, start, count):
+        position = self.seek(start)
+        if position is None:
+            return None
+
+        offset, skip = position
+        with open(filePath, 'rb') as f:
+            f.seek(offset)
+            rows = list(islice(csv.reader(io.TextIOWrapper(f, newline='')), skip, skip + count))
+
+        for row in rows:
+            if len(row) < len(self.header):
+                row += [""] * (len(self.header) - len(row))
+
+        return rows
+
+    def rows(self, filePath, positions):
+        every = self.every
+
+        with open(filePath, 'rb') as f:
+            for block, group in groupby(positions, lambda position: position // every):
+                start = self.offsets[block]
+                end = self.offsets[block + 1] if block + 1 < len(self.offsets) else self.end
+                f.seek(start)
+                rows = list(csv.reader(io.TextIOWrapper(io.BytesIO(f.read(end - start)), newline='')))
+
+                for position in group:
+                    row = rows[position - block * every]
+                    if len(row) < len(self.header):
+                        row += [""] * (len(self.header) - len(row))
+                    yield row
+
+    def chunks(self, parts):
+        blocks = len(self.offsets)
+        if not blocks:
+            return []
+
+        parts = max(1, min(parts, blocks))
+        bounds = [blocks * i // parts for i in range(parts + 1)]
+        ends = [self.offsets[b] if b < blocks else self.end for b in bounds[1:]]
+
+        return [(bounds[i] * self.every, self.offsets[bounds[i]], ends[i]) for i in range(parts)]
+
+def loadRowIndex(filePath, signature):
+    if signature is None:
+        return None
+
+    try:
+        with open(rowIndexPath(filePath), 'rb') as f:
+            stored = pickle.load(f)
+    except Exception:
+        return None
+
+    if stored.get("signature") != signature or stored.get("every") != rowIndexEvery:
+        return None
+
+    index = RowOffsetIndex(stored["every"])
+    index.header = stored["header"]
+    index.offsets.frombytes(stored["offsets"])
+    index.rowCount = stored["rows"]
+    index.end = stored["end"]
+    return index
+
+def saveRowIndex(filePath, index, signature):
+    with open(rowIndexPath(filePath), 'wb') as f:
+        pickle.dump({"signature": signature, "every": index.every, "header": index.header,
+                     "offsets": index.offsets.tobytes(), "rows": index.rowCount, "end": index.end}, f)
+
+def estimateRowCount(filePath, sampleBytes=1 << 16):
+    with open(filePath, 'rb') as f:
+        sample = f.read(sampleBytes)
+        size = os.fstat(f.fileno()).st_size
+
+    lines = sample.count(b'\n')
+    if len(sample) >= size:
+        return max(0, lines - 1)
+    return size * lines // len(sample)
+
+def tableRowIndex(filePath):
+    signature = TableCache.signature(filePath)
+    index = loadRowIndex(filePath, signature)
+    if index is None:
+        index = RowOffsetIndex()
+        index.build(filePath)
+        if index.rowCount >= index.every:
+            saveRowIndex(filePath, index, signature)
+    return index
+
+class CachedTable:
+    def __init__(self, key, path, header, rows, signature):
+        self.key = key
+        self.path = path
+        self.header = header
+        self.rows = rows
+        self.signature = signature
+        self.dirty = False
+        self.pendingRows = []
+        self.keyIndex = None
+        self.valueSets = {}
+        self.stats = None
+
+        cells = max(1, len(rows) * max(1, len(header)))
+        textBytes = signature[1] if signature else 0
+        self.rowBytes = 64 + max(1, len(header)) * (56 + textBytes // cells)
+        self.size = (len(rows) + 1) * self.rowBytes
+
+class TableCache:
+    def __init__(self, maxBytes=256 * 1024 * 1024, flushPolicy="COMMIT", flushInterval=5.0):
+        self.entries = OrderedDict()
+        self.maxBytes = maxBytes
+        self.usedBytes = 0
+        self.flushPolicy = flushPolicy
+        self.flushInterval = flushInterval
+        self.lastFlush = time.monotonic()
+        self.listeners = []
+        self.tableTypes = lambda dbName, tableName: []
+        self.tableIndexes = lambda dbName, tableName: []
+
+    def notify(self, key):
+        for listener in self.listeners:
+            listener(key)
+
+    @staticmethod
+    def signature(filePath):
+        try:
+            st = os.stat(filePath)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, dbName, tableName):
+        key = (dbName, tableName)
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            if entry.dirty or entry.pendingRows or entry.signature == self.signature(entry.path):
+                self.entries.move_to_end(key)
+                return entry
+            self.discard(dbName, tableName)
+
+        filePath = locateTable(dbName, tableName)
+        signature = self.signature(filePath)
+        if filePath.endswith(".vcol"):
+            header, rows = readColumnar(filePath)
+        else:
+            header, rows = readTable(filePath)
+
+        entry = CachedTable(key, filePath, header, rows, signature)
+
+        self.entries[key] = entry
+        self.usedBytes += entry.size
+        self.evict(keep=key)
+
+        return entry
+
+    def put(self, dbName, tableName, header, rows):
+        key = (dbName, tableName)
+        filePath = tablePath(dbName, tableName)
+        self.discard(dbName, tableName)
+        writeTable(filePath, header, rows)
+
+        entry = CachedTable(key, filePath, header, rows, self.signature(filePath))
+        self.entries[key] = entry
+        self.usedBytes += entry.size
+        self.evict(keep=key)
+        self.notify(key)
+
+        return entry
+
+    def peek(self, dbName, tableName):
+        return self.entries.get((dbName, tableName))
+
+    def resize(self, entry):
+        self.usedBytes -= entry.size
+        entry.size = (len(entry.rows) + 1) * entry.rowBytes
+        self.usedBytes += entry.size
+
+    def markDirty(self, entry, keepIndexes=False):
+        if not keepIndexes:
+            entry.keyIndex = None
+            entry.valueSets = {}
+            entry.stats = None
+        entry.dirty = True
+        entry.pendingRows = []
+        self.resize(entry)
+        self.notify(entry.key)
+
+    def setHeader(self, entry, header):
+        entry.header = header
+        for row in entry.rows:
+            if len(row) < len(header):
+                row += [""] * (len(header) - len(row))
+        self.markDirty(entry)
+
+    def appendRows(self, entry, rows):
+        if entry.stats is None and not entry.dirty and not entry.pendingRows and entry.key[0] is not None:
+            entry.stats = loadTableStats(entry.path, entry.signature, entry.header, self.tableTypes(*entry.key))
+        if entry.keyIndex is not None:
+            entry.keyIndex.add(len(entry.rows), rows)
+        for valueSet in entry.valueSets.values():
+            valueSet.add(rows)
+        if entry.stats is not None:
+            entry.stats.add(rows)
+        entry.rows.extend(rows)
+        if not entry.dirty:
+            entry.pendingRows.extend(rows)
+        self.resize(entry)
+        self.evict(keep=entry.key)
+        self.notify(entry.key)
+
+    def spliceRows(self, entry, start, count, rows):
+        removed = entry.rows[start:start + count]
+        tail = start + count >= len(entry.rows)
+        entry.rows[start:start + count] = rows
+
+        if entry.keyIndex is not None and not entry.keyIndex.splice(start, removed, rows, tail):
+            entry.keyIndex = None
+        for valueSet in entry.valueSets.values():
+            valueSet.remove(removed)
+            valueSet.add(rows)
+        if entry.stats is not None:
+            entry.stats.remove(removed)
+            entry.stats.add(rows)
+
+        self.markDirty(entry, keepIndexes=True)
+        return removed
+
+    def writeBack(self, entry):
+        appendedAt = None
+        appended = None if entry.dirty else entry.pendingRows
+
+        if entry.path.endswith(".vcol"):
+            if not entry.dirty and not entry.pendingRows:
+                return
+            writeColumnar(entry.path, entry.header, entry.rows, self.tableTypes(*entry.key))
+        elif entry.dirty:
+            writeTable(entry.path, entry.header, entry.rows)
+        elif entry.pendingRows:
+            appendedAt = appendRows(entry.path, entry.pendingRows)
+        else:
+            return
+
+        previous = entry.signature
+        entry.dirty = False
+        entry.pendingRows = []
+        entry.signature = self.signature(entry.path)
+        self.updateRowIndex(entry, previous, appendedAt)
+        self.updateOrderedIndexes(entry, previous, appended)
+
+    def updateRowIndex(self, entry, previous, appendedAt):
+        if entry.key[0] is None or entry.path.endswith(".vcol"):
+            return
+
+        if len(entry.rows) < rowIndexEvery:
+            if os.path.exists(rowIndexPath(entry.path)):
+                os.remove(rowIndexPath(entry.path))
+            return
+
+        index = None
+        if appendedAt is not None:
+            index = loadRowIndex(entry.path, previous)
+            if index is not None:
+                index.extend(entry.path, appendedAt)
+
+        if index is None:
+            index = RowOffsetIndex()
+            index.build(entry.path)
+
+        saveRowIndex(entry.path, index, entry.signature)
+
+    def updateOrderedIndexes(self, entry, previous, appended):
+        if entry.key[0] is None:
+            return
+
+        filePath = orderedIndexPath(*entry.key)
+        types = self.tableTypes(*entry.key)
+        columns = [(entry.header.index(name), name) for name in self.tableIndexes(*entry.key) if name in entry.header]
+        columns = [(column, name) for column, name in columns if column < len(types) and types[column] in orderedIndexTypes]
+
+        tailPath = indexTailPath(filePath)
+
+        if not columns:
+            for path in (filePath, tailPath):
+                if os.path.exists(path):
+                    os.remove(path)
+            return
+
+        indexFile = loadOrderedIndexes(filePath, previous) if appended is not None else None
+        stored = indexFile.indexes if indexFile is not None else {}
+        start = len(entry.rows) - len(appended or [])
+        indexes = []
+        compact = False
+
+        try:
+            for column, name in columns:
+                index = stored.get(name)
+                if index is not None and index.colType == types[column] and index.rowCount == start:
+                    tail = index.tail.copy() if index.tail is not None else OrderedIndex(name, index.colType, every=index.every)
+                    tail.extend([row[column] for row in appended], start)
+                    index = OrderedIndex(name, index.colType, index.keys, index.positions, index.blanks, index.others, index.fences, index.every)
+                    index.tail = tail
+                    compact = compact or tail.rowCount > orderedIndexTailRows
+                else:
+                    index = OrderedIndex(name, types[column])
+                    index.build([row[column] for row in entry.rows])
+                indexes.append(index)
+
+            if indexFile is None or compact or any(index.tail is None for index in indexes):
+                indexes = [index.compacted() for index in indexes]
+                compact = True
+        finally:
+            if indexFile is not None:
+                indexFile.close()
+
+        if not compact:
+            writeOrderedIndexes(tailPath, [index.tail for index in indexes], entry.signature, indexFile.signature)
+            return
+
+        writeOrderedIndexes(filePath, indexes, entry.signature)
+        if os.path.exists(tailPath):
+            os.remove(tailPath)
+
+    def flush(self):
+        for entry in self.entries.values():
+            self.writeBack(entry)
+        self.lastFlush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        for entry in self.entries.values():
+            saveKeyIndex(entry)
+            saveEntryStats(entry)
+
+    def commit(self):
+        if self.flushPolicy == "COMMIT":
+            self.flush()
+
+    def tick(self):
+        if self.flushPolicy == "INTERVAL" and time.monotonic() - self.lastFlush >= self.flushInterval:
+            self.flush()
+
+    def evict(self, keep=None):
+        while self.usedBytes > self.maxBytes and len(self.entries) > 1:
+            key, entry = next(iter(self.entries.items()))
+            if key == keep:
+                self.entries.move_to_end(key)
+                key, entry = next(iter(self.entries.items()))
+            self.writeBack(entry)
+            saveKeyIndex(entry)
+            saveEntryStats(entry)
+            self.discard(*key)
+
+    def discard(self, dbName, tableName):
+        entry = self.entries.pop((dbName, tableName), None)
+        if entry is not None:
+            self.usedBytes -= entry.size
+            self.notify((dbName, tableName))
+
+    def discardDatabase(self, dbName):
+        for key in [k for k in self.entries if k[0] == dbName]:
+            self.discard(*key)
+
+    def clear(self):
+        self.entries.clear()
+        self.usedBytes = 0
+        self.notify(None)
+
+class PagedTable:
+    def __init__(self, filePath, pageRows=256, maxPages=64, onChange=None, saveIndex=False):
+        self.path = filePath
+        self.signature = TableCache.signature(filePath)
+        self.pageRows = pageRows
+        self.maxPages = maxPages
+        self.onChange = onChange or (lambda: None)
+        self.saveIndex = saveIndex
+        self.index = RowOffsetIndex()
+        self.complete = False
+        self.pages = OrderedDict()
+        self.requests = []
+        self.lock = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    @property
+    def header(self):
+        return self.index.header
+
+    @property
+    def rowCount(self):
+        return self.index.rowCount
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.pages.clear()
+            self.lock.notify()
+
+        self.thread.join()
+
+    def run(self):
+        try:
+            if self.path.endswith(".vcol"):
+                with ColumnarFile(self.path) as columns:
+                    self.index.header = columns.header
+                    self.index.rowCount = columns.rowCount
+            else:
+                index = loadRowIndex(self.path, self.signature)
+                if index is not None:
+                    self.index = index
+                else:
+                    self.index.build(self.path, cancelled=lambda: self.closed, progress=self.onChange)
+                    if self.saveIndex and not self.closed and self.index.rowCount >= self.index.every:
+                        saveRowIndex(self.path, self.index, self.signature)
+        except (OSError, ValueError):
+            pass
+
+        self.complete = True
+        self.onChange()
+
+        while True:
+            with self.lock:
+                while not self.requests and not self.closed:
+                    self.lock.wait()
+                if self.closed:
+                    return
+                pageIndex = self.requests.pop()
+            self.page(pageIndex)
+
+    def readPage(self, pageIndex):
+        start = pageIndex * self.pageRows
+
+        if self.path.endswith(".vcol"):
+            stop = min(start + self.pageRows, self.rowCount)
+            if start >= stop:
+                return None
+            with ColumnarFile(self.path) as columns:
+                cells = [columns.strings(index, range(start, stop)) for index in range(len(columns.header))]
+            return [list(row) for row in zip(*cells)]
+
+        return self.index.read(self.path, start, self.pageRows)
+
+    def page(self, pageIndex):
+        with self.lock:
+            rows = self.pages.get(pageIndex)
+            if rows is not None:
+                self.pages.move_to_end(pageIndex)
+                return rows
+            if self.closed:
+                return None
+
+        try:
+            rows = self.readPage(pageIndex)
+        except (OSError, ValueError):
+            rows = None
+
+        if rows is not None:
+            with self.lock:
+                self.pages[pageIndex] = rows
+                while len(self.pages) > self.maxPages:
+                    self.pages.popitem(last=False)
+
+        return rows
+
+    def prefetch(self, pageIndices):
+        with self.lock:
+            for pageIndex in pageIndices:
+                if pageIndex >= 0 and pageIndex not in self.pages and pageIndex not in self.requests:
+                    self.requests.append(pageIndex)
+            del self.requests[:-4]
+            self.lock.notify()
+
+    def window(self, rowStart, rowCount):
+        return pageWindow(self, rowStart, rowCount)
+
+class ResultCursor:
+    def __init__(self, header, rows, spillDir, pageRows=256, maxPages=64):
+        self.header = header
+        self.pageRows = pageRows
+        self.maxPages = maxPages
+        self.pages = OrderedDict()
+        self.offsets = []
+        self.rowCount = 0
+        self.complete = True
+        self.file = tempfile.TemporaryFile(prefix=".result-", dir=spillDir)
+
+        rows = iter(rows)
+        for batch in iter(lambda: list(islice(rows, pageRows)), []):
+            self.offsets.append(self.file.tell())
+            pickle.dump(batch, self.file)
+            self.rowCount += len(batch)
+
+    def close(self):
+        self.pages.clear()
+
+    def discard(self):
+        self.pages.clear()
+        self.file.close()
+
+    def rows(self):
+        for pageIndex in range(len(self.offsets)):
+            yield from self.page(pageIndex)
+
+    def page(self, pageIndex):
+        rows = self.pages.get(pageIndex)
+        if rows is not None:
+            self.pages.move_to_end(pageIndex)
+            return rows
+
+        if pageIndex >= len(self.offsets):
+            return None
+
+        self.file.seek(self.offsets[pageIndex])
+        rows = pickle.load(self.file)
+        self.pages[pageIndex] = rows
+        while len(self.pages) > self.maxPages:
+            self.pages.popitem(last=False)
+        return rows
+
+    def prefetch(self, pageIndices):
+        pass
+
+    def window(self, rowStart, rowCount):
+        return pageWindow(self, rowStart, rowCount)
+
+def pageWindow(source, rowStart, rowCount):
+    firstPage = rowStart // source.pageRows
+    lastPage = (rowStart + rowCount - 1) // source.pageRows
+    rows = []
+
+    for pageIndex in range(firstPage, lastPage + 1):
+        page = source.page(pageIndex)
+        if page is None:
+            break
+        rows.extend(page)
+
+    source.prefetch([firstPage - 1, lastPage + 1])
+
+    offset = rowStart - firstPage * source.pageRows
+    return rows[offset:offset + rowCount]
+
+def streamTable(filePath, header, rows, batchRows=4096):
+    count = 0
+
+    with open(filePath, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(header)
+
+        for batch in iter(lambda: list(islice(rows, batchRows)), []):
+            writer.writerows(batch)
+            count += len(batch)
+
+    return count
+
+resultPath = os.path.join('DATABASES', "RESULT.csv")
+
+whereOperator = re.compile(r">=|<=|!=|=|>|<| LIKE ")
+
+comparisons = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le
+}
+
+joinPattern = re.compile(r"SELECT\s+(.+?)\s+FROM\s+(\S+)\s+JOIN\s+(\S+)(?:\s+ON\s+(\S+?)\s*=\s*(\S+))?(?:\s+WHERE\s+(.+?))?\s*$")
+
+booleanValues = {"true": "true", "1": "true", "false": "false", "0": "false"}
+
+def parseCondition(cond):
+    match = whereOperator.search(cond)
+    if match is None:
+        raise ValueError(f"Invalid condition '{cond.strip()}'")
+
+    col = cond[:match.start()].strip().upper()
+    op = match.group().strip()
+    val = cond[match.end():].strip()
+
+    if op == "LIKE":
+        val = val.strip("'").strip('"')
+
+    return col, op, val
+
+def splitTuples(text):
+    tuples = []
+    depth = 0
+    gap = []
+
+    for i, char in enumerate(text):
+        if depth == 0:
+            if char == "(":
+                if "".join(gap).strip() != ("," if tuples else ""):
+                    return None
+                start = i + 1
+                depth = 1
+            else:
+                gap.append(char)
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                tuples.append(text[start:i])
+                gap = []
+
+    if depth != 0 or "".join(gap).strip() or not tuples:
+        return None
+    return tuples
+
+def numberValue(colType, text):
+    if colType == "I":
+        try:
+            return int(text)
+        except ValueError:
+            pass
+    return float(text)
+
+def compileValueCheck(colType, op, val):
+    if op == "LIKE":
+        needle = val.lower()
+        return lambda cell: needle in cell.lower()
+
+    compare = comparisons[op]
+
+    try:
+        literal = numberValue(colType, val)
+    except ValueError:
+        return lambda cell: compare(cell, val)
+
+    def check(cell):
+        try:
+            return compare(numberValue(colType, cell), literal)
+        except ValueError:
+            return compare(cell, val)
+    return check
+
+def conditionText(col, op, val):
+    return f"{col} LIKE '{val}'" if op == "LIKE" else f"{col} {op} {val}"
+
+def compileCondition(index, colType, op, val):
+    check = compileValueCheck(colType, op, val)
+    return lambda row: check(row[index])
+
+class WherePredicate:
+    def __init__(self, wherePart, header, types, aliases=None):
+        self.groups = []
+        self.types = types
+
+        orSegments = [seg.strip() for seg in wherePart.split(" OR ")] if wherePart is not None else [""]
+
+        for orPart in orSegments:
+            group = []
+
+            for cond in [a.strip() for a in orPart.split(" AND ") if a.strip()]:
+                col, op, val = parseCondition(cond)
+
+                if col in header:
+                    index = header.index(col)
+                elif aliases and col in aliases:
+                    index = aliases[col]
+                else:
+                    group = None
+                    break
+
+                group.append((col, index, op, val))
+
+            if group is not None:
+                self.groups.append(group)
+
+        self.compile()
+
+    @classmethod
+    def fromGroups(cls, groups, types):
+        predicate = cls(None, [], types)
+        predicate.groups = groups
+        predicate.compile()
+        return predicate
+
+    def compile(self):
+        self.checks = [[compileCondition(index, self.columnType(index), op, val) for col, index, op, val in group] for group in self.groups]
+        self.match = self.combine(self.checks)
+
+    def order(self, selectivity):
+        groups = []
+
+        for group, groupChecks in zip(self.groups, self.checks):
+            ranked = sorted(zip(group, groupChecks), key=lambda pair: selectivity(pair[0]))
+            chance = 1.0
+            for cond, check in ranked:
+                chance *= selectivity(cond)
+            groups.append((chance, [cond for cond, check in ranked], [check for cond, check in ranked]))
+
+        groups.sort(key=lambda group: -group[0])
+        self.groups = [group for chance, group, groupChecks in groups]
+        self.checks = [groupChecks for chance, group, groupChecks in groups]
+        self.match = self.combine(self.checks)
+
+    def text(self):
+        return " OR ".join(" AND ".join(conditionText(col, op, val) for col, index, op, val in group) for group in self.groups)
+
+    def keyLookups(self, index):
+        values = []
+        for group in self.groups:
+            value = next((val for col, i, op, val in group if i == index and op == "="), None)
+            if value is None:
+                return None
+            values.append(value)
+        return values
+
+    def columnType(self, index):
+        return self.types[index] if index < len(self.types) else "S"
+
+    def columns(self):
+        return {col for group in self.groups for col, index, op, val in group}
+
+    def indexCandidates(self, indexes):
+        matched = set()
+
+        for group in self.groups:
+            spans = {}
+            for col, index, op, val in group:
+                ordered = indexes.get(col)
+                if ordered is None or ordered.colType != self.columnType(index):
+                    continue
+                runs = ordered.runs()
+                bounds = [run.span(op, val) for run in runs]
+                if bounds[0] is None:
+                    continue
+                previous, blanks = spans.get(col, ([(0, len(run.keys)) for run in runs], True))
+                blanks = blanks and compileValueCheck(ordered.colType, op, val)("")
+                spans[col] = ([(max(low, span[0]), min(high, span[1])) for (low, high), span in zip(previous, bounds)], blanks)
+
+            if not spans:
+                return None
+
+            col, (bounds, blanks) = min(spans.items(), key=lambda item: sum(high - low for low, high in item[1][0]))
+            for run, (low, high) in zip(indexes[col].runs(), bounds):
+                matched.update(run.positions[low:high])
+                matched.update(run.others)
+                if blanks:
+                    matched.update(run.blanks)
+
+        return sorted(matched)
+
+    @staticmethod
+    def combine(checks):
+        if not checks:
+            return lambda row: False
+
+        if any(len(groupChecks) == 0 for groupChecks in checks):
+            return lambda row: True
+
+        if len(checks) == 1 and len(checks[0]) == 1:
+            return checks[0][0]
+
+        if len(checks) == 1:
+            groupChecks = checks[0]
+
+            def matchAll(row):
+                for check in groupChecks:
+                    if not check(row):
+                        return False
+                return True
+
+            return matchAll
+
+        def match(row):
+            for groupChecks in checks:
+                for check in groupChecks:
+                    if not check(row):
+                        break
+                else:
+                    return True
+            return False
+
+        return match
+
+    def filter(self, rows):
+        match = self.match
+        return [row for row in rows if match(row)]
+
+    def indices(self, rows, candidates=None):
+        match = self.match
+        if candidates is not None:
+            return [i for i in candidates if match(rows[i])]
+        return [i for i, row in enumerate(rows) if match(row)]
+
+def scanContext():
+    if "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    return None
+
+def selectBatch(rows, header, predicate, selectedIndexes):
+    for row in rows:
+        if len(row) < len(header):
+            row += [""] * (len(header) - len(row))
+
+    if predicate is not None:
+        rows = predicate.filter(rows)
+
+    return [[row[i] for i in selectedIndexes] for row in rows]
+
+def scanChunk(filePath, start, end, header, types, groups, selectedIndexes):
+    with open(filePath, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    rows = list(csv.reader(io.TextIOWrapper(io.BytesIO(data), newline='')))
+    predicate = WherePredicate.fromGroups(groups, types) if groups is not None else None
+
+    return selectBatch(rows, header, predicate, selectedIndexes)
+
+def streamSelect(filePath, header, predicate, selectedIndexes, batchRows=4096):
+    with open(filePath, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+
+        for batch in iter(lambda: list(islice(reader, batchRows)), []):
+            yield from selectBatch(batch, header, predicate, selectedIndexes)
+
+def keyValue(colType, cell):
+    if colType in ("I", "F"):
+        try:
+            return numberValue(colType, cell)
+        except ValueError:
+            return cell
+    if colType == "B":
+        return booleanValues.get(cell.lower(), cell)
+    return cell
+
+keyIndexFormat = 2
+
+class KeyIndex:
+    def __init__(self, column, colType):
+        self.column = column
+        self.colType = colType
+        self.positions = {}
+        self.unique = True
+        self.saved = False
+
+    def add(self, start, rows):
+        positions = self.positions
+        column, colType = self.column, self.colType
+
+        for i, row in enumerate(rows, start):
+            key = keyValue(colType, row[column])
+            if key in positions:
+                self.unique = False
+            else:
+                positions[key] = i
+
+        self.saved = False
+
+    def remove(self, start, rows):
+        positions = self.positions
+        column, colType = self.column, self.colType
+
+        for i, row in enumerate(rows, start):
+            key = keyValue(colType, row[column])
+            if positions.get(key) == i:
+                del positions[key]
+
+        self.saved = False
+
+    def splice(self, start, removed, added, tail):
+        if len(removed) != len(added) and not tail:
+            return False
+        if removed and not self.unique:
+            return False
+
+        self.remove(start, removed)
+        self.add(start, added)
+        return True
+
+    def contains(self, cell):
+        return keyValue(self.colType, cell) in self.positions
+
+    def find(self, values):
+        positions = (self.positions.get(keyValue(self.colType, value)) for value in values)
+        return sorted({position for position in positions if position is not None})
+
+def loadKeyIndex(dbName, tableName, column, colType, signature):
+    if signature is None:
+        return None
+
+    try:
+        with open(keyIndexPath(dbName, tableName), 'rb') as f:
+            stored = pickle.load(f)
+    except Exception:
+        return None
+
+    if stored.get("format") != keyIndexFormat or stored.get("signature") != signature or stored.get("column") != column or stored.get("type") != colType:
+        return None
+
+    index = KeyIndex(column, colType)
+    index.positions = stored["positions"]
+    index.unique = stored["unique"]
+    index.saved = True
+    return index
+
+def saveKeyIndex(entry):
+    index = entry.keyIndex
+    if index is None or index.saved or entry.key[0] is None or entry.dirty or entry.pendingRows:
+        return
+
+    with open(keyIndexPath(*entry.key), 'wb') as f:
+        pickle.dump({"format": keyIndexFormat, "signature": entry.signature, "column": index.column, "type": index.colType,
+                     "positions": index.positions, "unique": index.unique}, f)
+    index.saved = True
+
+def tableKeyIndex(entry, column, colType):
+    index = entry.keyIndex
+    if index is None or index.column != column or index.colType != colType:
+        signature = None if entry.dirty or entry.pendingRows else entry.signature
+        index = loadKeyIndex(*entry.key, column, colType, signature)
+        if index is None:
+            index = KeyIndex(column, colType)
+            index.add(0, entry.rows)
+        entry.keyIndex = index
+    return index
+
+class ValueSetIndex:
+    def __init__(self, column):
+        self.column = column
+        self.counts = Counter()
+
+    def add(self, rows):
+        column = self.column
+        self.counts.update(row[column] for row in rows)
+
+    def remove(self, rows):
+        counts = self.counts
+        column = self.column
+
+        for row in rows:
+            value = row[column]
+            counts[value] -= 1
+            if counts[value] <= 0:
+                del counts[value]
+
+    def __contains__(self, value):
+        return value in self.counts
+
+def tableValueSet(entry, column):
+    valueSet = entry.valueSets.get(column)
+    if valueSet is None:
+        valueSet = ValueSetIndex(column)
+        valueSet.add(entry.rows)
+        entry.valueSets[column] = valueSet
+    return valueSet
+
+orderedIndexMagic = b"VIDX1\n"
+orderedIndexEvery = 512
+orderedIndexTailRows = 4096
+orderedIndexTypes = ("I", "F")
+
+class OrderedIndex:
+    def __init__(self, column, colType, keys=None, positions=None, blanks=None, others=None, fences=None, every=None):
+        self.column = column
+        self.colType = colType
+        self.every = every or orderedIndexEvery
+        self.keys = array('d') if keys is None else keys
+        self.positions = array('q') if positions is None else positions
+        self.blanks = array('q') if blanks is None else blanks
+        self.others = array('q') if others is None else others
+        self.fences = self.keys[::self.every] if fences is None else fences
+        self.tail = None
+
+    @property
+    def rowCount(self):
+        count = len(self.keys) + len(self.blanks) + len(self.others)
+        return count + self.tail.rowCount if self.tail is not None else count
+
+    def runs(self):
+        return [self] if self.tail is None else [self] + self.tail.runs()
+
+    def copy(self):
+        return OrderedIndex(self.column, self.colType, array('d', self.keys.tobytes()), array('q', self.positions.tobytes()),
+                            array('q', self.blanks.tobytes()), array('q', self.others.tobytes()), every=self.every)
+
+    def compacted(self):
+        if self.tail is None:
+            return self
+        index = self.copy()
+        index.merge(self.tail.compacted())
+        return index
+
+    def build(self, cells, start=0):
+        keys = []
+        positions = []
+        blanks = array('q')
+        others = array('q')
+
+        for i, cell in enumerate(cells, start):
+            try:
+                key = float(cell)
+            except ValueError:
+                key = None
+            if cell == "":
+                blanks.append(i)
+            elif key is None or key != key:
+                others.append(i)
+            else:
+                keys.append(key)
+                positions.append(i)
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = array('d', map(keys.__getitem__, order))
+        self.positions = array('q', map(positions.__getitem__, order))
+        self.blanks = blanks
+        self.others = others
+        self.fences = self.keys[::self.every]
+
+    def extend(self, cells, start):
+        added = OrderedIndex(self.column, self.colType, every=self.every)
+        added.build(cells, start)
+        self.merge(added)
+
+    def merge(self, added):
+        keys, positions = array('d'), array('q')
+        previous = 0
+
+        for key, position in zip(added.keys, added.positions):
+            at = bisect_right(self.keys, key, previous)
+            keys.extend(self.keys[previous:at])
+            positions.extend(self.positions[previous:at])
+            keys.append(key)
+            positions.append(position)
+            previous = at
+
+        keys.extend(self.keys[previous:])
+        positions.extend(self.positions[previous:])
+
+        self.keys, self.positions = keys, positions
+        self.blanks.extend(added.blanks)
+        self.others.extend(added.others)
+        self.fences = keys[::self.every]
+
+    def bound(self, key, right=False):
+        search = bisect_right if right else bisect_left
+        start = max(0, search(self.fences, key) - 1) * self.every
+        return search(self.keys, key, start, min(start + self.every, len(self.keys)))
+
+    def span(self, op, val):
+        try:
+            literal = float(numberValue(self.colType, val))
+        except (ValueError, OverflowError):
+            return None
+        if literal != literal:
+            return None
+
+        if op == "=":
+            return self.bound(literal), self.bound(literal, True)
+        if op == "<":
+            return 0, self.bound(literal, True)
+        if op == "<=":
+            return 0, self.bound(literal, True)
+        if op == ">":
+            return self.bound(literal), len(self.keys)
+        if op == ">=":
+            return self.bound(literal), len(self.keys)
+        return None
+
+class OrderedIndexFile(MappedFile):
+    magic = orderedIndexMagic
+    description = "table index"
+
+    def __init__(self, filePath):
+        super().__init__(filePath)
+
+        self.signature = tuple(self.meta["signature"])
+        self.baseSignature = tuple(self.meta["base"]) if "base" in self.meta else None
+        self.tailFile = None
+        self.indexes = {}
+
+        for segment in self.meta["indexes"]:
+            self.indexes[segment["column"]] = OrderedIndex(
+                segment["column"], segment["type"],
+                self.view(segment["keys"], "d"), self.view(segment["positions"], "q"), self.view(segment["blanks"], "q"),
+                self.view(segment["others"], "q"), self.view(segment["fences"], "d"), segment["every"])
+
+    def attach(self, tailFile):
+        if tailFile.baseSignature != self.signature or set(tailFile.indexes) != set(self.indexes):
+            return False
+
+        self.tailFile = tailFile
+        for name, index in self.indexes.items():
+            index.tail = tailFile.indexes[name]
+        return True
+
+    def close(self):
+        super().close()
+        if self.tailFile is not None:
+            self.tailFile.close()
+            self.tailFile = None
+
+def loadOrderedIndexes(filePath, signature):
+    if signature is None:
+        return None
+
+    try:
+        indexFile = OrderedIndexFile(filePath)
+    except Exception:
+        return None
+
+    if indexFile.signature == signature:
+        return indexFile
+
+    try:
+        tailFile = OrderedIndexFile(indexTailPath(filePath))
+    except Exception:
+        indexFile.close()
+        return None
+
+    if tailFile.signature != signature or not indexFile.attach(tailFile):
+        tailFile.close()
+        indexFile.close()
+        return None
+    return indexFile
+
+def writeOrderedIndexes(filePath, indexes, signature, base=None):
+    writer = SegmentWriter()
+    segments = []
+
+    for index in indexes:
+        segments.append({"column": index.column, "type": index.colType, "every": index.every,
+                         "keys": writer.place(index.keys.tobytes()), "positions": writer.place(index.positions.tobytes()),
+                         "blanks": writer.place(index.blanks.tobytes()), "others": writer.place(index.others.tobytes()), "fences": writer.place(index.fences.tobytes())})
+
+    with open(filePath, 'wb') as f:
+        meta = {"signature": list(signature), "indexes": segments}
+        if base is not None:
+            meta["base"] = list(base)
+        f.write(writer.pack(orderedIndexMagic, meta))
+
+def columnCells(filePath, column):
+    if filePath.endswith(".vcol"):
+        with ColumnarFile(filePath) as table:
+            return table.strings(column)
+
+    with open(filePath, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+        return [row[column] if column < len(row) else "" for row in reader]
+
+def tableColumns(filePath, count):
+    if filePath.endswith(".vcol"):
+        with ColumnarFile(filePath) as table:
+            return [table.strings(column) for column in range(count)]
+
+    columns = [[] for _ in range(count)]
+
+    with open(filePath, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+
+        for batch in iter(lambda: list(islice(reader, 4096)), []):
+            for row in batch:
+                if len(row) < count:
+                    row += [""] * (count - len(row))
+            for cells, values in zip(columns, zip(*batch)):
+                cells.extend(values)
+
+    return columns
+
+statsBuckets = 32
+statsSample = 100000
+
+def numericValues(cells):
+    try:
+        return list(map(float, cells))
+    except ValueError:
+        pass
+
+    values = []
+    for cell in cells:
+        try:
+            values.append(float(cell))
+        except ValueError:
+            pass
+    return values
+
+class ColumnStats:
+    def __init__(self, colType):
+        self.colType = colType
+        self.count = 0
+        self.blanks = 0
+        self.distinct = 0
+        self.minimum = None
+        self.maximum = None
+        self.edges = []
+        self.counts = []
+
+    def build(self, cells):
+        values = [cell for cell in cells if cell != ""]
+        self.count = len(cells)
+        self.blanks = self.count - len(values)
+        self.distinct = len(set(values))
+
+        if self.colType not in orderedIndexTypes:
+            return self
+
+        numbers = [value for value in numericValues(values) if value == value]
+        if not numbers:
+            return self
+
+        sample = sorted(numbers[::max(1, len(numbers) // statsSample)])
+        buckets = min(statsBuckets, len(sample))
+
+        self.minimum, self.maximum = min(numbers), max(numbers)
+        self.edges = [self.minimum] + [sample[len(sample) * i // buckets] for i in range(1, buckets)] + [self.maximum]
+        self.counts = [len(numbers) / buckets] * buckets
+        return self
+
+    def bucket(self, value):
+        return min(max(bisect_right(self.edges, value) - 1, 0), len(self.counts) - 1)
+
+    def add(self, cells):
+        values = [cell for cell in cells if cell != ""]
+        filled = self.count - self.blanks
+        fresh = len(set(values))
+
+        self.count += len(cells)
+        self.blanks += len(cells) - len(values)
+        self.distinct = min(self.count - self.blanks, self.distinct + (fresh if self.distinct >= filled else fresh * self.distinct // max(1, filled)))
+
+        if not self.counts:
+            return
+
+        for value in numericValues(values):
+            if value != value:
+                continue
+            if value < self.minimum:
+                self.minimum = self.edges[0] = value
+            if value > self.maximum:
+                self.maximum = self.edges[-1] = value
+            self.counts[self.bucket(value)] += 1
+
+    def remove(self, cells):
+        values = [cell for cell in cells if cell != ""]
+        filled = self.count - self.blanks
+
+        if self.distinct >= filled:
+            self.distinct -= len(set(values))
+
+        self.count -= len(cells)
+        self.blanks -= len(cells) - len(values)
+        self.distinct = max(0, min(self.distinct, self.count - self.blanks))
+
+        if not self.counts:
+            return
+
+        for value in numericValues(values):
+            if value == value:
+                bucket = self.bucket(value)
+                self.counts[bucket] = max(0, self.counts[bucket] - 1)
+
+    def below(self, literal, inclusive):
+        if literal < self.minimum or (literal == self.minimum and not inclusive):
+            return 0.0
+        if literal >= self.maximum:
+            return sum(self.counts)
+
+        bucket = self.bucket(literal)
+        low, high = self.edges[bucket], self.edges[bucket + 1]
+        part = (literal - low) / (high - low) if high > low else 1.0
+        return sum(self.counts[:bucket]) + self.counts[bucket] * part
+
+    def selectivity(self, op, val):
+        if self.count == 0:
+            return 0.0
+
+        filled = self.count - self.blanks
+        blanks = self.blanks / self.count if compileValueCheck(self.colType, op, val)("") else 0.0
+        equal = 1 / max(1, self.distinct) * filled / self.count
+
+        literal = None
+        if self.counts and op != "LIKE":
+            try:
+                literal = float(val)
+            except ValueError:
+                pass
+
+        if op == "LIKE":
+            return 0.25 * filled / self.count + blanks
+        if op == "=":
+            if literal is not None and not self.minimum <= literal <= self.maximum:
+                return blanks
+            return equal + blanks
+        if op == "!=":
+            return filled / self.count - equal + blanks
+        if literal is None:
+            return filled / self.count / 3 + blanks
+
+        total = sum(self.counts) or 1
+        if op in ("<", "<="):
+            fraction = self.below(literal, op == "<=") / total
+        else:
+            fraction = 1 - self.below(literal, op == ">=") / total
+            if op == ">=" and literal <= self.minimum:
+                fraction = 1.0
+        return max(0.0, min(1.0, fraction)) * filled / self.count + blanks
+
+class TableStats:
+    def __init__(self, header, types):
+        self.header = list(header)
+        self.types = list(types)
+        self.rowCount = 0
+        self.columns = []
+        self.saved = False
+
+    def build(self, columns):
+        self.columns = []
+        for index, cells in enumerate(columns):
+            colType = self.types[index] if index < len(self.types) else "S"
+            self.columns.append(ColumnStats(colType).build(cells))
+            self.rowCount = len(cells)
+        self.saved = False
+        return self
+
+    def add(self, rows):
+        self.rowCount += len(rows)
+        for index, column in enumerate(self.columns):
+            column.add([row[index] for row in rows])
+        self.saved = False
+
+    def remove(self, rows):
+        self.rowCount -= len(rows)
+        for index, column in enumerate(self.columns):
+            column.remove([row[index] for row in rows])
+        self.saved = False
+
+    def selectivity(self, cond):
+        col, index, op, val = cond
+        if index >= len(self.columns):
+            return 1.0
+        return self.columns[index].selectivity(op, val)
+
+def loadTableStats(filePath, signature, header, types):
+    if signature is None:
+        return None
+
+    try:
+        with open(statsPath(filePath), 'rb') as f:
+            stored = pickle.load(f)
+    except Exception:
+        return None
+
+    try:
+        stats = stored["stats"]
+        if stored["signature"] != signature or stats.header != list(header) or stats.types != list(types):
+            return None
+    except (AttributeError, KeyError, TypeError):
+        return None
+
+    stats.saved = True
+    return stats
+
+def saveTableStats(filePath, stats, signature):
+    stats.saved = True
+    with open(statsPath(filePath), 'wb') as f:
+        pickle.dump({"signature": signature, "stats": stats}, f)
+
+def saveEntryStats(entry):
+    stats = entry.stats
+    if stats is None or stats.saved or entry.key[0] is None or entry.dirty or entry.pendingRows:
+        return
+
+    saveTableStats(entry.path, stats, entry.signature)
+
+def tableStats(entry, types):
+    stats = entry.stats
+    if stats is None or stats.header != entry.header or stats.types != list(types):
+        clean = not entry.dirty and not entry.pendingRows
+        stats = loadTableStats(entry.path, entry.signature, entry.header, types) if clean else None
+        if stats is None:
+            stats = TableStats(entry.header, types)
+            stats.build([row[index] for row in entry.rows] for index in range(len(entry.header)))
+            if clean:
+                saveTableStats(entry.path, stats, entry.signature)
+        entry.stats = stats
+    return stats
+
+def fileStats(filePath, types):
+    if filePath.endswith(".vcol"):
+        with ColumnarFile(filePath) as table:
+            header = list(table.header)
+    else:
+        with open(filePath, 'r', newline='') as csvfile:
+            header = next(csv.reader(csvfile), [])
+
+    signature = TableCache.signature(filePath)
+    stats = loadTableStats(filePath, signature, header, types)
+    if stats is None:
+        stats = TableStats(header, types)
+        stats.build(tableColumns(filePath, len(header)))
+        saveTableStats(filePath, stats, signature)
+    return stats
+
+class QueryPlan:
+    def __init__(self, access, table, predicate, rowCount, estimate):
+        self.access = access
+        self.table = table
+        self.predicate = predicate
+        self.rowCount = rowCount
+        self.estimate = estimate
+        self.columns = []
+        self.lookups = None
+        self.conditions = []
+
+    def usesIndex(self):
+        return self.access in ("INDEX RANGE", "OR UNION")
+
+    def describe(self):
+        if self.access == "PK LOOKUP":
+            source = f"PK LOOKUP ON {self.columns[0]}"
+        elif self.access == "INDEX RANGE":
+            source = f"INDEX RANGE ON {self.columns[0]}"
+        elif self.access == "OR UNION":
+            source = f"OR UNION OF INDEX RANGES ON {', '.join(self.columns)}"
+        else:
+            source = f"SEQ SCAN {self.table.name}"
+
+        text = f"{source}: EST {round(self.estimate)} OF {self.rowCount} ROWS"
+
+        if self.conditions:
+            groups = [" AND ".join(f"{col} {op} {val} ({round(rows)})" for col, op, val, rows in group) for group in self.conditions]
+            text += " | FILTER " + " OR ".join(f"({group})" if len(self.conditions) > 1 and " AND " in group else group for group in groups)
+
+        return text
+
+aggregatePattern = re.compile(r"(COUNT|SUM|AVG|MIN|MAX)\s*\(\s*(\*|[^()]*?)\s*\)$")
+
+def cellValue(colType):
+    if colType == "B":
+        return lambda cell: booleanValues.get(cell.lower()) if cell != "" else None
+    if colType not in orderedIndexTypes:
+        return lambda cell: cell if cell != "" else None
+
+    parse = int if colType == "I" else float
+
+    def convert(cell):
+        try:
+            return parse(cell)
+        except ValueError:
+            try:
+                return float(cell)
+            except ValueError:
+                return None
+    return convert
+
+def renderTyped(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return renderValue("F", value)
+    return str(value)
+
+def groupOrder(key):
+    return tuple((0, value) if isinstance(value, (int, float)) else (1, str(value)) for value in key)
+
+def sortKey(colType, index):
+    convert = cellValue(colType)
+
+    def key(row):
+        cell = row[index]
+        if cell == "":
+            return (0, "")
+        value = convert(cell)
+        return (1, value) if value is not None else (2, cell)
+    return key
+
+limitPattern = re.compile(r"\s+LIMIT\s+(\d+)(?:\s+OFFSET\s+(\d+))?\s*$")
+orderPattern = re.compile(r"\s+ORDER BY\s+(\S+)(?:\s+(ASC|DESC))?\s*$")
+
+def selectModifiers(rest):
+    order, limit, offset = None, None, 0
+
+    match = limitPattern.search(rest)
+    if match is not None:
+        rest = rest[:match.start()]
+        limit, offset = int(match.group(1)), int(match.group(2) or 0)
+    elif " LIMIT " in rest or " OFFSET " in rest:
+        raise ValueError("Invalid syntax. Use LIMIT <count> [OFFSET <count>]")
+
+    match = orderPattern.search(rest)
+    if match is not None:
+        rest = rest[:match.start()]
+        order = (match.group(1), match.group(2) == "DESC")
+    elif " ORDER BY " in rest:
+        raise ValueError("Invalid syntax. Use ORDER BY <column> [ASC|DESC]")
+
+    return rest, order, limit, offset
+
+def spillRun(items, spillDir, suffix):
+    handle, path = tempfile.mkstemp(prefix=".spill-", suffix=suffix, dir=spillDir)
+    with os.fdopen(handle, 'wb') as f:
+        for item in items:
+            pickle.dump(item, f)
+    return path
+
+def readRun(path):
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+def isAggregate(selectPart):
+    return any(aggregatePattern.match(item.strip()) for item in selectPart.split(","))
+
+def joinAliases(header):
+    names = Counter(col.split(".", 1)[1] for col in header)
+    return {col.split(".", 1)[1]: index for index, col in enumerate(header) if names[col.split(".", 1)[1]] == 1}
+
+def addPartial(partials, value):
+    i = 0
+    for other in partials:
+        if abs(value) < abs(other):
+            value, other = other, value
+        high = value + other
+        low = other - (high - value)
+        if low:
+            partials[i] = low
+            i += 1
+        value = high
+    partials[i:] = [value]
+
+class Aggregate:
+    def __init__(self, kind, index, colType):
+        self.kind = kind
+        self.index = index
+        self.convert = cellValue(colType) if index is not None else None
+
+    def start(self):
+        if self.kind == "COUNT":
+            return [0]
+        if self.kind in ("SUM", "AVG"):
+            return [0, 0, [], 0]
+        return [None]
+
+    def step(self, state, row):
+        if self.convert is None:
+            state[0] += 1
+            return
+
+        value = self.convert(row[self.index])
+        if value is None:
+            return
+
+        kind = self.kind
+        if kind == "COUNT":
+            state[0] += 1
+        elif kind in ("SUM", "AVG"):
+            if isinstance(value, int):
+                state[0] += value
+            elif math.isfinite(value):
+                addPartial(state[2], value)
+            else:
+                state[3] += value
+            state[1] += 1
+        elif state[0] is None or (value < state[0] if kind == "MIN" else value > state[0]):
+            state[0] = value
+
+    def merge(self, state, other):
+        kind = self.kind
+        if kind == "COUNT":
+            state[0] += other[0]
+        elif kind in ("SUM", "AVG"):
+            state[0] += other[0]
+            state[1] += other[1]
+            for value in other[2]:
+                addPartial(state[2], value)
+            state[3] += other[3]
+        elif other[0] is not None and (state[0] is None or (other[0] < state[0] if kind == "MIN" else other[0] > state[0])):
+            state[0] = other[0]
+
+    def result(self, state):
+        if self.kind == "COUNT":
+            return str(state[0])
+        if self.kind == "SUM":
+            return renderTyped(self.total(state)) if state[1] else ""
+        if self.kind == "AVG":
+            return renderTyped(self.total(state) / state[1]) if state[1] else ""
+        return renderTyped(state[0])
+
+    @staticmethod
+    def total(state):
+        if not state[2] and not state[3]:
+            return state[0]
+        return math.fsum(state[2] + [state[0]]) + state[3]
+
+class HashAggregate:
+    def __init__(self, groupIndexes, groupTypes, aggregates, outputs, maxGroups, spillDir):
+        self.groupIndexes = groupIndexes
+        self.converters = [cellValue(colType) for colType in groupTypes]
+        self.aggregates = aggregates
+        self.outputs = outputs
+        self.maxGroups = maxGroups
+        self.spillDir = spillDir
+
+    def key(self, row):
+        key = []
+        for index, convert in zip(self.groupIndexes, self.converters):
+            cell = row[index]
+            value = convert(cell)
+            key.append(cell if value is None else value)
+        return tuple(key)
+
+    def spill(self, groups):
+        return spillRun(((key, groups[key]) for key in sorted(groups, key=groupOrder)), self.spillDir, ".agg")
+
+    def render(self, key, states):
+        return [renderTyped(key[source]) if kind == "group" else self.aggregates[source].result(states[source]) for kind, source in self.outputs]
+
+    def run(self, rows):
+        aggregates = self.aggregates
+        groups = {}
+        runs = []
+
+        try:
+            for row in rows:
+                key = self.key(row)
+                states = groups.get(key)
+                if states is None:
+                    if len(groups) >= self.maxGroups:
+                        runs.append(self.spill(groups))
+                        groups = {}
+                    states = groups[key] = [aggregate.start() for aggregate in aggregates]
+                for aggregate, state in zip(aggregates, states):
+                    aggregate.step(state, row)
+
+            if not runs:
+                if not groups and not self.groupIndexes:
+                    groups[()] = [aggregate.start() for aggregate in aggregates]
+                for key in sorted(groups, key=groupOrder):
+                    yield self.render(key, groups[key])
+                return
+
+            runs.append(self.spill(groups))
+            groups = {}
+
+            current, merged = None, None
+            for key, states in heapq.merge(*map(readRun, runs), key=lambda item: groupOrder(item[0])):
+                if key == current:
+                    for aggregate, state, other in zip(aggregates, merged, states):
+                        aggregate.merge(state, other)
+                    continue
+                if merged is not None:
+                    yield self.render(current, merged)
+                current, merged = key, states
+
+            if merged is not None:
+                yield self.render(current, merged)
+
+        finally:
+            for path in runs:
+                if os.path.exists(path):
+                    os.remove(path)
+
+class ExternalSort:
+    def __init__(self, key, descending, maxRows, spillDir):
+        self.key = key
+        self.descending = descending
+        self.maxRows = maxRows
+        self.spillDir = spillDir
+
+    def run(self, rows, limit=None):
+        if limit is not None and limit <= self.maxRows:
+            pick = heapq.nlargest if self.descending else heapq.nsmallest
+            yield from pick(limit, rows, key=self.key)
+            return
+
+        buffer = []
+        runs = []
+
+        try:
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= self.maxRows:
+                    buffer.sort(key=self.key, reverse=self.descending)
+                    runs.append(spillRun(buffer, self.spillDir, ".sort"))
+                    buffer = []
+
+            buffer.sort(key=self.key, reverse=self.descending)
+            if not runs:
+                yield from buffer
+                return
+
+            runs.append(spillRun(buffer, self.spillDir, ".sort"))
+            buffer = []
+
+            yield from heapq.merge(*map(readRun, runs), key=self.key, reverse=self.descending)
+
+        finally:
+            for path in runs:
+                if os.path.exists(path):
+                    os.remove(path)
+
+class JournalEntry:
+    def __init__(self, meta, shared=False):
+        self.meta = meta
+        self.metaBytes = 0 if shared else len(meta)
+        self.ops = []
+        self.size = self.metaBytes
+
+    def resize(self):
+        self.size = self.metaBytes + sum(op["size"] for op in self.ops)
+
+def opSize(op):
+    stored = op.get("stored")
+    if isinstance(stored, bytes):
+        return 64 + len(stored)
+    if isinstance(stored, list):
+        return 64 + sum(64 + 56 * len(row) if isinstance(row, list) else 56 for row in stored)
+    return 64
+
+def journalRowRuns(edits):
+    runs = []
+    for index, row in edits:
+        if runs and runs[-1][0] + len(runs[-1][1]) == index:
+            runs[-1][1].append(row)
+        else:
+            runs.append((index, [row]))
+    return runs
+
+class MetadataUnpickler(pickle.Unpickler):
+    def __init__(self, file, classes):
+        super().__init__(file)
+        self.classes = classes
+
+    def find_class(self, module, name):
+        if name in self.classes:
+            return self.classes[name]
+        return super().find_class(module, name)
+
+class Engine:
+    databaseClass = Database
+    tableClass = Table
+
+    def __init__(self):
+        if not os.path.exists('DATABASES'):
+            os.makedirs('DATABASES')
+
+        self.databases = []
+        self.state = 0
+        self.openedDatabase = None
+        self.openedTable = None
+        self.showingResult = os.path.exists(resultPath)
+
+        self.undoStack = []
+        self.redoStack = []
+        self.undoMaxDepth = 100
+        self.undoMaxBytes = 64 * 1024 * 1024
+
+        self.cache = TableCache()
+        self.cache.tableTypes = self.tableTypes
+        self.cache.tableIndexes = self.tableIndexes
+
+        self.scanWorkers = os.cpu_count() or 1
+        self.parallelScanRows = 100000
+        self.scanChunkBytes = 16 * 1024 * 1024
+        self.scanPool = None
+        self.indexRowCost = 4
+        self.aggregateGroups = 200000
+        self.sortRows = 200000
+
+        self.resultFile = True
+        self.resultCursor = None
+
+    def newDatabase(self, name, x, y):
+        return self.databaseClass(name, x, y)
+
+    def newTable(self, name, columns, x, y):
+        return self.tableClass(name, columns, x, y)
+
+    def placement(self):
+        return 0, 0
+
+    def load(self, path="save.txt"):
+        self.databases = []
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    self.databases = MetadataUnpickler(f, {"Database": self.databaseClass, "Table": self.tableClass}).load()
+            except Exception:
+                pass
+        else:
+            self.discover()
+
+    def discover(self):
+        dbNames = sorted([d for d in os.listdir('DATABASES') if os.path.isdir(os.path.join('DATABASES', d))])
+
+        for i, name in enumerate(dbNames):
+            self.databases.append(self.newDatabase(name.upper(), -200 - i*150, -200 - i*100))
+
+        for db in self.databases:
+            for i in os.listdir(os.path.join('DATABASES', db.name)):
+                if i.endswith('.csv'):
+                    tableName = i[:-4]
+                    columns = []
+                    with open(os.path.join('DATABASES', db.name, i), 'r', newline='') as csvfile:
+                        reader = csv.reader(csvfile)
+                        try:
+                            columns = next(reader)
+                        except StopIteration:
+                            columns = []
+                    db.tables.append(self.newTable(tableName, columns, db.x + 50, db.y + 100 + len(db.tables) * 100))
+                elif i.endswith('.vcol'):
+                    with ColumnarFile(os.path.join('DATABASES', db.name, i)) as columnarTable:
+                        table = self.newTable(i[:-5], columnarTable.header, db.x + 50, db.y + 100 + len(db.tables) * 100)
+                        table.types = [segment["kind"] for segment in columnarTable.segments]
+                    db.tables.append(table)
+
+    def save(self, path="save.txt"):
+        with open(path, "wb") as f:
+            pickle.dump(self.databases, f)
+
+    def close(self):
+        self.cache.close()
+        self.clearResult()
+
+        if self.scanPool is not None:
+            self.scanPool.shutdown()
+            self.scanPool = None
+
+    def parallelScans(self):
+        return self.scanWorkers > 1 and (self.scanPool is not None or scanContext() is not None)
+
+    def startScanPool(self):
+        if self.scanPool is None and self.parallelScans():
+            self.scanPool = ProcessPoolExecutor(max_workers=self.scanWorkers, mp_context=scanContext())
+            self.scanPool.submit(int)
+        return self.scanPool
+
+    def prepareScanPool(self, filePath):
+        if self.scanPool is not None or self.scanWorkers <= 1 or not filePath.endswith(".csv"):
+            return None
+
+        try:
+            if estimateRowCount(filePath) < self.parallelScanRows:
+                return None
+        except OSError:
+            return None
+
+        return self.startScanPool()
+
+    def scanIndex(self, dbName, tableName):
+        entry = self.cache.peek(dbName, tableName)
+        if entry is not None and (entry.dirty or entry.pendingRows or not self.parallelScans()):
+            return None
+
+        filePath = tablePath(dbName, tableName)
+        if not os.path.exists(filePath):
+            return None
+
+        rowIndex = tableRowIndex(filePath)
+        return rowIndex if rowIndex.rowCount >= self.parallelScanRows else None
+
+    def parallelScan(self, filePath, rowIndex, header, types, groups, selectedIndexes):
+        self.startScanPool()
+
+        chunks = rowIndex.chunks(max(self.scanWorkers, rowIndex.end // self.scanChunkBytes))
+        pending = []
+
+        try:
+            while chunks or pending:
+                while chunks and len(pending) < self.scanWorkers * 2:
+                    _, start, end = chunks.pop(0)
+                    pending.append(self.scanPool.submit(scanChunk, filePath, start, end, header, types, groups, selectedIndexes))
+                yield from pending.pop(0).result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def selectSource(self, dbName, table, selectedColumns, wherePart, parallel=True):
+        columnarFile = columnarPath(dbName, table.name)
+        columnar = self.cache.peek(dbName, table.name) is None and os.path.exists(columnarFile)
+        rowIndex = None if columnar else self.scanIndex(dbName, table.name)
+
+        if columnar:
+            with ColumnarFile(columnarFile) as columns:
+                header = columns.header
+        elif rowIndex is not None:
+            header = rowIndex.header
+        else:
+            header = self.cache.get(dbName, table.name).header
+
+        if selectedColumns is None:
+            selectedIndexes = list(range(len(header)))
+            selectedHeader = list(header)
+        else:
+            selectedIndexes = [header.index(col) for col in selectedColumns]
+            selectedHeader = selectedColumns
+
+        predicate = WherePredicate(wherePart, header, table.types) if wherePart is not None else None
+        if predicate is not None and not predicate.groups:
+            return selectedHeader, lambda: iter(())
+
+        plan = self.planQuery(dbName, table, predicate)
+
+        def storedKeyPositions(filePath):
+            pkIndex = table.primaryKeyIndex
+            index = loadKeyIndex(dbName, table.name, pkIndex, table.types[pkIndex], self.cache.signature(filePath))
+            return index.find(plan.lookups) if index is not None and index.unique else None
+
+        def columnarRows():
+            positions = None
+            if plan.access == "PK LOOKUP":
+                positions = storedKeyPositions(columnarFile)
+            elif plan.usesIndex():
+                positions = self.indexCandidates(dbName, table, predicate)
+            with ColumnarFile(columnarFile) as columns:
+                yield from columns.stream(predicate, selectedIndexes, positions)
+
+        def fileRows():
+            filePath = tablePath(dbName, table.name)
+            positions = None
+            if plan.access == "PK LOOKUP":
+                positions = storedKeyPositions(filePath)
+                if positions is None:
+                    return cachedRows()
+            elif plan.usesIndex():
+                positions = self.indexCandidates(dbName, table, predicate)
+            if positions is not None:
+                rows = rowIndex.rows(filePath, positions)
+                return ([row[i] for i in selectedIndexes] for row in rows if predicate.match(row))
+            if parallel and self.parallelScans():
+                return self.parallelScan(filePath, rowIndex, header, table.types, predicate.groups if predicate else None, selectedIndexes)
+            return streamSelect(filePath, header, predicate, selectedIndexes)
+
+        def cachedRows():
+            entry = self.cache.get(dbName, table.name)
+            positions = self.planPositions(plan, dbName, table, entry)
+            candidates = entry.rows if positions is None else [entry.rows[p] for p in positions]
+            match = predicate.match if predicate is not None else None
+            return ([row[i] for i in selectedIndexes] for row in candidates if match is None or match(row))
+
+        if columnar:
+            return selectedHeader, columnarRows
+        if rowIndex is not None:
+            return selectedHeader, fileRows
+        return selectedHeader, cachedRows
+
+    def joinSource(self, dbName, selectPart, leftName, rightName, onPart, wherePart, parallel=True):
+        db = next(db for db in self.databases if db.name == dbName)
+        tables = {table.name: table for table in db.tables}
+
+        for name in (leftName, rightName):
+            if name not in tables:
+                raise ValueError(f"Table '{name}' not found")
+
+        left, right = tables[leftName], tables[rightName]
+        header = [f"{left.name}.{col}" for col in left.columns] + [f"{right.name}.{col}" for col in right.columns]
+        types = list(left.types) + list(right.types)
+
+        aliases = joinAliases(header)
+
+        def resolve(col):
+            if col in header:
+                return header.index(col)
+            if col in aliases:
+                return aliases[col]
+            raise ValueError(f"Unknown column '{col}'")
+
+        if onPart is not None:
+            leftKey, rightKey = sorted(resolve(col) for col in onPart)
+            if leftKey >= len(left.columns) or rightKey < len(left.columns):
+                raise ValueError("ON must compare a column of each table")
+            rightKey -= len(left.columns)
+        else:
+            joins = [(fk["column"], fk["ref_column"]) for fk in left.foreignKeys if getattr(fk["ref_table"], "name", fk["ref_table"]) == right.name]
+            joins += [(fk["ref_column"], fk["column"]) for fk in right.foreignKeys if getattr(fk["ref_table"], "name", fk["ref_table"]) == left.name]
+            if not joins:
+                raise ValueError(f"No foreign key between {left.name} and {right.name}")
+            leftKey, rightKey = joins[0]
+
+        if selectPart.strip() == "*":
+            selectedIndexes = list(range(len(header)))
+            selectedHeader = list(header)
+        else:
+            selectedHeader = [col.strip().upper() for col in selectPart.split(",")]
+            selectedIndexes = [resolve(col) for col in selectedHeader]
+
+        predicate = WherePredicate(wherePart, header, types, aliases) if wherePart is not None else None
+        sideWhere = {left.name: None, right.name: None}
+
+        if predicate is not None and len(predicate.groups) == 1 and predicate.groups[0]:
+            for table, conds in ((left, [c for c in predicate.groups[0] if c[1] < len(left.columns)]),
+                                 (right, [c for c in predicate.groups[0] if c[1] >= len(left.columns)])):
+                if conds:
+                    sideWhere[table.name] = " AND ".join(conditionText(header[index].split(".", 1)[1], op, val) for col, index, op, val in conds)
+            predicate = None
+
+        sides = []
+        for table, key in ((left, leftKey), (right, rightKey)):
+            where = sideWhere[table.name]
+            plan = self.planQuery(dbName, table, WherePredicate(where, table.columns, table.types) if where is not None else None)
+            sideHeader, rows = self.selectSource(dbName, table, None, where, parallel)
+            sides.append((table, key, plan, rows))
+
+        build, probe = sorted(sides, key=lambda side: side[2].estimate)
+        probeLeft = probe[0] is left
+
+        numeric = left.types[leftKey] in orderedIndexTypes and right.types[rightKey] in orderedIndexTypes
+        keyType = "I" if numeric else "S"
+        match = predicate.match if predicate is not None else None
+
+        def rows():
+            hashed = {}
+            buildKey = build[1]
+            for row in build[3]():
+                cell = row[buildKey]
+                if cell != "":
+                    hashed.setdefault(keyValue(keyType, cell), []).append(row)
+
+            probeKey = probe[1]
+            for row in probe[3]():
+                cell = row[probeKey]
+                matches = hashed.get(keyValue(keyType, cell)) if cell != "" else None
+                if not matches:
+                    continue
+                for other in matches:
+                    joined = row + other if probeLeft else other + row
+                    if match is None or match(joined):
+                        yield [joined[i] for i in selectedIndexes]
+
+        description = (f"HASH JOIN {left.name}.{left.columns[leftKey]} = {right.name}.{right.columns[rightKey]}: "
+                       f"BUILD {build[0].name} ({build[2].describe()}), PROBE {probe[0].name} ({probe[2].describe()})")
+        if predicate is not None:
+            description += f" | FILTER {predicate.text()}"
+
+        return selectedHeader, rows, description
+
+    def aggregateSource(self, header, types, aliases, rows, selectPart, groupPart):
+        def resolve(col):
+            if col in header:
+                return header.index(col)
+            if aliases and col in aliases:
+                return aliases[col]
+            raise ValueError(f"Unknown column '{col}'")
+
+        groupIndexes = [resolve(col.strip()) for col in groupPart.split(",")] if groupPart else []
+        aggregates = []
+        outputs = []
+        selectedHeader = []
+
+        for item in [item.strip() for item in selectPart.split(",")]:
+            match = aggregatePattern.match(item)
+
+            if match is None:
+                index = resolve(item)
+                if index not in groupIndexes:
+                    raise ValueError(f"Column '{item}' must appear in GROUP BY")
+                outputs.append(("group", groupIndexes.index(index)))
+                selectedHeader.append(item)
+                continue
+
+            kind, arg = match.groups()
+            if arg == "*":
+                if kind != "COUNT":
+                    raise ValueError(f"{kind}(*) is not supported")
+                index, colType = None, None
+            else:
+                index = resolve(arg)
+                colType = types[index] if index < len(types) else "S"
+                if kind in ("SUM", "AVG") and colType not in orderedIndexTypes:
+                    raise ValueError(f"{kind} requires an INTEGER or FLOAT column")
+
+            outputs.append(("aggregate", len(aggregates)))
+            aggregates.append(Aggregate(kind, index, colType))
+            selectedHeader.append(f"{kind}({arg})")
+
+        groupTypes = [types[index] if index < len(types) else "S" for index in groupIndexes]
+        aggregate = HashAggregate(groupIndexes, groupTypes, aggregates, outputs, self.aggregateGroups, 'DATABASES')
+
+        return selectedHeader, lambda: aggregate.run(rows())
+
+    def columnType(self, col, tables):
+        match = aggregatePattern.match(col)
+        if match is not None:
+            kind, col = match.groups()
+            if kind in ("COUNT", "AVG"):
+                return "I" if kind == "COUNT" else "F"
+
+        tableName, qualified, name = col.rpartition(".")
+        for table in tables:
+            if (not qualified or table.name == tableName) and name in table.columns:
+                index = table.columns.index(name)
+                return table.types[index] if index < len(table.types) else "S"
+        return "S"
+
+    def selectQuery(self, rest, parallel=True):
+        rest, order, limit, offset = selectModifiers(rest)
+        selectedHeader, rows, tables = self.selectRows(rest, parallel, limit is not None and order is None)
+
+        if order is not None:
+            col, descending = order
+            matches = [index for index, name in enumerate(selectedHeader) if name == col or name.rpartition(".")[2] == col]
+            if len(matches) != 1:
+                raise ValueError(f"ORDER BY column '{col}' must appear once in the selected columns")
+
+            key = sortKey(self.columnType(selectedHeader[matches[0]], tables), matches[0])
+            sorter = ExternalSort(key, descending, self.sortRows, 'DATABASES')
+            unsorted = rows
+            rows = lambda: sorter.run(unsorted(), None if limit is None else offset + limit)
+
+        if limit is not None:
+            unlimited = rows
+            rows = lambda: islice(unlimited(), offset, offset + limit)
+
+        return selectedHeader, rows
+
+    def selectRows(self, rest, parallel=True, limited=False):
+        dbName = self.openedDatabase.name
+        rest, grouped, groupPart = rest.partition(" GROUP BY ")
+
+        if " FROM " in rest:
+            join = joinPattern.match("SELECT " + rest)
+            if join is None:
+                raise ValueError("Invalid syntax. Use SELECT <columns> FROM <table> JOIN <table> [ON <column> = <column>] [WHERE ...]")
+
+            selectPart, leftName, rightName, onLeft, onRight, wherePart = join.groups()
+            onPart = (onLeft, onRight) if onLeft is not None else None
+
+            if not grouped and not isAggregate(selectPart):
+                selectedHeader, rows = self.joinSource(dbName, selectPart, leftName, rightName, onPart, wherePart, parallel and not limited)[:2]
+                return selectedHeader, rows, [self.findTable(dbName, leftName), self.findTable(dbName, rightName)]
+
+            header, rows = self.joinSource(dbName, "*", leftName, rightName, onPart, wherePart, parallel)[:2]
+            tables = [self.findTable(dbName, leftName), self.findTable(dbName, rightName)]
+            types = list(tables[0].types) + list(tables[1].types)
+            return self.aggregateSource(header, types, joinAliases(header), rows, selectPart, groupPart) + (tables,)
+
+        if " WHERE " in rest:
+            selectPart, wherePart = rest.split(" WHERE ", 1)
+        else:
+            selectPart = rest
+            wherePart = None
+
+        if grouped or isAggregate(selectPart):
+            header, rows = self.selectSource(dbName, self.openedTable, None, wherePart, parallel)
+            return self.aggregateSource(header, self.openedTable.types, None, rows, selectPart, groupPart) + ([self.openedTable],)
+
+        if selectPart.strip() == "*":
+            selectedColumns = None
+        else:
+            selectedColumns = [col.strip().upper() for col in selectPart.split(",")]
+
+        return self.selectSource(dbName, self.openedTable, selectedColumns, wherePart, parallel and not limited) + ([self.openedTable],)
+
+    def storeResult(self, header, rows):
+        self.clearResult()
+
+        if self.resultFile:
+            count = streamTable(resultPath, header, rows())
+        else:
+            self.resultCursor = ResultCursor(header, rows(), 'DATABASES')
+            count = self.resultCursor.rowCount
+
+        self.cache.notify((None, "RESULT"))
+        self.showingResult = True
+        return count
+
+    def openDatabase(self, name):
+        db = next((db for db in self.databases if db.name == name.upper()), None)
+        if db is not None:
+            self.state = 1
+            self.openedDatabase = db
+            self.openedTable = None
+        return db
+
+    def openTable(self, name):
+        if self.openedDatabase is None:
+            return None
+
+        table = next((t for t in self.openedDatabase.tables if t.name == name.upper()), None)
+        if table is not None:
+            self.state = 2
+            self.openedTable = table
+        return table
+
+    def resultSource(self):
+        if self.showingResult:
+            return (None, "RESULT")
+        if self.state == 2 and self.openedTable is not None:
+            return (self.openedDatabase.name, self.openedTable.name)
+        return None
+
+    def resultHeader(self):
+        if self.showingResult and self.resultCursor is not None:
+            return list(self.resultCursor.header)
+        source = self.resultSource()
+        return list(self.cache.get(*source).header) if source else []
+
+    def resultRows(self):
+        if self.showingResult and self.resultCursor is not None:
+            return [list(row) for row in self.resultCursor.rows()]
+        source = self.resultSource()
+        return [list(row) for row in self.cache.get(*source).rows] if source else []
+
+    def execute(self, Query):
+        message = self.executeQuery(Query)
+        self.cache.commit()
+        return message
+
+    def findTable(self, dbName, tableName):
+        for db in self.databases:
+            if db.name == dbName:
+                for table in db.tables:
+                    if table.name == tableName:
+                        return table
+        return None
+
+    def tableTypes(self, dbName, tableName):
+        table = self.findTable(dbName, tableName)
+        return table.types if table is not None else []
+
+    def tableIndexes(self, dbName, tableName):
+        table = self.findTable(dbName, tableName)
+        return table.indexes if table is not None else []
+
+    def tableIndexFile(self, dbName, table):
+        columns = {name: table.types[table.columns.index(name)] for name in table.indexes if name in table.columns}
+        columns = {name: colType for name, colType in columns.items() if colType in orderedIndexTypes}
+        if not columns:
+            return None
+
+        entry = self.cache.peek(dbName, table.name)
+        if entry is not None and (entry.dirty or entry.pendingRows):
+            return None
+
+        filePath = locateTable(dbName, table.name)
+        signature = self.cache.signature(filePath)
+        indexPath = orderedIndexPath(dbName, table.name)
+
+        indexFile = loadOrderedIndexes(indexPath, signature)
+        if indexFile is not None:
+            if all(name in indexFile.indexes and indexFile.indexes[name].colType == colType for name, colType in columns.items()):
+                return indexFile
+            indexFile.close()
+
+        if signature is None:
+            return None
+
+        indexes = []
+        for name, colType in columns.items():
+            column = table.columns.index(name)
+            index = OrderedIndex(name, colType)
+            index.build([row[column] for row in entry.rows] if entry is not None else columnCells(filePath, column))
+            indexes.append(index)
+
+        writeOrderedIndexes(indexPath, indexes, signature)
+        return loadOrderedIndexes(indexPath, signature)
+
+    def tableStatistics(self, dbName, table):
+        entry = self.cache.peek(dbName, table.name)
+        if entry is not None:
+            return tableStats(entry, table.types)
+        return fileStats(locateTable(dbName, table.name), table.types)
+
+    def tableRowCount(self, dbName, table):
+        entry = self.cache.peek(dbName, table.name)
+        if entry is not None:
+            return len(entry.rows)
+
+        filePath = locateTable(dbName, table.name)
+        if filePath.endswith(".vcol"):
+            with ColumnarFile(filePath) as columns:
+                return columns.rowCount
+
+        rowIndex = loadRowIndex(filePath, TableCache.signature(filePath))
+        return rowIndex.rowCount if rowIndex is not None else estimateRowCount(filePath)
+
+    def planQuery(self, dbName, table, predicate):
+        if predicate is None:
+            rowCount = self.tableRowCount(dbName, table)
+            return QueryPlan("SEQ SCAN", table, None, rowCount, rowCount)
+
+        stats = self.tableStatistics(dbName, table)
+        rowCount = stats.rowCount
+
+        predicate.order(stats.selectivity)
+
+        chance = 1.0
+        for group in predicate.groups:
+            groupChance = 1.0
+            for cond in group:
+                groupChance *= stats.selectivity(cond)
+            chance *= 1 - groupChance
+        if any(not group for group in predicate.groups):
+            chance = 0.0
+
+        plan = QueryPlan("SEQ SCAN", table, predicate, rowCount, (1 - chance) * rowCount)
+        plan.conditions = [[(col, op, val, stats.selectivity((col, index, op, val)) * rowCount) for col, index, op, val in group] for group in predicate.groups]
+
+        pkIndex = table.primaryKeyIndex
+        lookups = predicate.keyLookups(pkIndex) if pkIndex is not None else None
+        if lookups:
+            plan.access = "PK LOOKUP"
+            plan.columns = [table.columns[pkIndex]]
+            plan.lookups = lookups
+            plan.estimate = min(plan.estimate, len(lookups))
+            return plan
+
+        indexed = {name for name in table.indexes if name in table.columns and table.types[table.columns.index(name)] in orderedIndexTypes}
+        columns = []
+        cost = 0.0
+
+        for group in predicate.groups:
+            candidates = [cond for cond in group if cond[0] in indexed and cond[2] in ("=", "<", "<=", ">", ">=")]
+            if not candidates:
+                return plan
+            best = min(candidates, key=stats.selectivity)
+            columns.append(best[0])
+            cost += stats.selectivity(best) * rowCount * self.indexRowCost
+
+        if columns and cost < rowCount:
+            plan.access = "INDEX RANGE" if len(columns) == 1 else "OR UNION"
+            plan.columns = columns
+
+        return plan
+
+    def planPositions(self, plan, dbName, table, entry):
+        if plan.access == "PK LOOKUP":
+            pkIndex = table.primaryKeyIndex
+            if tableKeyIndex(entry, pkIndex, table.types[pkIndex]).unique:
+                return entry.keyIndex.find(plan.lookups)
+        elif plan.usesIndex():
+            return self.indexCandidates(dbName, table, plan.predicate)
+        return None
+
+    def indexCandidates(self, dbName, table, predicate):
+        if predicate is None or predicate.columns().isdisjoint(table.indexes):
+            return None
+
+        indexFile = self.tableIndexFile(dbName, table)
+        if indexFile is None:
+            return None
+
+        with indexFile:
+            return predicate.indexCandidates(indexFile.indexes)
+
+    def clearResult(self):
+        if os.path.exists(resultPath):
+            os.remove(resultPath)
+
+        self.cache.discard(None, "RESULT")
+        if self.resultCursor is not None:
+            self.resultCursor.discard()
+        self.resultCursor = None
+        self.showingResult = False
+
+    def validateRows(self, table, entry, dbName, rawRows):
+        columns = table.columns
+        pkIndex = table.primaryKeyIndex
+
+        for n, rawValues in enumerate(rawRows):
+            if len(rawValues) != len(columns):
+                where = f" in row {n + 1}" if len(rawRows) > 1 else ""
+                return None, f"ERROR: Expected {len(columns)} values, got {len(rawValues)}{where}"
+
+        finalColumns = []
+
+        for i, colName in enumerate(columns):
+            colType = table.types[i]
+            values = [rawValues[i] for rawValues in rawRows]
+
+            if colType == "B":
+                values = list(map(str.lower, values))
+
+            distinct = set(values)
+            nones = {value for value in distinct if value.upper() == "NONE"}
+            distinct -= nones
+
+            if nones and pkIndex == i:
+                return None, f"ERROR: Primary key '{colName}' cannot be None"
+
+            if colType == "I":
+                if not all(value.lstrip("-").isdigit() for value in distinct):
+                    return None, f"ERROR: Column '{colName}' expects INTEGER"
+
+            elif colType == "F":
+                try:
+                    for value in distinct:
+                        float(value)
+                except ValueError:
+                    return None, f"ERROR: Column '{colName}' expects FLOAT"
+
+            elif colType == "B":
+                if not distinct <= booleanValues.keys():
+                    return None, f"ERROR: Column '{colName}' expects BOOLEAN (true/false)"
+
+            if nones:
+                values = ["" if value in nones else value for value in values]
+
+            finalColumns.append(values)
+
+        if pkIndex is not None:
+            pkType = table.types[pkIndex]
+            index = tableKeyIndex(entry, pkIndex, pkType)
+            values = finalColumns[pkIndex]
+            keys = list(map(float, values)) if pkType == "F" else [keyValue(pkType, value) for value in values]
+
+            if len(set(keys)) != len(keys) or not index.positions.keys().isdisjoint(keys):
+                seen = set()
+                for value, key in zip(values, keys):
+                    if key in index.positions or key in seen:
+                        return None, f"ERROR: Duplicate primary key '{value}' in column '{entry.header[pkIndex]}'"
+                    seen.add(key)
+
+        for fk in table.foreignKeys:
+            refName = getattr(fk["ref_table"], "name", fk["ref_table"])
+            refEntry = self.cache.get(dbName, refName)
+            valueSet = tableValueSet(refEntry, fk["ref_column"])
+
+            for value in finalColumns[fk["column"]]:
+                if value != "" and value not in valueSet:
+                    return None, f"ERROR: Foreign key '{value}' does not exist in table '{refName}' column '{refEntry.header[fk['ref_column']]}'"
+
+        return list(map(list, zip(*finalColumns))), None
+
+    def captureMetadata(self):
+        return pickle.dumps((
+            self.databases,
+            self.openedDatabase.name if self.openedDatabase else None,
+            self.openedTable.name if self.openedTable else None,
+            self.state
+        ))
+
+    def restoreMetadata(self, meta):
+        self.databases, openedDatabaseName, openedTableName, self.state = pickle.loads(meta)
+
+        self.openedDatabase = next((db for db in self.databases if db.name == openedDatabaseName), None)
+        if self.openedDatabase and openedTableName:
+            self.openedTable = next((t for t in self.openedDatabase.tables if t.name == openedTableName), None)
+        else:
+            self.openedTable = None
+
+    def addToUndoStack(self):
+        self.redoStack = []
+
+        meta = self.captureMetadata()
+        shared = bool(self.undoStack) and self.undoStack[-1].meta == meta
+        if shared:
+            meta = self.undoStack[-1].meta
+
+        self.undoStack.append(JournalEntry(meta, shared))
+        self.trimUndoStack()
+
+    def trimUndoStack(self):
+        while len(self.undoStack) > self.undoMaxDepth:
+            self.undoStack.pop(0)
+
+        while len(self.undoStack) > 1 and sum(entry.size for entry in self.undoStack) > self.undoMaxBytes:
+            self.undoStack.pop(0)
+
+    def journal(self, op):
+        if not self.undoStack:
+            return
+
+        op["size"] = opSize(op)
+        self.undoStack[-1].ops.append(op)
+        self.undoStack[-1].size += op["size"]
+        self.trimUndoStack()
+
+    def swapOp(self, op):
+        kind = op["kind"]
+
+        if kind == "rows":
+            entry = self.cache.get(*op["key"])
+            start, count = op["start"], op["count"]
+            stored = op["stored"]
+
+            if count == 0 and start == len(entry.rows):
+                current = []
+                self.cache.appendRows(entry, stored)
+            else:
+                current = self.cache.spliceRows(entry, start, count, stored)
+
+            op["stored"], op["count"] = current, len(stored)
+
+        elif kind == "header":
+            entry = self.cache.get(*op["key"])
+            current = entry.header
+            header = op["stored"]
+
+            self.cache.setHeader(entry, header)
+            for row in entry.rows:
+                del row[len(header):]
+
+            op["stored"] = current
+
+        elif kind == "dropColumns":
+            entry = self.cache.get(*op["key"])
+            indices = op["indices"]
+            table = [entry.header] + entry.rows
+
+            if op["stored"] is None:
+                op["stored"] = [[row[i] if i < len(row) else "" for i in indices] for row in table]
+                for row in table:
+                    for i in reversed(indices):
+                        if i < len(row):
+                            del row[i]
+            else:
+                for row, values in zip(table, op["stored"]):
+                    for i, value in zip(indices, values):
+                        row.insert(i, value)
+                op["stored"] = None
+
+            self.cache.markDirty(entry)
+
+        elif kind == "moveColumn":
+            entry = self.cache.get(*op["key"])
+            for row in [entry.header] + entry.rows:
+                row.insert(op["dest"], row.pop(op["src"]))
+
+            op["src"], op["dest"] = op["dest"], op["src"]
+            self.cache.markDirty(entry)
+
+        elif kind == "file":
+            self.cache.flush()
+            path = op["path"]
+
+            current = None
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    current = f.read()
+
+            if op["stored"] is None:
+                if os.path.isfile(path):
+                    os.remove(path)
+            else:
+                with open(path, 'wb') as f:
+                    f.write(op["stored"])
+
+            op["stored"] = current
+            self.cache.clear()
+
+        elif kind == "folder":
+            current = os.path.isdir(op["path"])
+
+            if op["stored"]:
+                os.makedirs(op["path"], exist_ok=True)
+            elif current:
+                os.rmdir(op["path"])
+
+            op["stored"] = current
+            self.cache.clear()
+
+        elif kind == "rename":
+            self.cache.flush()
+            os.rename(op["src"], op["dest"])
+            op["src"], op["dest"] = op["dest"], op["src"]
+            self.cache.clear()
+
+        op["size"] = opSize(op)
+
+    def applyJournal(self, entry, ops):
+        self.cache.flush()
+
+        for op in ops:
+            self.swapOp(op)
+
+        current = self.captureMetadata()
+        self.restoreMetadata(entry.meta)
+        entry.meta = current
+        entry.metaBytes = len(current)
+        entry.resize()
+
+        self.cache.commit()
+
+    def undo(self):
+        if self.undoStack:
+            entry = self.undoStack.pop()
+            self.applyJournal(entry, reversed(entry.ops))
+            self.redoStack.append(entry)
+
+    def redo(self):
+        if self.redoStack:
+            entry = self.redoStack.pop()
+            self.applyJournal(entry, entry.ops)
+            self.undoStack.append(entry)
+
+    def applyOp(self, op):
+        self.swapOp(op)
+        self.journal(op)
+
+    def createDatabaseFolder(self, dbName):
+        self.applyOp({"kind": "folder", "path": os.path.join('DATABASES', dbName), "stored": True})
+
+    def removeDatabaseFolder(self, dbName):
+        for root, dirs, files in os.walk(os.path.join('DATABASES', dbName), topdown=False):
+            for name in files:
+                self.applyOp({"kind": "file", "path": os.path.join(root, name), "stored": None})
+            self.applyOp({"kind": "folder", "path": root, "stored": False})
+
+    def renameDatabaseFolder(self, oldName, newName):
+        self.applyOp({"kind": "rename", "src": os.path.join('DATABASES', oldName), "dest": os.path.join('DATABASES', newName)})
+
+    def createTableFile(self, dbName, tableName):
+        self.applyOp({"kind": "file", "path": tablePath(dbName, tableName), "stored": b""})
+
+    def removeTableFile(self, dbName, tableName):
+        for path in tableFiles(dbName, tableName):
+            self.applyOp({"kind": "file", "path": path, "stored": None})
+
+    def renameTableFile(self, dbName, oldName, newName):
+        for path in tableFiles(dbName, oldName):
+            extension = os.path.splitext(path)[1]
+            self.applyOp({"kind": "rename", "src": path, "dest": os.path.join('DATABASES', dbName, f"{newName}{extension}")})
+
+    def convertTableFile(self, dbName, tableName, data, extension):
+        oldPath = locateTable(dbName, tableName)
+        self.applyOp({"kind": "file", "path": os.path.join('DATABASES', dbName, f"{tableName}{extension}"), "stored": data})
+        self.applyOp({"kind": "file", "path": oldPath, "stored": None})
+
+    def setTableHeader(self, entry, header):
+        self.applyOp({"kind": "header", "key": entry.key, "stored": header})
+
+    def appendTableRows(self, entry, rows):
+        self.applyOp({"kind": "rows", "key": entry.key, "start": len(entry.rows), "count": 0, "stored": rows})
+
+    def replaceTableRows(self, entry, edits):
+        for start, rows in journalRowRuns(edits):
+            self.applyOp({"kind": "rows", "key": entry.key, "start": start, "count": len(rows), "stored": rows})
+
+    def deleteTableRows(self, entry, indices):
+        for start, rows in reversed(journalRowRuns((i, None) for i in indices)):
+            self.applyOp({"kind": "rows", "key": entry.key, "start": start, "count": len(rows), "stored": []})
+
+    def dropTableColumns(self, entry, indices):
+        self.applyOp({"kind": "dropColumns", "key": entry.key, "indices": sorted(set(indices)), "stored": None})
+
+    def moveTableColumn(self, entry, srcIndex, destIndex):
+        self.applyOp({"kind": "moveColumn", "key": entry.key, "src": srcIndex, "dest": destIndex})
+
+    def executeQuery(self, Query):
+        if Query.startswith("CREATE INDEX") or Query.startswith("DELETE INDEX") or Query.startswith("DROP INDEX"):
+            if self.state in (1, 2) and self.openedDatabase is not None:
+                match = re.match(r"(CREATE|DELETE|DROP)\s+INDEX\s+ON\s+([^\s(]+)\s*\(\s*([^()]+?)\s*\)\s*$", Query)
+                if match is None:
+                    return f'ERROR: Invalid syntax. Use {Query.split()[0]} INDEX ON <table>(<column>)'
+
+                action, tableName, colName = match.groups()
+                table = next((t for t in self.openedDatabase.tables if t.name == tableName), None)
+                if table is None:
+                    return 'TABLE NOT FOUND'
+
+                if action != "CREATE":
+                    if colName not in table.indexes:
+                        return 'INDEX NOT FOUND'
+
+                    self.addToUndoStack()
+                    table.indexes = [col for col in table.indexes if col != colName]
+                    return 'INDEX DELETED'
+
+                if colName not in table.columns:
+                    return 'COLUMN NOT FOUND'
+                if table.types[table.columns.index(colName)] not in orderedIndexTypes:
+                    return f"ERROR: Column '{colName}' must be INTEGER or FLOAT to be indexed"
+                if colName in table.indexes:
+                    return 'INDEX ALREADY EXISTS'
+
+                self.addToUndoStack()
+                table.indexes = list(table.indexes) + [colName]
+
+                try:
+                    indexFile = self.tableIndexFile(self.openedDatabase.name, table)
+                    if indexFile is not None:
+                        indexFile.close()
+                except Exception as e:
+                    return f"ERROR IN CREATE INDEX: {e}"
+
+                return 'INDEX CREATED'
+
+        elif Query.startswith("SHOW INDEXES"):
+            if self.state in (1, 2) and self.openedDatabase is not None:
+                match = re.match(r"SHOW\s+INDEXES(?:\s+ON\s+(\S+))?\s*$", Query)
+                if match is None:
+                    return 'ERROR: Invalid syntax. Use SHOW INDEXES [ON <table>]'
+
+                if match.group(1) is not None:
+                    tables = [t for t in self.openedDatabase.tables if t.name == match.group(1)]
+                    if not tables:
+                        return 'TABLE NOT FOUND'
+                elif self.state == 2 and self.openedTable is not None:
+                    tables = [self.openedTable]
+                else:
+                    tables = self.openedDatabase.tables
+
+                indexes = [f"{t.name}({col})" for t in tables for col in t.indexes]
+                return ", ".join(indexes) if indexes else 'NO INDEXES'
+
+        elif Query.startswith("CREATE"):
+            self.addToUndoStack()
+
+            parts = Query.partition(" ")
+
+            if self.state == 0:
+                dbNames = [db.strip() for db in parts[2].split(',') if db.strip()]
+
+                for dbName in dbNames:
+                    newDBName = dbName
+                    count = 1
+
+                    while os.path.exists(os.path.join('DATABASES', newDBName)):
+                        newDBName = f"{dbName}_{count}"
+                        count += 1
+
+                    newDB = self.newDatabase(newDBName, *self.placement())
+
+                    self.databases.append(newDB)
+                    self.createDatabaseFolder(newDBName)
+
+            elif self.state == 1:
+                tableName = parts[2].strip()
+                newTableName = tableName
+                count = 1
+
+                existingTableNames = [table.name for table in self.openedDatabase.tables]
+
+                while newTableName in existingTableNames:
+                    newTableName = f"{tableName}_{count}"
+                    count += 1
+
+                newTable = self.newTable(newTableName, [], *self.placement())
+
+                self.openedDatabase.tables.append(newTable)
+                self.createTableFile(self.openedDatabase.name, newTableName)
+
+        elif Query.startswith("DELETE FIELDS"):
+            self.addToUndoStack()
+            if self.state == 1 and self.openedDatabase is not None:
+                try:
+                    rest = Query[len("DELETE FIELDS"):].strip()
+                    
+                    parts = rest.upper().split(" FROM ")
+                    
+                    fieldsPart, tableName = parts
+                    tableName = tableName.strip()
+                    fieldsToDelete = [f.strip() for f in fieldsPart.split(",") if f.strip()]
+                    
+                    targetTable = next((t for t in self.openedDatabase.tables if t.name.upper() == tableName), None)
+
+                    indicesToDelete = []
+
+                    for field in fieldsToDelete:
+                        indicesToDelete.append(targetTable.columns.index(field))
+                    
+                    entry = self.cache.get(self.openedDatabase.name, targetTable.name)
+                    self.dropTableColumns(entry, indicesToDelete)
+
+                    targetTable.columns = list(entry.header)
+                    targetTable.types = [t for i, t in enumerate(targetTable.types) if i not in indicesToDelete]
+                    targetTable.indexes = [col for col in targetTable.indexes if col in targetTable.columns]
+                    
+                except :
+                    return "ERROR DELETING FIELDS"
+                
+        elif Query.startswith("RENAME FIELD"):
+            self.addToUndoStack()
+            if self.state == 1 and self.openedDatabase is not None:
+                try:
+                    rest = Query[len("RENAME FIELD "):].strip()
+
+                    parts = rest.split(" TO ")
+
+                    oldName = parts[0].strip()
+                    newName = parts[1].split(" IN ")[0].strip()
+
+                    tableName = parts[1].split(" IN ")[1].strip()
+
+                    print(tableName, oldName, newName)
+
+                    targetTable = next((t for t in self.openedDatabase.tables if t.name.upper() == tableName), None)
+
+                    entry = self.cache.get(self.openedDatabase.name, targetTable.name)
+
+                    header = [newName if col == oldName else col for col in entry.header]
+                    self.setTableHeader(entry, header)
+
+                    targetTable.columns = list(header)
+                    targetTable.indexes = [newName if col == oldName else col for col in targetTable.indexes]
+
+                except :
+                    return "ERROR RENAMING FIELD"
+
+        elif Query.startswith("MOVE FIELD"):
+            self.addToUndoStack()
+
+            if self.state == 1 and self.openedDatabase is not None:
+                try:
+                    rest = Query[len("MOVE FIELD "):].strip()
+
+                    tablePart, destCol = rest.split(") TO")
+                    tableName, srcCol = tablePart.split("(")
+                    
+                    tableName = tableName.strip().upper()
+                    srcCol = srcCol.strip().upper()
+                    destCol = destCol.strip().upper()
+
+                    table = next((t for t in self.openedDatabase.tables if t.name == tableName), None)
+                    if not table:
+                        return "TABLE NOT FOUND"
+                    if srcCol not in table.columns or destCol not in table.columns:
+                        return "COLUMN NOT FOUND"
+
+                    srcIndex = table.columns.index(srcCol)
+                    destIndex = table.columns.index(destCol)
+
+                    entry = self.cache.get(self.openedDatabase.name, table.name)
+
+                    if not entry.header:
+                        return
+
+                    self.moveTableColumn(entry, srcIndex, destIndex)
+
+                    table.columns = list(entry.header)
+
+                    if table.primaryKeyIndex is not None:
+                        pk = table.primaryKeyIndex
+
+                        if pk == srcIndex:
+                            table.primaryKeyIndex = destIndex
+                        else:
+                            if srcIndex < pk <= destIndex:
+                                table.primaryKeyIndex -= 1
+                            elif destIndex <= pk < srcIndex:
+                                table.primaryKeyIndex += 1
+
+
+                    for fk in table.foreignKeys:
+                        columnIndex = fk["column"]
+
+                        if columnIndex == srcIndex:
+                            fk["column"] = destIndex
+                        else:
+                            if srcIndex < columnIndex <= destIndex:
+                                fk["column"] -= 1
+                            elif destIndex <= columnIndex < srcIndex:
+                                fk["column"] += 1
+
+                    for other in self.openedDatabase.tables:
+                        for fk in other.foreignKeys: 
+                            if fk["ref_table"] == table:
+                                refColumnIndex = fk["ref_column"]
+
+                                if refColumnIndex == srcIndex:
+                                    fk["ref_column"] = destIndex
+                                else:
+                                    if srcIndex < refColumnIndex <= destIndex:
+                                        fk["ref_column"] -= 1
+                                    elif destIndex <= refColumnIndex < srcIndex:
+                                        fk["ref_column"] += 1
+
+                except Exception as e:
+                    print("MOVE FIELD ERROR:", e)
+                    return "ERROR MOVING FIELD"
+                
+        elif Query.startswith("ADD DATA"):
+            self.addToUndoStack()
+
+            if self.state == 2 and self.openedTable is not None:
+                try:
+                    rest = Query[len("ADD DATA"):].strip()
+
+                    tuples = splitTuples(rest)
+                    if tuples is None or len(tuples) == 1:
+                        if not (rest.startswith("(") and rest.endswith(")")):
+                            return "ERROR: Invalid syntax. Use ADD DATA(v1, v2, ...), (v1, v2, ...)"
+                        tuples = [rest[1:-1]]
+
+                    rawRows = [[v.strip() for v in inner.split(",")] for inner in tuples]
+
+                    entry = self.cache.get(self.openedDatabase.name, self.openedTable.name)
+
+                    rows, error = self.validateRows(self.openedTable, entry, self.openedDatabase.name, rawRows)
+                    if error is not None:
+                        return error
+
+                    self.appendTableRows(entry, rows)
+
+                    return ("1 ROW ADDED" if len(rows) == 1 else f"{len(rows)} ROWS ADDED")
+
+                except Exception as e:
+                    return f"ERROR IN ADD DATA: {e}"
+
+        elif Query.startswith("LOAD "):
+            if self.state in (1, 2) and self.openedDatabase is not None:
+                match = re.match(r"LOAD\s+(.+?)\s+INTO\s+(\S+)\s*$", Query)
+                if match is None:
+                    return 'ERROR: Invalid syntax. Use LOAD <file> INTO <table>'
+
+                fileName, tableName = match.groups()
+                table = next((t for t in self.openedDatabase.tables if t.name == tableName), None)
+                if table is None:
+                    return 'TABLE NOT FOUND'
+
+                filePath = resolvePath(fileName.strip("'\""))
+                if filePath is None:
+                    return 'FILE NOT FOUND'
+
+                try:
+                    with open(filePath, 'r', newline='') as csvfile:
+                        rawRows = [row for row in csv.reader(csvfile, skipinitialspace=True) if row]
+
+                    if rawRows and [v.upper() for v in rawRows[0]] == table.columns:
+                        rawRows = rawRows[1:]
+
+                    entry = self.cache.get(self.openedDatabase.name, table.name)
+
+                    rows, error = self.validateRows(table, entry, self.openedDatabase.name, rawRows)
+                    if error is not None:
+                        return error
+
+                    self.addToUndoStack()
+                    self.appendTableRows(entry, rows)
+
+                    return f"{len(rows)} ROWS LOADED"
+
+                except Exception as e:
+                    return f"ERROR IN LOAD: {e}"
+
+        elif Query.startswith("SET"):
+            self.addToUndoStack()
+
+            if self.state == 2 and self.openedTable is not None:
+                try:
+                    rest = Query[len("SET"):].strip()
+
+                    if " WHERE " in rest:
+                        setPart, wherePart = rest.split(" WHERE ", 1)
+                    else:
+                        setPart = rest
+                        wherePart = None
+
+                    if "=" not in setPart:
+                        return "ERROR: SET syntax must be SET column = value"
+
+                    setCol, setVal = setPart.split("=", 1)
+                    setCol = setCol.strip().upper()
+                    setVal = setVal.strip()
+
+                    entry = self.cache.get(self.openedDatabase.name, self.openedTable.name)
+
+                    header = entry.header
+                    rows = entry.rows
+
+                    if setCol not in header:
+                        return f"ERROR: Column {setCol} does not exist"
+
+                    setIndex = header.index(setCol)
+
+                    predicate = WherePredicate(wherePart, header, self.openedTable.types)
+                    plan = self.planQuery(self.openedDatabase.name, self.openedTable, predicate)
+                    candidates = self.planPositions(plan, self.openedDatabase.name, self.openedTable, entry)
+
+                    edits = []
+                    for i in predicate.indices(rows, candidates):
+                        newRow = list(rows[i])
+                        newRow[setIndex] = setVal
+                        edits.append((i, newRow))
+
+                    self.replaceTableRows(entry, edits)
+                    changed = len(edits)
+
+                    return f"{changed} ROWS UPDATED"
+
+                except Exception as e:
+                    return f"ERROR IN SET: {e}"
+                
+        elif Query.startswith("DELETE ROWS"):
+            self.addToUndoStack()
+
+            if self.state == 2 and self.openedTable is not None:
+                try:
+                    if " WHERE " not in Query:
+                        return "ERROR: DELETE ROWS requires WHERE"
+
+                    wherePart = Query.split(" WHERE ", 1)[1].strip()
+
+                    entry = self.cache.get(self.openedDatabase.name, self.openedTable.name)
+
+                    header = entry.header
+                    rows = entry.rows
+
+                    predicate = WherePredicate(wherePart, header, self.openedTable.types)
+                    plan = self.planQuery(self.openedDatabase.name, self.openedTable, predicate)
+                    candidates = self.planPositions(plan, self.openedDatabase.name, self.openedTable, entry)
+                    indices = predicate.indices(rows, candidates)
+
+                    self.deleteTableRows(entry, indices)
+                    deleted = len(indices)
+
+                    return f"{deleted} ROWS DELETED"
+
+                except Exception as e:
+                    return f"ERROR IN DELETE ROWS: {e}"
+                
+        elif Query.startswith("EXPLAIN"):
+            if self.state == 2 and self.openedTable is not None:
+                try:
+                    inner = Query[len("EXPLAIN"):].strip()
+
+                    if not inner.startswith(("SELECT", "SET", "DELETE ROWS")):
+                        return "ERROR: EXPLAIN supports SELECT, SET and DELETE ROWS"
+
+                    steps = ""
+                    if inner.startswith("SELECT"):
+                        inner, order, limit, offset = selectModifiers(inner)
+                        inner, grouped, groupPart = inner.partition(" GROUP BY ")
+
+                        if grouped or isAggregate(inner[len("SELECT"):].split(" FROM ")[0].split(" WHERE ")[0]):
+                            steps = " | HASH AGGREGATE" + (f" BY {groupPart.strip()}" if grouped else "")
+                        if order is not None:
+                            sortText = f"{order[0]} DESC" if order[1] else order[0]
+                            steps += f" | TOP {offset + limit} BY {sortText}" if limit is not None and offset + limit <= self.sortRows else f" | SORT BY {sortText}"
+                        if limit is not None:
+                            steps += f" | LIMIT {limit}" + (f" OFFSET {offset}" if offset else "")
+
+                    if inner.startswith("SELECT") and " FROM " in inner:
+                        join = joinPattern.match(inner)
+                        if join is None:
+                            return "ERROR: Invalid syntax. Use SELECT <columns> FROM <table> JOIN <table> [ON <column> = <column>] [WHERE ...]"
+
+                        selectPart, leftName, rightName, onLeft, onRight, wherePart = join.groups()
+                        onPart = (onLeft, onRight) if onLeft is not None else None
+                        return self.joinSource(self.openedDatabase.name, "*", leftName, rightName, onPart, wherePart)[2] + steps
+
+                    wherePart = inner.split(" WHERE ", 1)[1].strip() if " WHERE " in inner else None
+                    if wherePart is None and inner.startswith("DELETE ROWS"):
+                        return "ERROR: DELETE ROWS requires WHERE"
+
+                    predicate = WherePredicate(wherePart, self.openedTable.columns, self.openedTable.types) if wherePart is not None else None
+
+                    return self.planQuery(self.openedDatabase.name, self.openedTable, predicate).describe() + steps
+
+                except Exception as e:
+                    return f"ERROR IN EXPLAIN: {e}"
+
+        elif Query.startswith("SELECT") :
+            if self.state == 2 and self.openedTable is not None:
+                try:
+                    rest = Query[len("SELECT "):].strip()
+
+                    if rest == "*":
+                        self.clearResult()
+                        return ""
+
+                    try:
+                        selectedHeader, rows = self.selectQuery(rest)
+                        count = self.storeResult(selectedHeader, rows)
+                    except BrokenProcessPool:
+                        self.scanPool = None
+                        selectedHeader, rows = self.selectQuery(rest, parallel=False)
+                        count = self.storeResult(selectedHeader, rows)
+
+                    return f"{count} ROWS FOUND"
+
+                except Exception as e:
+                    return f"ERROR IN SELECT: {e}"
+
+        elif Query.startswith("CONVERT ") :
+            if self.state in (1, 2) and self.openedDatabase is not None:
+                match = re.match(r"CONVERT\s+(\S+)\s+TO\s+(COLUMNAR|CSV)\s*$", Query)
+                if match is None:
+                    return 'INVALID QUERY'
+
+                tableName, target = match.groups()
+                table = next((t for t in self.openedDatabase.tables if t.name == tableName), None)
+                if table is None:
+                    return 'TABLE NOT FOUND'
+
+                extension = ".vcol" if target == "COLUMNAR" else ".csv"
+                if locateTable(self.openedDatabase.name, table.name).endswith(extension):
+                    return f'TABLE IS ALREADY {target}'
+
+                try:
+                    entry = self.cache.get(self.openedDatabase.name, table.name)
+
+                    if target == "COLUMNAR":
+                        data = encodeColumnar(entry.header, entry.rows, table.types)
+                    else:
+                        buffer = io.StringIO()
+                        writer = csv.writer(buffer)
+                        if entry.header or entry.rows:
+                            writer.writerow(entry.header)
+                        writer.writerows(entry.rows)
+                        data = buffer.getvalue().encode()
+
+                    self.addToUndoStack()
+                    self.convertTableFile(self.openedDatabase.name, table.name, data, extension)
+                    return f'TABLE CONVERTED TO {target}'
+
+                except Exception as e:
+                    return f"ERROR IN CONVERT: {e}"
+
+        elif Query.startswith("DELETE"):
+            self.addToUndoStack()
+
+            parts = Query.partition(" ")
+
+            if self.state == 0 :
+                dbName = parts[2]
+                dbToDelete = None
+                for db in self.databases:
+                    if db.name == dbName:
+                        dbToDelete = db
+                        break
+                if dbToDelete:
+                    self.databases.remove(dbToDelete)
+                    self.removeDatabaseFolder(dbToDelete.name)
+            if self.state == 1 :
+                tableName = parts[2]
+                tableToDelete = None
+                for table in self.openedDatabase.tables:
+                    if table.name == tableName:
+                        tableToDelete = table
+                        break
+                if tableToDelete:
+                    self.openedDatabase.tables.remove(tableToDelete)
+                    self.removeTableFile(self.openedDatabase.name, tableToDelete.name)
+
+        elif Query.startswith("OPEN"):
+            parts = Query.partition(" ")
+
+            if self.state == 0 :
+                dbName = parts[2]
+                for db in self.databases:
+                    if db.name == dbName:
+                        self.state = 1
+                        self.openedDatabase = db
+                        break
+        
+        elif Query.startswith("RENAME"):
+            self.addToUndoStack()
+
+            parts = Query.partition(" ")
+
+            if self.state == 0 :
+                oldName = parts[2].split(" TO ")[0]
+                newName = parts[2].split(" TO ")[1]
+
+                for db in self.databases:
+                    if db.name == oldName:
+                        newPath = os.path.join('DATABASES', newName)
+
+                        if not os.path.exists(newPath):
+                            self.renameDatabaseFolder(db.name, newName)
+                            db.name = newName
+                        else :
+                            return 'DATABASE ALREADY EXISTS'
+                        break
+
+                    elif self.databases.index(db) == len(self.databases) - 1 :
+                        return 'DATABASE NOT FOUND'
+
+            elif self.state == 1 :
+                oldName = parts[2].split(" TO ")[0]
+                newName = parts[2].split(" TO ")[1]
+
+                for table in self.openedDatabase.tables:
+                    if table.name == oldName:
+                        newPath = os.path.join('DATABASES', self.openedDatabase.name, f"{newName}.csv")
+
+                        if not os.path.exists(newPath):
+                            self.renameTableFile(self.openedDatabase.name, table.name, newName)
+                            table.name = newName
+                        else :
+                            return 'TABLE ALREADY EXISTS'
+                        break
+
+                    elif self.openedDatabase.tables.index(table) == len(self.openedDatabase.tables) - 1 :
+                        return 'TABLE NOT FOUND'
+                    
+        elif Query.startswith("OPEN"):
+            parts = Query.partition(" ")
+
+            if self.state == 0 :
+                dbName = parts[2]
+                for db in self.databases:
+                    if db.name == dbName:
+                        self.state = 1
+                        self.openedDatabase = db
+                        break
+
+                    elif self.databases.index(db) == len(self.databases) - 1:
+                        return 'DATABASE NOT FOUND'
+                    
+        elif Query.startswith("ADD FIELDS"):
+            self.addToUndoStack()
+            if self.state == 1 and self.openedDatabase is not None:
+                try:
+                    parts = Query.split("ADD FIELDS TO", 1)
+
+                    rest = parts[1].strip()
+
+                    tableName = rest[:rest.find("(")].strip()
+                    fieldsStr = rest[rest.find("(")+1:-1].strip()
+
+                    newFields = [field.strip() for field in fieldsStr.split(',') if field.strip()]
+
+                    if len(newFields) != len(set(newFields)):
+                        return 'DUPLICATE FIELDS IN QUERY'
+
+                    targetTable = None
+                    for table in self.openedDatabase.tables:
+                        if table.name == tableName:
+                            targetTable = table
+                            break
+
+                    if targetTable:
+                        for field in newFields:
+                            if field in targetTable.columns:
+                                return f"FIELD '{field}' ALREADY EXISTS"
+
+                        targetTable.columns.extend(newFields)
+                        targetTable.types.extend(['I'] * len(newFields))
+
+                        entry = self.cache.get(self.openedDatabase.name, targetTable.name)
+                        self.setTableHeader(entry, entry.header + newFields)
+                    else:
+                        return 'TABLE NOT FOUND'
+
+                except IndexError:
+                    return 'INVALID SYNTAX'
+
+        else :
+            return 'INVALID QUERY'
+        
+        return ""